@@ -1,6 +1,6 @@
-import networkx as nx
 import logging
-from tqdm import tqdm
+import os
+import numpy as np
 from ..helpers import Analysis, Networks
 from .cyphers import GitCoinAnalyticsCyphers
 
@@ -13,6 +13,8 @@ class GitCoinAnalysis(Analysis):
         self.networks = Networks()
         self.grants_weight_threshold = 1
         self.donors_weight_threshold = 1
+        self.incremental = os.environ.get("INCREMENTAL_PARTITIONS", False)
+        self.max_change = float(os.environ.get("PARTITIONS_MAX_CHANGE", 0.05))
 
     def run(self):
         self.create_grant_donor_graph()
@@ -21,28 +23,43 @@ class GitCoinAnalysis(Analysis):
         
     def grants_partitions(self):
         partitionTarget = "GitcoinGrant:Grant"
-        self.cyphers.clear_partitions(partitionTarget)
-        grants_partitions, grants_labels = self.create_grants_communities()
-        data = self.prepare_partitions_data(grants_partitions, grants_labels, partitionTarget)
-        
-        urls = self.save_json_as_csv(data["labels"], f"grants_partitions_labels_{self.asOf}")
-        self.cyphers.create_or_merge_partitions(urls)
-        
-        urls = self.save_json_as_csv(data["partitions"], f"grants_partitions_{self.asOf}")
-        self.cyphers.link_partitions(urls, partitionTarget, "id")
-        
+        adjacency = self.create_grants_adjacency()
+        self.write_partitions("grants", adjacency, self.grants_id_map, partitionTarget, "id")
+
     def donors_partitions(self):
         partitionTarget = "Wallet"
-        self.cyphers.clear_partitions(partitionTarget)
-        donors_partitions, donors_labels = self.create_donors_communities()
-        data = self.prepare_partitions_data(donors_partitions, donors_labels, partitionTarget)
-        
-        urls = self.save_json_as_csv(data["labels"], f"donors_partitions_labels_{self.asOf}")
+        adjacency = self.create_donors_adjacency()
+        self.write_partitions("donors", adjacency, self.donors_id_map, partitionTarget, "address")
+
+    def write_partitions(self, name, adjacency, id_map, partitionTarget, targetField):
+        """
+        Computes the partitions and writes them to the graph.
+        In incremental mode (INCREMENTAL_PARTITIONS), the previous run's partitions are reused and only the nodes whose partition changed are relinked,
+        otherwise all the partitions are cleared and rewritten.
+        """
+        previous_state = self.load_partitions_state(name) if self.incremental else None
+        partitions, labels, changed, removed, state = self.networks.update_partitions(adjacency, id_map, previous_state, self.max_change)
+        if previous_state is None:
+            self.cyphers.clear_partitions(partitionTarget)
+        data = self.prepare_partitions_data(changed, labels, partitionTarget)
+
+        urls = self.save_json_as_csv(data["labels"], f"{name}_partitions_labels_{self.asOf}")
         self.cyphers.create_or_merge_partitions(urls)
-        
-        urls = self.save_json_as_csv(data["partitions"], f"donors_partitions_{self.asOf}")
-        self.cyphers.link_partitions(urls, partitionTarget, "address")
-        
+
+        if previous_state is not None:
+            targets = [{"targetField": node_id} for node_id in list(changed) + removed]
+            if targets:
+                urls = self.save_json_as_csv(targets, f"{name}_partitions_unlink_{self.asOf}")
+                self.cyphers.unlink_partitions(urls, partitionTarget, targetField)
+
+        if data["partitions"]:
+            urls = self.save_json_as_csv(data["partitions"], f"{name}_partitions_{self.asOf}")
+            self.cyphers.link_partitions(urls, partitionTarget, targetField)
+
+        if previous_state is not None:
+            self.cyphers.delete_empty_partitions(partitionTarget)
+        self.save_partitions_state(name, state)
+
     def prepare_partitions_data(self, partitions, labels, partitionTarget):
         logging.info("Preparing grants data...")
         data = {
@@ -68,32 +85,26 @@ class GitCoinAnalysis(Analysis):
             )
         return data
     
-    def create_grants_communities(self):
-        logging.info("Creating grants communities...")
-        grants_adj = self.networks.compute_projection(self.biadjacency, self.grants_weight_threshold, axis=0)
-        partitions, labels = self.networks.get_partitions(grants_adj, self.grants_id_map)
-        return partitions, labels
+    def create_grants_adjacency(self):
+        logging.info("Creating grants projection...")
+        return self.networks.compute_projection(self.biadjacency, self.grants_weight_threshold, axis=0)
 
-    def create_donors_communities(self):
-        logging.info("Creating donors communities...")
-        donors_adj = self.networks.compute_projection(self.biadjacency, self.donors_weight_threshold, axis=1)
-        partitions, labels = self.networks.get_partitions(donors_adj, self.donors_id_map)
-        return partitions, labels
+    def create_donors_adjacency(self):
+        logging.info("Creating donors projection...")
+        return self.networks.compute_projection(self.biadjacency, self.donors_weight_threshold, axis=1)
         
     def create_grant_donor_graph(self):
+        """Reads the grant - donors biadjacency from the graph snapshot.
+        Only the grants and donors with more than one neighbour are kept."""
         logging.info("Creating grant - donors graph")
-        result = self.cyphers.get_grants_donations_graph()
-        self.G = nx.Graph()
-
-        for record in tqdm(result):
-            self.G.add_node(record[0], labels=record[1], tags=record[2], types=record[3])
-            self.G.add_node(record[4], labels=record[5])
-            self.G.add_edge(record[0], record[4])
-        
-        self.donors = [n for n in self.G.nodes() if len(set(self.G.nodes[n]["labels"]).intersection(set(["Wallet", "MultiSig"]))) > 0 and self.G.degree[n] > 1]
-        self.grants = [n for n in self.G.nodes() if len(set(self.G.nodes[n]["labels"]).intersection(set(["GitcoinGrant", "Grant"]))) > 0 and self.G.degree[n] > 1]
-
-        self.biadjacency, self.grants_id_map, self.donors_id_map = self.networks.compute_biadjacency(self.G, self.grants, self.donors)
+        biadjacency, grants, donors = self.snapshot.get_biadjacency("Grant", "DONATION", "Wallet", source_key="id", target_key="address")
+        grants_kept = self.snapshot.get_degrees(biadjacency, axis=1) > 1
+        donors_kept = self.snapshot.get_degrees(biadjacency, axis=0) > 1
+        self.grants = grants[grants_kept]
+        self.donors = donors[donors_kept]
+        self.biadjacency = biadjacency[grants_kept][:, donors_kept].astype(np.float32)
+        self.grants_id_map = {grant: i for i, grant in enumerate(self.grants)}
+        self.donors_id_map = {donor: i for i, donor in enumerate(self.donors)}
         
 if __name__ == '__main__':
     analytics = GitCoinAnalysis()
@@ -1,5 +1,5 @@
 from ...helpers import Cypher
-from ...helpers import get_query_logging, count_query_logging
+from ...helpers import count_query_logging
 from ...helpers import Queries
 
 class GitCoinAnalyticsCyphers(Cypher):
@@ -13,15 +13,6 @@ class GitCoinAnalyticsCyphers(Cypher):
     def create_indexes(self):
         pass
 
-    @get_query_logging
-    def get_grants_donations_graph(self):
-        query = """
-            MATCH (grant:Grant)-[donation:DONATION]-(wallet:Wallet)
-            RETURN grant.id, labels(grant), grant.tags, grant.types, wallet.address, labels(wallet)
-        """
-        result = self.query(query)
-        return result
-
     @count_query_logging
     def clear_partitions(self, partitionTarget):
         query = f"""
@@ -41,3 +32,13 @@ class GitCoinAnalyticsCyphers(Cypher):
     def link_partitions(self, urls, partitionTarget, targetField):
         count = self.queries.link_partitions(urls, partitionTarget, targetField,  "Gitcoin")
         return count
+
+    @count_query_logging
+    def unlink_partitions(self, urls, partitionTarget, targetField):
+        count = self.queries.unlink_partitions(urls, partitionTarget, targetField, "Gitcoin")
+        return count
+
+    @count_query_logging
+    def delete_empty_partitions(self, partitionTarget):
+        count = self.queries.delete_empty_partitions(partitionTarget, "Gitcoin")
+        return count
@@ -1,2 +1,4 @@
 from .analysis import Analysis
-from .networks import Networks
\ No newline at end of file
+from .networks import Networks
+from .keywords import KeywordClassifier
+from .snapshot import GraphSnapshot
@@ -1,7 +1,11 @@
 from datetime import datetime
+import io
+import logging
 import os
+import numpy as np
 
 from ...helpers import Base
+from .snapshot import GraphSnapshot
 
 class Analysis(Base):
     def __init__(self, bucket_name=None, load_data=False, chain="ethereum"):
@@ -11,6 +15,25 @@ class Analysis(Base):
             self.cyphers
         except:
             raise ValueError("Cyphers have not been instanciated to self.cyphers")
+        run_id = os.environ.get("GRAPH_SNAPSHOT_RUN_ID", self.runtime.strftime("%Y-%m-%dT%H-%M-%S"))
+        self.snapshot = GraphSnapshot(self.cyphers, self.asOf, run_id)
+
+    def load_partitions_state(self, name):
+        "Loads the partitions state saved by the previous run (see Networks.update_partitions), returns None if there is none"
+        key = f"partitions_state/{name}.npz"
+        if not self.check_if_file_exists(key):
+            return None
+        result = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        content = np.load(io.BytesIO(result["Body"].read()))
+        state = {field: content[field] for field in content.files}
+        logging.info(f"Loaded the previous partitions of {len(state['nodes'])} nodes for {name}")
+        return state
+
+    def save_partitions_state(self, name, state):
+        "Saves the partitions state for the next run"
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **state)
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=f"partitions_state/{name}.npz", Body=buffer.getvalue())
 
     def run(self):
         "Main function to be called. Every analytics must implement its own run function!"
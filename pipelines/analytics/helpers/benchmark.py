@@ -0,0 +1,78 @@
+import logging
+import time
+import numpy as np
+from scipy import sparse
+from .networks import Networks
+
+# Benchmark of the sparse Networks engine against the previous dense implementation on synthetic bipartite graphs.
+# Run with: python -m pipelines.analytics.helpers.benchmark
+
+def dense_biadjacency(top, bottom, n_top, n_bottom):
+    "Previous implementation: dense float32 matrix filled edge by edge"
+    biadjacency = np.zeros((n_top, n_bottom), dtype=np.float32)
+    for i, j in zip(top, bottom):
+        biadjacency[i][j] += 1
+    return biadjacency
+
+def dense_projection(biadjacency, threshold, axis=0):
+    "Previous implementation: dense matmul followed by element-wise thresholding"
+    if axis == 0:
+        projection = np.matmul(biadjacency, biadjacency.T)
+    else:
+        projection = np.matmul(biadjacency.T, biadjacency)
+    for i in range(len(projection)):
+        projection[i][i] = 0
+    projection = projection * (projection > threshold)
+    return projection.astype(bool).astype(np.int8)
+
+def synthetic_bipartite(n_top, n_bottom, edges_per_bottom=3, seed=0):
+    """Random bipartite edges: every bottom node links to edges_per_bottom top nodes,
+    top nodes are drawn with a power law so a few of them are very popular (like grants)"""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, n_top + 1)
+    weights /= weights.sum()
+    top = rng.choice(n_top, size=n_bottom * edges_per_bottom, p=weights)
+    bottom = np.repeat(np.arange(n_bottom), edges_per_bottom)
+    return top, bottom
+
+def timed(function, *args, **kwargs):
+    start = time.time()
+    result = function(*args, **kwargs)
+    return result, time.time() - start
+
+def benchmark_networks(n_top=10000, n_bottom=1000000, edges_per_bottom=3, threshold=1, dense_max_bytes=2 * 1024**3):
+    """
+    Compares the sparse and dense biadjacency, projection (axis 0) and Louvain on a synthetic bipartite graph.
+    The dense implementation is skipped when its matrices would take more than dense_max_bytes.
+    Returns a dictionary of timings in seconds.
+    """
+    networks = Networks()
+    top, bottom = synthetic_bipartite(n_top, n_bottom, edges_per_bottom)
+    logging.info(f"Benchmarking on {n_top} x {n_bottom} nodes and {len(top)} edges")
+    results = {}
+
+    (biadjacency, top_map, _), results["sparse_biadjacency"] = timed(
+        networks.compute_biadjacency_from_edges, top, bottom, np.arange(n_top), np.arange(n_bottom))
+    projection, results["sparse_projection"] = timed(networks.compute_projection, biadjacency, threshold, axis=0)
+    _, results["sparse_louvain"] = timed(networks.get_partitions, projection, top_map)
+    results["sparse_bytes"] = biadjacency.data.nbytes + biadjacency.indices.nbytes + biadjacency.indptr.nbytes
+
+    dense_bytes = n_top * n_bottom * 4 + n_top * n_top * 4
+    if dense_bytes > dense_max_bytes:
+        logging.info(f"Skipping the dense implementation, it would need {dense_bytes / 1024**3:.1f}Gb")
+    else:
+        dense, results["dense_biadjacency"] = timed(dense_biadjacency, top, bottom, n_top, n_bottom)
+        dense_adjacency, results["dense_projection"] = timed(dense_projection, dense, threshold, axis=0)
+        _, results["dense_louvain"] = timed(networks.get_partitions, dense_adjacency, top_map)
+        results["dense_bytes"] = dense.nbytes
+        if (sparse.csr_matrix(dense_adjacency) != projection).nnz != 0:
+            logging.error("The sparse and dense projections are different!")
+
+    for name, value in results.items():
+        logging.info(f"{name}: {value}")
+    return results
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    benchmark_networks(n_top=2000, n_bottom=100000)
+    benchmark_networks()
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+def normalize_keyword(keyword):
+    "Lower case and single spaces, so keywords and matched text can be compared"
+    return " ".join(keyword.lower().split())
+
+def match_texts(pattern, group_masks, texts):
+    """Matches the compiled keywords against each text, each keyword being its own capturing group.
+    The keyword found is read from the index of the group that matched: case insensitive matches can differ from
+    the keyword once lower cased (ex: "İ" or "ſ"), so the matched text is not looked up.
+    Returns, for each text, the bitmask of the labels of the keywords found in it."""
+    regex = re.compile(pattern, re.IGNORECASE)
+    masks = np.zeros(len(texts), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        mask = 0
+        for match in regex.finditer(text or ""):
+            mask |= group_masks[match.lastindex - 1]
+        masks[i] = mask
+    return masks
+
+class KeywordClassifier():
+    def __init__(self, keywords):
+        """
+        Compiles the keyword sets of several labels into a single case insensitive regular expression,
+        so every text is scanned once whatever the number of labels.
+        Keywords match as whole words or phrases (any whitespace between the words).
+        parameters:
+            - keywords: {label: [keyword, ...]}, at most 64 labels
+        """
+        self.labels = list(keywords)
+        if len(self.labels) > 64:
+            raise ValueError("A KeywordClassifier can not have more than 64 labels")
+        self.keyword_masks = {}
+        for i, label in enumerate(self.labels):
+            for keyword in keywords[label]:
+                keyword = normalize_keyword(keyword)
+                self.keyword_masks[keyword] = self.keyword_masks.get(keyword, 0) | (1 << i)
+        # Only the longest keyword matches at a given position, it also carries the labels of the keywords it starts with
+        for keyword in self.keyword_masks:
+            for prefix in self.keyword_masks:
+                if prefix != keyword and re.match(re.escape(prefix) + r"\b", keyword):
+                    self.keyword_masks[keyword] |= self.keyword_masks[prefix]
+        keywords_order = sorted(self.keyword_masks, key=len, reverse=True)
+        alternatives = [
+            "(" + re.escape(keyword).replace(r"\ ", r"\s+") + ")"
+            for keyword in keywords_order
+        ]
+        # Masks of the keywords in the order of their groups in the pattern
+        self.group_masks = [self.keyword_masks[keyword] for keyword in keywords_order]
+        # The lookahead makes the matches overlap, so a keyword inside another one is found as well
+        self.pattern = r"(?=\b(?:" + "|".join(alternatives) + r")\b)" if alternatives else r"(?!)"
+        self.signature = hashlib.sha256(
+            json.dumps({label: sorted(keywords[label]) for label in self.labels}, sort_keys=True).encode()
+        ).hexdigest()
+
+    def classify(self, texts, processes=1, chunk_size=10000):
+        """
+        Classifies the texts, by chunks of chunk_size texts spread across processes.
+        Returns the np.uint64 array of the label bitmasks of each text, bit i being set if a keyword of self.labels[i] is found.
+        """
+        texts = list(texts)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        if processes <= 1 or len(chunks) <= 1:
+            results = [match_texts(self.pattern, self.group_masks, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(
+                    match_texts, [self.pattern] * len(chunks), [self.group_masks] * len(chunks), chunks))
+        return np.concatenate(results) if results else np.zeros(0, dtype=np.uint64)
+
+    def get_label_mask(self, masks, label):
+        "Returns the boolean array of the texts matching a label from the bitmasks returned by classify"
+        bit = np.uint64(1 << self.labels.index(label))
+        return (masks & bit) == bit
@@ -1,5 +1,7 @@
 import numpy as np
+import pandas as pd
 import networkx as nx
+from scipy import sparse
 from sknetwork.clustering import Louvain
 from tqdm import tqdm
 import logging
@@ -8,48 +10,73 @@ class Networks():
     def compute_biadjacency(self, G, top_nodes, bottom_nodes):
         """Computes the biadjacency matrix for a BiPartite network.
         Returns the biadjacency the top_node maping and the bottom_nodes mapping.
+        The biadjacency is a sparse CSR matrix, repeated edges are summed.
         return biadjacency, top_id_map, bottom_id_map
         """
         logging.info("Computing biadjacency...")
-        bottom_id_map = {}
-        for i in range(len(bottom_nodes)):
-            bottom_id_map[bottom_nodes[i]] = i
-
-        top_id_map = {}
-        for i in range(len(top_nodes)):
-            top_id_map[top_nodes[i]] = i
-
-        biadjacency = np.zeros(
-            (len(top_nodes), len(bottom_nodes)), dtype=np.float32)
-        for top_node in tqdm(top_nodes):
-            js = [bottom_id_map[edge[1]]
-                  for edge in G.edges(top_node) if edge[1] in bottom_id_map]
-            i = top_id_map[top_node]
-            for j in js:
-                biadjacency[i][j] += 1
+        edges = np.array(list(G.edges(top_nodes)), dtype=object).reshape(-1, 2)
+        return self.compute_biadjacency_from_edges(edges[:, 0], edges[:, 1], top_nodes, bottom_nodes)
+
+    def compute_biadjacency_from_edges(self, top, bottom, top_nodes=None, bottom_nodes=None):
+        """Computes the sparse biadjacency matrix directly from two arrays of edge ends.
+        If top_nodes or bottom_nodes are given, the rows (or columns) follow their order and edges to other nodes are dropped,
+        otherwise every node found in the edges is used.
+        return biadjacency, top_id_map, bottom_id_map
+        """
+        top = np.asarray(top, dtype=object)
+        bottom = np.asarray(bottom, dtype=object)
+        if top_nodes is None:
+            top_nodes, rows = np.unique(top.astype(str), return_inverse=True)
+        else:
+            rows = pd.Index(top_nodes).get_indexer(top)
+        if bottom_nodes is None:
+            bottom_nodes, cols = np.unique(bottom.astype(str), return_inverse=True)
+        else:
+            cols = pd.Index(bottom_nodes).get_indexer(bottom)
+        keep = (rows >= 0) & (cols >= 0)
+        biadjacency = sparse.csr_matrix(
+            (np.ones(keep.sum(), dtype=np.float32), (rows[keep], cols[keep])),
+            shape=(len(top_nodes), len(bottom_nodes)))
+        biadjacency.sum_duplicates()
+        top_id_map = {node: i for i, node in enumerate(top_nodes)}
+        bottom_id_map = {node: i for i, node in enumerate(bottom_nodes)}
         return biadjacency, top_id_map, bottom_id_map
 
-    def compute_projection(self, biadjacency, threshold, axis=0):
-        """Optimized projection computation for a biadjacency matrix.
-        This method is optimized for memory and CPU time but returns no logging info and may seem stuck.
-        Returns the adjacency matrix of the projection."""
+    def compute_projection(self, biadjacency, threshold, axis=0, chunk_size=10000):
+        """Sparse projection computation for a biadjacency matrix.
+        The product is computed by blocks of chunk_size rows, the diagonal and the weights at or below the threshold
+        are dropped from each block before the next one, so only the kept links are ever held in memory.
+        Returns the adjacency matrix of the projection as a sparse CSR int8 matrix."""
         logging.info("Computing projection...")
+        biadjacency = sparse.csr_matrix(biadjacency)
         if axis == 0:
-            projection = np.matmul(biadjacency, biadjacency.T)
+            left = biadjacency
         elif axis == 1:
-            projection = np.matmul(biadjacency.T, biadjacency)
+            left = biadjacency.T.tocsr()
         else:
             raise(ValueError("axis must be 0 or 1"))
-        for i in range(len(projection)):
-            projection[i][i] = 0
-        projection = projection * (projection > threshold)
-        return projection.astype(bool).astype(np.int8)
+        right = left.T.tocsc()
+        size = left.shape[0]
+        rows, cols = [], []
+        for start in tqdm(range(0, size, chunk_size)):
+            block = (left[start:start + chunk_size] @ right).tocoo()
+            keep = (block.data > threshold) & (block.row + start != block.col)
+            rows.append(block.row[keep] + start)
+            cols.append(block.col[keep])
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int32)
+        cols = np.concatenate(cols) if cols else np.array([], dtype=np.int32)
+        return sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(size, size))
+
+    def run_louvain(self, adjacency):
+        "Returns the louvain label of every row of the adjacency matrix (dense or sparse)"
+        louvain = Louvain()
+        louvain.fit(sparse.csr_matrix(adjacency))
+        return louvain.labels_
 
     def get_partitions(self, adjacency, id_map):
-        """Computes the louvain partitions from an adjacency matrix"""
+        """Computes the louvain partitions from an adjacency matrix (dense or sparse)"""
         logging.info("Computing partitions...")
-        louvain = Louvain()
-        labels = louvain.fit_transform(adjacency)
+        labels = self.run_louvain(adjacency)
         id_map_r = {}
         for node_id in id_map:
             id_map_r[id_map[node_id]] = node_id
@@ -57,3 +84,92 @@ class Networks():
         for i in range(len(labels)):
             partitions[id_map_r[i]] = labels[i]
         return partitions, set(labels)
+
+    def get_node_names(self, id_map):
+        "Returns the array of node ids ordered by their index in the adjacency matrix"
+        names = np.empty(len(id_map), dtype=object)
+        for node_id, i in id_map.items():
+            names[i] = node_id
+        return names
+
+    def compute_fingerprint(self, adjacency, names):
+        """Hashes every link of the adjacency matrix with its end nodes and weight.
+        Returns the sorted array of link hashes and, for each node, the (order independent) sum of the hashes of its links,
+        so a node whose neighbourhood did not change keeps the same hash.
+        return edge_hashes, node_hashes
+        """
+        links = sparse.coo_matrix(adjacency)
+        keys = pd.Series(names[links.row]) + "|" + pd.Series(names[links.col]) + "|" + pd.Series(links.data).astype(str)
+        hashes = pd.util.hash_pandas_object(keys, index=False).values.astype(np.uint64)
+        node_hashes = np.zeros(len(names), dtype=np.uint64)
+        np.add.at(node_hashes, links.row, hashes)
+        return np.unique(hashes), node_hashes
+
+    def match_labels(self, labels, names, previous_labels):
+        """Renames the new labels after the previous label they overlap the most with, so communities keep their id across runs.
+        Each previous label is used at most once, unmatched labels get new ids after the previous ones."""
+        previous = np.array([previous_labels.get(name, -1) for name in names], dtype=np.int64)
+        known = previous >= 0
+        overlaps = pd.DataFrame({"new": labels[known], "old": previous[known]}).value_counts()
+        mapping, used = {}, set()
+        for (new, old), _ in overlaps.items():
+            if new not in mapping and old not in used:
+                mapping[new] = old
+                used.add(old)
+        next_label = max(previous_labels.values(), default=-1) + 1
+        for label in np.unique(labels):
+            if label not in mapping:
+                mapping[label] = next_label
+                next_label += 1
+        return np.array([mapping[label] for label in labels], dtype=np.int64)
+
+    def update_partitions(self, adjacency, id_map, state=None, max_change=0.05):
+        """Computes the louvain partitions, reusing the state of the previous run if there is one.
+        - If less than max_change of the links changed, clustering is warm started: the nodes whose neighbourhood did not change
+          are collapsed into their previous community, changed and new nodes start alone, and louvain runs on that aggregated graph.
+        - Otherwise louvain runs on the full graph.
+        In both cases the labels are matched to the previous ones by maximum overlap.
+        parameters:
+            - adjacency: The adjacency matrix
+            - id_map: The node id -> matrix index mapping
+            - state: The state returned by the previous run, or None
+            - max_change: The maximum share of changed links to warm start
+        Returns the partitions, the labels, the nodes whose partition changed (node -> label), the nodes that disappeared and the new state.
+        return partitions, labels, changed, removed, state
+        """
+        names = self.get_node_names(id_map).astype(str)
+        edge_hashes, node_hashes = self.compute_fingerprint(adjacency, names)
+        if state is None:
+            logging.info("No previous partitions, computing partitions from scratch...")
+            labels = self.run_louvain(adjacency).astype(np.int64)
+            previous_labels = {}
+        else:
+            previous_labels = dict(zip(state["nodes"], state["labels"].tolist()))
+            previous_hashes = dict(zip(state["nodes"], state["node_hashes"]))
+            union = len(np.union1d(state["edge_hashes"], edge_hashes))
+            change = len(np.setxor1d(state["edge_hashes"], edge_hashes, assume_unique=True)) / max(union, 1)
+            if change <= max_change:
+                logging.info(f"{change:.2%} of the links changed, warm starting from the previous partitions...")
+                groups = [
+                    ("previous", previous_labels[name]) if previous_hashes.get(name) == node_hashes[i] else ("node", i)
+                    for i, name in enumerate(names)
+                ]
+                groups, _ = pd.factorize(pd.Series(groups))
+                membership = sparse.csr_matrix((np.ones(len(groups)), (np.arange(len(groups)), groups)), shape=(len(groups), groups.max() + 1 if len(groups) else 0))
+                aggregated = membership.T @ sparse.csr_matrix(adjacency) @ membership
+                labels = self.run_louvain(aggregated)[groups].astype(np.int64)
+            else:
+                logging.info(f"{change:.2%} of the links changed, computing partitions from scratch...")
+                labels = self.run_louvain(adjacency).astype(np.int64)
+            labels = self.match_labels(labels, names, previous_labels)
+        partitions = dict(zip(names, labels.tolist()))
+        changed = {name: label for name, label in partitions.items() if previous_labels.get(name) != label}
+        removed = [name for name in previous_labels if name not in partitions]
+        new_state = {
+            "nodes": names,
+            "labels": labels,
+            "node_hashes": node_hashes,
+            "edge_hashes": edge_hashes,
+        }
+        logging.info(f"{len(set(labels))} partitions, {len(changed)} nodes changed partition, {len(removed)} nodes removed")
+        return partitions, set(labels.tolist()), changed, removed, new_state
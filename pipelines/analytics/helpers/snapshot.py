@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from tqdm import tqdm
+
+class GraphSnapshot():
+    def __init__(self, cyphers, as_of, run_id, directory=None, page_size=50000):
+        """
+        Local columnar snapshot of parts of the graph, so analytics can compute degrees, percentiles and projections
+        with numpy instead of reading large subgraphs through one Cypher result.
+        Tables are paged out of Neo4J the first time they are requested and stored under directory/run_id:
+        Parquet files for the node and edge tables, npz files with the CSR arrays of the adjacencies,
+        and a manifest.json listing them. Analyses running with the same run_id and directory reuse them,
+        the tables of another run are never reused.
+        parameters:
+            - cyphers: Any Cypher instance, used to read the graph
+            - as_of: Date of the snapshot, recorded in the manifest
+            - run_id: Id of the run the snapshot belongs to
+            - directory: Root directory of the snapshots (GRAPH_SNAPSHOT_DIR, /tmp/graph-snapshots by default)
+            - page_size: Number of nodes read by each query
+        """
+        self.cyphers = cyphers
+        self.as_of = as_of
+        self.run_id = run_id
+        self.directory = os.path.join(directory or os.environ.get("GRAPH_SNAPSHOT_DIR", "/tmp/graph-snapshots"), run_id)
+        self.page_size = page_size
+        self.tables = {}
+        self.lock = threading.RLock()
+
+    def get_table_name(self, *parts):
+        "File name of a table, readable and unique for its definition"
+        return re.sub(r"[^A-Za-z0-9_.=-]+", "_", "-".join([str(part) for part in parts if part]))
+
+    def get_path(self, name, extension):
+        return os.path.join(self.directory, f"{name}.{extension}")
+
+    def save_manifest(self, name, definition):
+        "Records the tables of the snapshot with their definition and export time"
+        path = os.path.join(self.directory, "manifest.json")
+        manifest = {"asOf": self.as_of, "runId": self.run_id, "tables": {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+        manifest["tables"][name] = dict(definition, exportedDt=datetime.now().isoformat())
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    def read_pages(self, build_query, cursor, key):
+        """Reads all the records of a query paged by a key: build_query takes the filter on the cursor (the expression of
+        the key in the query) and returns the query, which must order by the cursor and limit to $limit nodes.
+        Returns the records as a DataFrame."""
+        frames = []
+        after = None
+        progress = tqdm(desc="Exporting the snapshot")
+        while True:
+            cursor_filter = f"{cursor} IS NOT NULL" if after is None else f"{cursor} > $after"
+            records = self.cyphers.query(build_query(cursor_filter), parameters={"after": after, "limit": self.page_size})
+            if not records:
+                break
+            frames.append(pd.DataFrame([dict(record) for record in records]))
+            after = records[-1][key]
+            progress.update(len(records))
+        progress.close()
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def get_nodes(self, label, key="address", properties=[]):
+        """
+        Returns the nodes with a label as a DataFrame with the key column and one column per property.
+        parameters:
+            - label: Label(s) of the nodes, ex: Wallet or Grant:GitcoinGrant
+            - key: Indexed property identifying the nodes, used to page
+            - properties: Properties to export
+        """
+        name = self.get_table_name("nodes", label, key, *properties)
+        with self.lock:
+            if name not in self.tables:
+                path = self.get_path(name, "parquet")
+                if os.path.exists(path):
+                    self.tables[name] = pd.read_parquet(path)
+                else:
+                    logging.info(f"Exporting the {label} nodes to the snapshot")
+                    columns = "".join([f", node.{prop} AS {prop}" for prop in properties])
+                    build_query = lambda cursor_filter: f"""
+                        MATCH (node:{label})
+                        WHERE {cursor_filter}
+                        RETURN node.{key} AS {key}{columns}
+                        ORDER BY node.{key}
+                        LIMIT $limit
+                    """
+                    nodes = self.read_pages(build_query, f"node.{key}", key)
+                    if nodes.empty:
+                        nodes = pd.DataFrame(columns=[key] + list(properties))
+                    os.makedirs(self.directory, exist_ok=True)
+                    nodes.to_parquet(path, index=False)
+                    self.save_manifest(name, {"type": "nodes", "label": label, "key": key, "properties": list(properties)})
+                    self.tables[name] = nodes
+        return self.tables[name]
+
+    def get_edges(self, source, relationship, target, source_key="address", target_key="id", direction="both", properties=[]):
+        """
+        Returns the edges (source)-[:relationship]-(target) as a DataFrame with a source and a target column
+        (the keys of the nodes) and one column per edge property.
+        The export is paged over the source nodes, so the source should be the label with the least nodes.
+        parameters:
+            - source: Label(s) of the source nodes, ex: Wallet
+            - relationship: Relationship type(s), ex: IS_ADMIN|MEMBER_OF
+            - target: Label(s) of the target nodes
+            - source_key: Indexed property identifying the source nodes, used to page
+            - target_key: Property identifying the target nodes
+            - direction: out, in or both, relative to the source
+            - properties: Edge properties to export
+        """
+        name = self.get_table_name("edges", source, source_key, direction, relationship, target, target_key, *properties)
+        with self.lock:
+            if name not in self.tables:
+                path = self.get_path(name, "parquet")
+                if os.path.exists(path):
+                    self.tables[name] = pd.read_parquet(path)
+                else:
+                    logging.info(f"Exporting the ({source})-[:{relationship}]-({target}) edges to the snapshot")
+                    left = "<" if direction == "in" else ""
+                    right = ">" if direction == "out" else ""
+                    columns = "".join([f", edge.{prop} AS {prop}" for prop in properties])
+                    build_query = lambda cursor_filter: f"""
+                        MATCH (source:{source})
+                        WHERE {cursor_filter} AND (source){left}-[:{relationship}]-{right}(:{target})
+                        WITH source
+                        ORDER BY source.{source_key}
+                        LIMIT $limit
+                        MATCH (source){left}-[edge:{relationship}]-{right}(target:{target})
+                        RETURN source.{source_key} AS source, target.{target_key} AS target{columns}
+                        ORDER BY source
+                    """
+                    edges = self.read_pages(build_query, f"source.{source_key}", "source")
+                    if edges.empty:
+                        edges = pd.DataFrame(columns=["source", "target"] + list(properties))
+                    edges = edges.dropna(subset=["source", "target"])
+                    os.makedirs(self.directory, exist_ok=True)
+                    edges.to_parquet(path, index=False)
+                    self.save_manifest(name, {
+                        "type": "edges", "source": source, "relationship": relationship, "target": target,
+                        "sourceKey": source_key, "targetKey": target_key, "direction": direction, "properties": list(properties)
+                    })
+                    self.tables[name] = edges
+        return self.tables[name]
+
+    def get_biadjacency(self, source, relationship, target, source_key="address", target_key="id", direction="both"):
+        """
+        Returns the binary biadjacency of the edges (see get_edges) as a sparse CSR matrix with a row per source
+        and a column per target, along with the source and target keys of the rows and columns.
+        The CSR arrays are stored in the snapshot as well.
+        return biadjacency, source_names, target_names
+        """
+        name = self.get_table_name("csr", source, source_key, direction, relationship, target, target_key)
+        with self.lock:
+            if name not in self.tables:
+                path = self.get_path(name, "npz")
+                if os.path.exists(path):
+                    content = np.load(path)
+                    biadjacency = sparse.csr_matrix(
+                        (content["data"], content["indices"], content["indptr"]), shape=tuple(content["shape"]))
+                    self.tables[name] = (biadjacency, content["sources"].astype(object), content["targets"].astype(object))
+                else:
+                    edges = self.get_edges(source, relationship, target, source_key, target_key, direction)
+                    sources, rows = np.unique(edges["source"].astype(str).values, return_inverse=True)
+                    targets, cols = np.unique(edges["target"].astype(str).values, return_inverse=True)
+                    biadjacency = sparse.csr_matrix(
+                        (np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(len(sources), len(targets)))
+                    biadjacency.sum_duplicates()
+                    biadjacency.data[:] = 1
+                    np.savez_compressed(
+                        path, data=biadjacency.data, indices=biadjacency.indices, indptr=biadjacency.indptr,
+                        shape=np.array(biadjacency.shape), sources=sources.astype(str), targets=targets.astype(str))
+                    self.save_manifest(name, {
+                        "type": "csr", "source": source, "relationship": relationship, "target": target,
+                        "sourceKey": source_key, "targetKey": target_key, "direction": direction
+                    })
+                    self.tables[name] = (biadjacency, sources.astype(object), targets.astype(object))
+        return self.tables[name]
+
+    def get_degrees(self, biadjacency, axis=1):
+        "Number of distinct neighbours of every row (axis=1) or column (axis=0) of a binary biadjacency"
+        return np.asarray(biadjacency.sum(axis=axis)).ravel()
+
+    def get_percentile(self, values, percentile):
+        """Nearest rank percentile (between 0 and 1) of the values: the smallest value with at least percentile of the values below or equal.
+        Returns None if there are no values."""
+        values = np.sort(np.asarray(values))
+        if len(values) == 0:
+            return None
+        rank = max(int(np.ceil(percentile * len(values))), 1)
+        return float(values[rank - 1])
@@ -1,5 +1,6 @@
 import networkx as nx
 import numpy as np
+from scipy import sparse
 import logging
 from tqdm import tqdm
 import os
@@ -24,23 +25,43 @@ class WalletCommunityAnalysis(Analysis):
         if "MATCH_QUERY" not in os.environ:
             raise(ValueError("MATCH_QUERY has not been set in ENV!"))
         self.matchQuery = os.environ["MATCH_QUERY"]
+        self.page_size = int(os.environ.get("COMMUNITIES_PAGE_SIZE", 1000))
+        self.incremental = os.environ.get("INCREMENTAL_PARTITIONS", False)
+        self.max_change = float(os.environ.get("PARTITIONS_MAX_CHANGE", 0.05))
 
     def run(self):
+        """
+        In incremental mode (INCREMENTAL_PARTITIONS), the previous run's partitions are reused and only the wallets whose partition changed are relinked.
+        """
         partitionTarget = "Wallet"
         adjacency, wallet_mapping = self.create_wallet_adjacency()
-        partitions, labels = self.networks.get_partitions(
-            adjacency, wallet_mapping)
+        previous_state = self.load_partitions_state(self.name) if self.incremental else None
+        partitions, labels, changed, removed, state = self.networks.update_partitions(
+            adjacency, wallet_mapping, previous_state, self.max_change)
         data = self.prepare_partitions_data(
-            partitions, labels, partitionTarget)
+            changed, labels, partitionTarget)
 
         urls = self.save_json_as_csv(
             data["labels"], f"{self.name}_partitions_labels_{self.asOf}")
         self.cyphers.create_or_merge_partitions(urls, self.name)
 
-        urls = self.save_json_as_csv(
-            data["partitions"], f"{self.name}_partitions_{self.asOf}")
-        self.cyphers.link_partitions(
-            urls, partitionTarget, "address", self.name)
+        if previous_state is not None:
+            targets = [{"targetField": address} for address in list(changed) + removed]
+            if targets:
+                urls = self.save_json_as_csv(
+                    targets, f"{self.name}_partitions_unlink_{self.asOf}")
+                self.cyphers.unlink_partitions(
+                    urls, partitionTarget, "address", self.name)
+
+        if data["partitions"]:
+            urls = self.save_json_as_csv(
+                data["partitions"], f"{self.name}_partitions_{self.asOf}")
+            self.cyphers.link_partitions(
+                urls, partitionTarget, "address", self.name)
+
+        if previous_state is not None:
+            self.cyphers.delete_empty_partitions(partitionTarget, self.name)
+        self.save_partitions_state(self.name, state)
 
     def prepare_partitions_data(self, partitions, labels, partitionTarget):
         logging.info("Preparing grants data...")
@@ -67,26 +88,28 @@ class WalletCommunityAnalysis(Analysis):
             )
         return data
 
+    def iterate_wallet_pairs(self):
+        "Streams the (w1, w2) address pairs from Neo4J by pages of matched wallets"
+        wallets = self.cyphers.get_match_wallets(self.matchQuery)
+        logging.info(f"{len(wallets)} wallets matched")
+        for i in tqdm(range(0, len(wallets), self.page_size)):
+            results = self.cyphers.get_wallets_from_match(self.matchQuery, wallets[i:i+self.page_size])
+            yield np.array([(result[0], result[1]) for result in results], dtype=object).reshape(-1, 2)
+
     def create_wallet_adjacency(self):
         logging.info("Creating wallet's projection adjacency matrix")
-        results = self.cyphers.get_wallets_from_match(self.matchQuery)
-        uniqueWallets = set()
-        for result in results:
-            uniqueWallets.add(result[0])
-            uniqueWallets.add(result[1])
-        uniqueWallets = list(uniqueWallets)
-
-        wallet_mapping = {}
-        for i in range(len(uniqueWallets)):
-            wallet_mapping[uniqueWallets[i]] = i
-
-        adjacency = np.zeros((len(uniqueWallets), len(uniqueWallets)))
-        for result in tqdm(results):
-            i = wallet_mapping[result[0]]
-            j = wallet_mapping[result[1]]
-            adjacency[i][j] += 1
-            adjacency[j][i] += 1
-        logging.info(f"Adjacency created with {len(adjacency)} nodes")
+        pairs = list(self.iterate_wallet_pairs())
+        pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=object)
+        uniqueWallets, indexes = np.unique(pairs.astype(str).ravel(), return_inverse=True)
+        indexes = indexes.reshape(-1, 2)
+        rows = np.concatenate([indexes[:, 0], indexes[:, 1]])
+        cols = np.concatenate([indexes[:, 1], indexes[:, 0]])
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(uniqueWallets), len(uniqueWallets)))
+        adjacency.sum_duplicates()
+        wallet_mapping = {wallet: i for i, wallet in enumerate(uniqueWallets)}
+        logging.info(f"Adjacency created with {len(uniqueWallets)} nodes and {adjacency.nnz} links")
         return adjacency, wallet_mapping
 
 if __name__ == '__main__':
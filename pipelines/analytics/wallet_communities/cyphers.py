@@ -20,18 +20,38 @@ class WalletCommunityAnalyticsCyphers(Cypher):
         return [el["relationshipType"] for el in results]
 
     @get_query_logging
-    def get_wallets_from_match(self, matchQuery):
-        "matchQuery MUST match against Wallets, and the variable must be wallet. example (n)-[r]-(wallet:Wallet)"
+    def get_match_wallets(self, matchQuery):
+        "matchQuery MUST match against Wallets, and the variable must be wallet. Returns the distinct matched addresses."
+        query = """
+        {}
+        WHERE NOT wallet:MultiSig
+        RETURN DISTINCT wallet.address AS address
+        ORDER BY address
+        """.format(matchQuery)
+        results = self.query(query)
+        return [result["address"] for result in results]
+
+    @get_query_logging
+    def get_wallets_from_match(self, matchQuery, addresses=None):
+        """matchQuery MUST match against Wallets, and the variable must be wallet. example (n)-[r]-(wallet:Wallet)
+        If addresses is given, only the pairs starting from these wallets are returned, which allows paging over the matched wallets.
+        The page wallets are bound first so the match only expands from them, and both copies of matchQuery share their other variables."""
         relationships = "|".join(
             [el for el in self.get_all_relationships() if el != "HAS_PARTITION"])
+        page_anchor = """
+        UNWIND $addresses AS pageAddress
+        MATCH (w1:Wallet {address: pageAddress})
+        WITH w1
+        """ if addresses is not None else ""
         query = """
         {}
         {}
+        {}
         WHERE NOT w1 = w2 AND NOT w1:MultiSig AND NOT w2:MultiSig
         MATCH shortestPath((w1)-[r:{}*..4]-(w2))
         RETURN w1.address, w2.address
-        """.format(matchQuery.replace("wallet", "w1"), matchQuery.replace("wallet", "w2"), relationships)
-        results = self.query(query)
+        """.format(page_anchor, matchQuery.replace("wallet", "w1"), matchQuery.replace("wallet", "w2"), relationships)
+        results = self.query(query, parameters={"addresses": addresses})
         return results
 
     @count_query_logging
@@ -44,3 +64,14 @@ class WalletCommunityAnalyticsCyphers(Cypher):
         count = self.queries.link_partitions(
             urls, partitionTarget, targetField, label)
         return count
+
+    @count_query_logging
+    def unlink_partitions(self, urls, partitionTarget, targetField, label):
+        count = self.queries.unlink_partitions(
+            urls, partitionTarget, targetField, label)
+        return count
+
+    @count_query_logging
+    def delete_empty_partitions(self, partitionTarget, label):
+        count = self.queries.delete_empty_partitions(partitionTarget, label)
+        return count
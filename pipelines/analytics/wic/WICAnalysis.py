@@ -1,7 +1,15 @@
+import io
 import logging
+import os
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
+import numpy as np
+import pandas as pd
 from tqdm import tqdm
-from ..helpers import Analysis
+from ..helpers import Analysis, KeywordClassifier
+from .WICCypher import to_millis
 
 TYPES = {
     "experiences": "Experience",
@@ -18,18 +26,249 @@ class WICAnalysis(Analysis):
             raise ValueError("Conditions must be declared before instancing with super().init")
 
         Analysis.__init__(self, bucket_name)
+        self.max_concurrency = int(os.environ.get("WIC_CONCURRENCY", 4))
+        self.max_retries = int(os.environ.get("WIC_MAX_RETRIES", 2))
+        self.incremental = os.environ.get("WIC_INCREMENTAL", False)
+        self.full_rebuild_days = int(os.environ.get("WIC_FULL_REBUILD_DAYS", 7))
+        self.keyword_processes = int(os.environ.get("WIC_KEYWORD_PROCESSES", os.cpu_count() or 1))
+        self.keyword_page_size = 10000
+        self.keyword_wallets = {}
+
+    def get_context_tasks(self):
+        """
+        Flattens the conditions into one task per context and subcontext: {name: {"call", "args", "dependencies", "keywords"}}.
+        Subcontexts depend on their parent context. Contexts and subcontexts can also declare
+        the names of the contexts they need with an optional "dependencies" list,
+        and keywords to look for in the texts of the wallets with an optional "keywords" dictionary (see classify_keywords).
+        The call is optional for contexts that only declare keywords.
+        """
+        tasks = {}
+        for condition in self.conditions:
+            for context in self.conditions[condition]:
+                definition = self.conditions[condition][context]
+                tasks[context] = {
+                    "call": definition.get("call"),
+                    "args": (context,),
+                    "dependencies": set(definition.get("dependencies", [])),
+                    "keywords": definition.get("keywords", {})
+                }
+                for subcontext in definition.get("subcontexts", {}):
+                    subdefinition = definition["subcontexts"][subcontext]
+                    tasks[subcontext] = {
+                        "call": subdefinition.get("call"),
+                        "args": (context, subcontext),
+                        "dependencies": set(subdefinition.get("dependencies", [])) | {context},
+                        "keywords": subdefinition.get("keywords", {})
+                    }
+        for name in tasks:
+            unknown = tasks[name]["dependencies"] - set(tasks)
+            if unknown:
+                raise ValueError(f"Context {name} depends on unknown contexts: {unknown}")
+            if not tasks[name]["call"] and not tasks[name]["keywords"]:
+                raise ValueError(f"Context {name} has neither a call nor keywords")
+        return tasks
+
+    def is_full_rebuild(self):
+        "Returns True if the subgraph must be rebuilt from scratch: outside of incremental mode or every WIC_FULL_REBUILD_DAYS days"
+        if not self.incremental or "last_full_rebuild" not in self.metadata:
+            return True
+        last_full_rebuild = datetime.strptime(self.metadata["last_full_rebuild"], "%Y-%m-%d")
+        return datetime.now() - last_full_rebuild >= timedelta(days=self.full_rebuild_days)
+
+    def prepare_contexts(self, tasks, full_rebuild):
+        """
+        In incremental mode, each context only re-evaluates the wallets touched since the watermark it last processed:
+        those wallets are labelled and the context queries are scoped to them. Contexts without a watermark are processed fully.
+        Returns the watermark of this run (most recent lastUpdateDt/createdDt of the graph), or None outside of incremental mode.
+        """
+        if not self.incremental:
+            return None
+        watermarks = self.metadata.get("watermarks", {})
+        previous = [watermarks[name] for name in tasks if name in watermarks]
+        since = min(previous, key=to_millis) if previous and not full_rebuild else "1970-01-01T00:00:00Z"
+        self.cyphers.create_change_indexes()
+        changes = self.cyphers.get_changes(since)
+        watermark = max(changes.values(), key=to_millis, default=since)
+        if full_rebuild:
+            logging.info(f"Rebuilding the subgraph, the last full rebuild was on {self.metadata.get('last_full_rebuild')}")
+            return watermark
+
+        logging.info(f"Labelling the wallets touched between {since} and {watermark}, {len(changes)} labels and relationship types changed")
+        self.cyphers.clear_touched_wallets()
+        self.cyphers.mark_touched_wallets(since, watermark, changes)
+        for name in tasks:
+            if name in watermarks:
+                self.cyphers.scopes[name] = f":{self.cyphers.touched_label}"
+            else:
+                logging.info(f"Context {name} has no watermark, processing it fully")
+        return watermark
+
+    def load_keyword_cache(self, source, signature):
+        """Loads the label bitmasks of the texts classified by the previous runs for a source, keyed by text hash.
+        The cache is dropped if the keywords changed (different classifier signature).
+        return hashes, masks"""
+        key = f"keywords_cache/{source}.npz"
+        if not self.check_if_file_exists(key):
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+        result = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        content = np.load(io.BytesIO(result["Body"].read()))
+        if str(content["signature"]) != signature:
+            logging.info(f"The {source} keywords changed, classifying every text again")
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64)
+        return content["hashes"], content["masks"]
+
+    def save_keyword_cache(self, source, signature, hashes, masks):
+        "Saves the label bitmasks of the classified texts of a source for the next run"
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, signature=np.array(signature), hashes=hashes, masks=masks)
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=f"keywords_cache/{source}.npz", Body=buffer.getvalue())
+
+    def classify_source(self, source, classifier, texts, partial=False):
+        """
+        Classifies the texts of a source, only the texts that were not classified by a previous run are matched.
+        parameters:
+            - source: The name of the source (see WICCypher.get_keyword_texts)
+            - classifier: The KeywordClassifier of the source
+            - texts: The texts to classify
+            - partial: True if the texts are only a part of the source, the cache then keeps the texts it already had
+        Returns the label bitmask of every text.
+        """
+        codes, unique_texts = pd.factorize(np.array(texts, dtype=object))
+        hashes = pd.util.hash_pandas_object(pd.Series(unique_texts, dtype=object), index=False).values.astype(np.uint64)
+        cached_hashes, cached_masks = self.load_keyword_cache(source, classifier.signature)
+        cached = pd.Series(cached_masks, index=cached_hashes)
+        cached = cached[~cached.index.duplicated()]
+        known = np.isin(hashes, cached_hashes)
+        masks = np.zeros(len(hashes), dtype=np.uint64)
+        masks[known] = cached.reindex(hashes[known]).values
+        logging.info(f"Classifying {(~known).sum()} new {source} texts out of {len(hashes)}")
+        masks[~known] = classifier.classify(unique_texts[~known], processes=self.keyword_processes)
+
+        if partial:
+            stale = ~np.isin(cached_hashes, hashes)
+            self.save_keyword_cache(source, classifier.signature,
+                np.concatenate([cached_hashes[stale], hashes]), np.concatenate([cached_masks[stale], masks]))
+        else:
+            self.save_keyword_cache(source, classifier.signature, hashes, masks)
+        return masks[codes]
+
+    def classify_keywords(self, tasks):
+        """
+        Finds the wallets of every context declaring keywords in a single pass: the texts of the wallets (bios, titles...)
+        are exported once by pages of wallets, each distinct text is matched once against the keywords of all contexts,
+        and the matched wallets are added to their contexts when they run.
+        Keywords are declared per source in the context definition: {"keywords": {"bios": [...], "grants": [...]}}
+        In incremental mode, only the touched wallets are exported when all the keyword contexts are scoped.
+        """
+        keywords = {}
+        for name in tasks:
+            for source, source_keywords in tasks[name]["keywords"].items():
+                keywords.setdefault(source, {})[name] = source_keywords
+        if not keywords:
+            return
+        scopes = {self.cyphers.scope(name) for name in tasks if tasks[name]["keywords"]}
+        scope = scopes.pop() if len(scopes) == 1 else ""
+
+        sources = list(keywords)
+        addresses = {source: [] for source in sources}
+        texts = {source: [] for source in sources}
+        logging.info(f"Exporting the wallets' {sources} texts")
+        after = ""
+        while True:
+            records = self.cyphers.get_keyword_texts(sources, scope=scope, after=after, limit=self.keyword_page_size)
+            if not records:
+                break
+            for record in records:
+                for source in sources:
+                    addresses[source].extend([record["address"]] * len(record[source]))
+                    texts[source].extend(record[source])
+            after = records[-1]["address"]
+
+        self.keyword_wallets = {}
+        for source in sources:
+            classifier = KeywordClassifier(keywords[source])
+            masks = self.classify_source(source, classifier, texts[source], partial=bool(scope))
+            source_addresses = np.array(addresses[source], dtype=object)
+            for name in classifier.labels:
+                wallets = set(source_addresses[classifier.get_label_mask(masks, name)])
+                self.keyword_wallets.setdefault(name, set()).update(wallets)
+        for name, wallets in self.keyword_wallets.items():
+            logging.info(f"Context {name}: {len(wallets)} wallets matched by keywords")
+
+    def run_context(self, name, task, counter=0):
+        """Runs a single context and writes the diff of its edges, retrying it on failure.
+        Returns the time it took in seconds."""
+        start = time.time()
+        try:
+            logging.info(f"Processing Context: {name}")
+            self.cyphers.pairs.pop(name, None)
+            self.cyphers.add_context_wallets(name, [(address, None) for address in self.keyword_wallets.get(name, [])])
+            if task["call"]:
+                task["call"](*task["args"])
+            self.cyphers.sync_context(name)
+        except Exception as e:
+            logging.error(f"Context {name} failed (attempt {counter + 1}): {e}")
+            if counter >= self.max_retries:
+                raise e
+            time.sleep(counter * 10)
+            return self.run_context(name, task, counter=counter+1)
+        return time.time() - start
 
     def process_conditions(self):
-        for condition in tqdm(self.conditions, position=0):
-            logging.info(f"Processing Condition: {condition}")
-            for context in tqdm(self.conditions[condition], position=1):
-                logging.info(f"Processing Context: {context}")
-                if "subcontexts" in self.conditions[condition][context]:
-                    self.conditions[condition][context]["call"](context)
-                    for subcontext in tqdm(self.conditions[condition][context]["subcontexts"], position=2):
-                        logging.info(f"Processing Subcontext: {subcontext}")
-                        self.conditions[condition][context]["subcontexts"][subcontext]["call"](context, subcontext)
-                else:
-                    self.conditions[condition][context]["call"](context)
-        logging.info("Cleaning Subgraph")
-        self.cyphers.clear_subgraph()
\ No newline at end of file
+        """
+        Runs every context as soon as its dependencies are done, with at most WIC_CONCURRENCY contexts querying Neo4J at once.
+        A context that still fails after WIC_MAX_RETRIES retries is skipped along with the contexts that depend on it,
+        its previous edges are kept and the subgraph is not cleaned.
+        In incremental mode (WIC_INCREMENTAL) each successful context records the watermark it processed (see prepare_contexts).
+        """
+        tasks = self.get_context_tasks()
+        full_rebuild = self.is_full_rebuild()
+        watermark = self.prepare_contexts(tasks, full_rebuild)
+        self.classify_keywords(tasks)
+        remaining = dict(tasks)
+        done, failed, timings = set(), set(), {}
+        progress = tqdm(total=len(tasks))
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            running = {}
+            while remaining or running:
+                skipped = [name for name in remaining if remaining[name]["dependencies"] & failed]
+                while skipped:
+                    for name in skipped:
+                        logging.error(f"Skipping context {name} as one of its dependencies failed")
+                        remaining.pop(name)
+                        failed.add(name)
+                        progress.update(1)
+                    skipped = [name for name in remaining if remaining[name]["dependencies"] & failed]
+                for name in [name for name in remaining if remaining[name]["dependencies"] <= done]:
+                    running[executor.submit(self.run_context, name, remaining.pop(name))] = name
+                if not running:
+                    if remaining:
+                        logging.error(f"Contexts with circular dependencies: {list(remaining)}")
+                        failed.update(remaining)
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        timings[name] = future.result()
+                        done.add(name)
+                    except Exception:
+                        failed.add(name)
+                    progress.update(1)
+        progress.close()
+        if self.incremental and not full_rebuild:
+            self.cyphers.clear_touched_wallets()
+
+        for name, duration in sorted(timings.items(), key=lambda item: -item[1]):
+            logging.info(f"Context {name} took {duration:.1f}s")
+        if self.incremental:
+            self.metadata.setdefault("watermarks", {}).update({name: watermark for name in done})
+        if failed:
+            logging.error(f"{len(failed)} contexts failed: {sorted(failed)}, the subgraph is not cleaned")
+        else:
+            logging.info("Cleaning Subgraph")
+            self.cyphers.clear_subgraph()
+            if self.incremental and full_rebuild:
+                self.metadata["last_full_rebuild"] = datetime.now().strftime("%Y-%m-%d")
+        if self.incremental:
+            self.save_metadata()
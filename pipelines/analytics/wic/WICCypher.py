@@ -1,12 +1,33 @@
 import logging
+import re
+import threading
+from datetime import datetime, timezone
 from ...helpers.decorators import count_query_logging
 from ...helpers import Cypher, Indexes
 
+# Properties tracking the changes of the nodes and relationships, read by the incremental mode
+CHANGE_PROPERTIES = ["lastUpdateDt", "createdDt"]
+
+def to_millis(iso):
+    "Epoch milliseconds of an ISO datetime string in UTC, like the values written by timestamp()"
+    # fromisoformat only reads 3 or 6 fraction digits and Neo4J writes up to 9
+    iso = re.sub(r"\.(\d+)", lambda match: "." + (match.group(1) + "000000")[:6], iso.replace("Z", "+00:00"))
+    return int(datetime.fromisoformat(iso).timestamp() * 1000)
+
+def from_millis(millis):
+    "ISO string in UTC with milliseconds of an epoch milliseconds value, so the watermarks sort chronologically as strings"
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
 class WICCypher(Cypher):
     def __init__(self, subgraph_name, conditions, database=None):
         super().__init__(database)
         self.conditions = conditions
         self.subgraph_name = subgraph_name
+        self.touched_label = f"_{subgraph_name}Touched"
+        self.scopes = {}
+        self.pairs = {}
+        self.pairs_lock = threading.Lock()
+        self.batch_size = 10000
         self.mark_subgraph()
         self.create_main()
         self.create_conditions()
@@ -16,41 +37,277 @@ class WICCypher(Cypher):
         indexes = Indexes()
         indexes.wicIndexes()
 
+    def scope(self, context):
+        """Returns the label that restricts the wallets matched by a context query.
+        In incremental mode it is the label of the wallets touched since the context's watermark, otherwise it is empty."""
+        return self.scopes.get(context, "")
+
     @count_query_logging
     def mark_subgraph(self):
-        query = f"""
-            CALL apoc.periodic.commit("
-                MATCH (:_Wic:_{self.subgraph_name})-[edge:_HAS_CONTEXT]-()
-                WHERE edge.toRemove IS NULL
-                WITH edge LIMIT 10000
-                SET edge.toRemove = true
-                RETURN count(edge)
-            ")
-        """
-        count = self.query(query)[0].value()
-        
-        query = f"""
+        match_query = f"""
             MATCH (wic:_Wic:_{self.subgraph_name})
+            RETURN wic
+        """
+        write_query = """
             SET wic.toRemove = true
-            RETURN count(wic)
         """
-        count += self.query(query)[0].value()
+        count = self.iterate(match_query, write_query, parallel=True)
         
         return count
 
-    @count_query_logging
-    def clear_subgraph(self):
+    def query_context(self, context, query, parameters=None):
+        """Runs a context query and collects the wallets it returns (an address column and an optional properties map)
+        as the wallets of the context. The edges are only written by sync_context once the whole context ran.
+        Returns the number of wallets returned by the query."""
+        records = self.query(query, parameters)
+        self.add_context_wallets(context, [(record["address"], record.get("properties")) for record in records])
+        return len(records)
+
+    def add_context_wallets(self, context, wallets):
+        "Collects (address, properties) pairs as wallets of the context, properties can be None"
+        with self.pairs_lock:
+            pairs = self.pairs.setdefault(context, {})
+        for address, properties in wallets:
+            if address is None:
+                continue
+            pairs.setdefault(address, {}).update(properties or {})
+
+    def get_keyword_texts(self, sources, scope="", after="", limit=10000):
+        """
+        Returns the texts of the next limit wallets after the address after (ordered by address), for keyword classification.
+        Each record has the wallet address and one list of texts per source:
+        - bios: bios of the wallet's Twitter, Github and Dune accounts
+        - articles: titles of the articles authored by the wallet
+        - collected: titles of the Mirror articles whose NFT is held by the wallet
+        - grants: titles of the grants linked to the wallet
+        scope is a label restricting the wallets (see self.scope).
+        """
+        subqueries = {
+            "bios": """
+                OPTIONAL MATCH (wallet)-[:HAS_ACCOUNT]-(account)
+                WHERE (account:Twitter OR account:Github OR account:Dune) AND account.bio IS NOT NULL
+                RETURN collect(DISTINCT account.bio) AS bios""",
+            "articles": """
+                OPTIONAL MATCH (wallet)-[:AUTHOR]->(article:Article)
+                WHERE article.title IS NOT NULL
+                RETURN collect(DISTINCT article.title) AS articles""",
+            "collected": """
+                OPTIONAL MATCH (article:Article:Mirror)-[:HAS_NFT]-(:ERC721)-[:HOLDS_TOKEN|HOLDS]-(wallet)
+                WHERE article.title IS NOT NULL
+                RETURN collect(DISTINCT article.title) AS collected""",
+            "grants": """
+                OPTIONAL MATCH (grant:Grant)-[]-(wallet)
+                WHERE grant.title IS NOT NULL
+                RETURN collect(DISTINCT grant.title) AS grants"""
+        }
+        unknown = set(sources) - set(subqueries)
+        if unknown:
+            raise ValueError(f"Unknown keyword sources: {unknown}")
+        calls = "\n".join([f"CALL {{ WITH wallet {subqueries[source]} }}" for source in sources])
         query = f"""
-            CALL apoc.periodic.commit("
-                MATCH (:_Wic:_{self.subgraph_name})-[edge:_HAS_CONTEXT]-()
-                WHERE edge.toRemove = true
-                WITH edge LIMIT 10000
+            MATCH (wallet:Wallet{scope})
+            WHERE wallet.address > $after
+            WITH wallet
+            ORDER BY wallet.address
+            LIMIT $limit
+            {calls}
+            RETURN wallet.address AS address, {", ".join(sources)}
+            ORDER BY address
+        """
+        records = self.query(query, parameters={"after": after, "limit": limit})
+        return records
+
+    def get_context_edges(self, context):
+        """Returns the current edges of a context: {address: (properties, touched)}, touched is True for the wallets
+        labelled as touched in incremental mode."""
+        query = f"""
+            MATCH (wallet)-[edge:_HAS_CONTEXT]->(:_Wic:_Context:_{self.subgraph_name}:_{context})
+            RETURN wallet.address AS address, properties(edge) AS properties, wallet:{self.touched_label} AS touched
+        """
+        edges = {}
+        for record in self.query(query):
+            edges[record["address"]] = (record["properties"], record["touched"])
+        return edges
+
+    @count_query_logging
+    def sync_context(self, context):
+        """
+        Writes the wallets collected by query_context for a context as the diff against its current edges:
+        - New wallets, or wallets whose properties changed, are merged with the generation (unique id) of this run.
+        - Wallets that are not returned anymore are unlinked. In incremental mode only the touched wallets can be unlinked,
+          as the other ones were not re-evaluated.
+        Edges from nodes without an address are always deleted.
+        """
+        with self.pairs_lock:
+            pairs = self.pairs.pop(context, {})
+        current = self.get_context_edges(context)
+        incremental = bool(self.scope(context))
+        upserts = [
+            {"address": address, "properties": properties}
+            for address, properties in pairs.items()
+            if address not in current or any(current[address][0].get(key) != value for key, value in properties.items())
+        ]
+        deletes = [
+            address for address, (_, touched) in current.items()
+            if address is not None and address not in pairs and (touched or not incremental)
+        ]
+        logging.info(f"Context {context}: {len(pairs)} wallets, {len(upserts)} to write and {len(deletes)} to unlink")
+
+        count = 0
+        upsert_query = f"""
+            UNWIND $rows AS row
+            MATCH (wallet:Wallet {{address: row.address}})
+            MATCH (context:_Wic:_Context:_{self.subgraph_name}:_{context})
+            MERGE (wallet)-[edge:_HAS_CONTEXT]->(context)
+            ON CREATE SET edge.createdDt = datetime(apoc.date.toISO8601(apoc.date.currentTimestamp(), 'ms'))
+            SET edge += row.properties
+            SET edge._generation = $generation
+            RETURN count(edge)
+        """
+        for i in range(0, len(upserts), self.batch_size):
+            count += self.query(upsert_query, parameters={"rows": upserts[i:i + self.batch_size], "generation": self.unique_id})[0].value()
+
+        delete_query = f"""
+            UNWIND $addresses AS address
+            MATCH (wallet:Wallet {{address: address}})-[edge:_HAS_CONTEXT]->(:_Wic:_Context:_{self.subgraph_name}:_{context})
+            DELETE edge
+            RETURN count(edge)
+        """
+        for i in range(0, len(deletes), self.batch_size):
+            count += self.query(delete_query, parameters={"addresses": deletes[i:i + self.batch_size]})[0].value()
+
+        if None in current:
+            orphans_query = f"""
+                MATCH (node)-[edge:_HAS_CONTEXT]->(:_Wic:_Context:_{self.subgraph_name}:_{context})
+                WHERE node.address IS NULL
                 DELETE edge
                 RETURN count(edge)
-            ")
+            """
+            count += self.query(orphans_query)[0].value()
+        return count
+
+    def get_tracked_types(self):
+        """Returns the node labels and relationship types whose changes are tracked by the incremental mode:
+        all of them but the WIC ones (starting with _)"""
+        labels = [record["label"] for record in self.query("CALL db.labels()")]
+        types = [record["relationshipType"] for record in self.query("CALL db.relationshipTypes()")]
+        labels = [label for label in labels if not label.startswith("_")]
+        types = [relationship_type for relationship_type in types if not relationship_type.startswith("_")]
+        return labels, types
+
+    def create_change_indexes(self):
+        "Indexes the change properties of the tracked labels and relationship types, so the changes are read with index seeks"
+        labels, types = self.get_tracked_types()
+        Indexes().changeTracking(labels, types, CHANGE_PROPERTIES)
+
+    def get_change_branches(self, pattern, variable, bounded, returns):
+        """Index seekable UNION branches matching the pattern when one of its change properties is after $since
+        (and up to $watermark if bounded). Change properties are datetimes, or epoch milliseconds when written with timestamp(),
+        which do not compare with datetimes, so each property has a branch for both types.
+        returns takes the expression of the change as a datetime and returns the RETURN clause of the branch."""
+        branches = []
+        for prop in CHANGE_PROPERTIES:
+            item = f"{variable}.{prop}"
+            datetime_filter = f"{item} > datetime($since)" + (f" AND {item} <= datetime($watermark)" if bounded else "")
+            integer_filter = f"{item} > $sinceMillis" + (f" AND {item} <= $watermarkMillis" if bounded else "")
+            branches.append(f"MATCH {pattern} WHERE {datetime_filter} {returns(item)}")
+            branches.append(f"MATCH {pattern} WHERE {integer_filter} {returns(f'datetime({{epochMillis: {item}}})')}")
+        return branches
+
+    def get_change_parameters(self, since, watermark=None):
+        "Query parameters of the change branches, the bounds as ISO strings and as epoch milliseconds"
+        parameters = {"since": since, "sinceMillis": to_millis(since)}
+        if watermark:
+            parameters.update({"watermark": watermark, "watermarkMillis": to_millis(watermark)})
+        return parameters
+
+    def get_changes(self, since):
+        """Returns the most recent lastUpdateDt or createdDt after since (ISO string) of every tracked label and relationship type
+        that changed, as {(kind, name): ISO string} with kind node or edge. Every read is an index seek (see create_change_indexes)."""
+        labels, types = self.get_tracked_types()
+        parameters = self.get_change_parameters(since)
+        targets = [("node", label, f"(node:`{label}`)", "node") for label in labels]
+        targets += [("edge", relationship_type, f"()-[edge:`{relationship_type}`]->()", "edge") for relationship_type in types]
+        changes = {}
+        for kind, name, pattern, variable in targets:
+            branches = self.get_change_branches(pattern, variable, False, lambda item: f"RETURN {item} AS updated")
+            query = f"""
+                CALL {{
+                    {" UNION ALL ".join(branches)}
+                }}
+                RETURN max(updated).epochMillis AS updated
+            """
+            updated = self.query(query, parameters=parameters)[0].value()
+            if updated is not None:
+                changes[(kind, name)] = from_millis(updated)
+        return changes
+
+    @count_query_logging
+    def mark_touched_wallets(self, since, watermark, changes):
+        """Labels the wallets touched between since and watermark (ISO strings): the wallets that were updated,
+        whose relationships were created or updated, or whose neighbours were created or updated.
+        Only the labels and relationship types that changed (see get_changes) are read.
+        Raises if a batch failed, so the watermarks are not advanced past wallets that were not labelled."""
+        parameters = self.get_change_parameters(since, watermark)
+        write_query = f"""
+            SET wallet:{self.touched_label}
         """
-        self.query(query)[0].value()
-        
+        count = 0
+        for kind, name in changes:
+            if kind == "node":
+                branches = self.get_change_branches(f"(node:`{name}`)", "node", True, lambda item: "RETURN node")
+                match_query = f"""
+                    CALL {{
+                        {" UNION ".join(branches)}
+                    }}
+                    WITH node
+                    WHERE NOT node:_Wic
+                    OPTIONAL MATCH (node)-[edge]-(neighbour:Wallet)
+                    WHERE NOT type(edge) STARTS WITH '_'
+                    WITH node, collect(neighbour) AS neighbours
+                    WITH CASE WHEN node:Wallet THEN [node] ELSE [] END + neighbours AS wallets
+                    UNWIND wallets AS wallet
+                    RETURN DISTINCT wallet
+                """
+            else:
+                branches = self.get_change_branches(f"(source)-[edge:`{name}`]->(target)", "edge", True, lambda item: "RETURN source, target")
+                match_query = f"""
+                    CALL {{
+                        {" UNION ".join(branches)}
+                    }}
+                    UNWIND [source, target] AS wallet
+                    WITH wallet
+                    WHERE wallet:Wallet
+                    RETURN DISTINCT wallet
+                """
+            count += self.iterate(match_query, write_query, parameters=parameters, parallel=True, raise_on_failure=True)
+        return count
+
+    @count_query_logging
+    def clear_touched_wallets(self):
+        match_query = f"""
+            MATCH (wallet:{self.touched_label})
+            RETURN wallet
+        """
+        write_query = f"""
+            REMOVE wallet:{self.touched_label}
+        """
+        count = self.iterate(match_query, write_query, parallel=True)
+        return count
+
+    @count_query_logging
+    def clear_subgraph(self):
+        "Deletes the WIC nodes that are not in the conditions anymore, with their edges"
+        match_query = f"""
+            MATCH (wic:_Wic:_{self.subgraph_name})-[edge:_HAS_CONTEXT]-()
+            WHERE wic.toRemove = true
+            RETURN edge
+        """
+        write_query = """
+            DELETE edge
+        """
+        self.iterate(match_query, write_query)
+
         query = f"""
             MATCH (wic:_Wic:_{self.subgraph_name})
             WHERE wic.toRemove = true
@@ -15,33 +15,26 @@ class CreatorsCollectorsCypher(WICCypher):
         """
         self.query(monitor)
         connect = f"""
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MATCH (wallet:Wallet)-[r:HOLDS]->(token:Token)
+            MATCH (wallet:Wallet{self.scope(context)})-[r:HOLDS]->(token:Token)
             WHERE (token.address IN {addresses} OR token.contractAddress IN {addresses})
-            WITH wallet, wic, count(distinct(token)) as count_collections
+            WITH wallet, count(distinct(token)) as count_collections
             WHERE count_collections > 1
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con.count = count_collections
-            RETURN count(distinct(wallet)) AS count
+            RETURN DISTINCT wallet.address AS address, {{count: count_collections}} AS properties
         """
-        count = self.query(connect)[0].value()
+        count = self.query_context(context, connect)
         return count 
         
 
     @count_query_logging
     def three_letter_ens(self, context):
         query = f"""
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MATCH (wallet:Wallet)-[:HAS_ALIAS]-(alias:Alias:Ens)
-            WITH wallet, split(alias.name, ".eth")[0] AS ens_name, wic
+            MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ALIAS]-(alias:Alias:Ens)
+            WITH wallet, split(alias.name, ".eth")[0] AS ens_name
             WHERE size(ens_name) = 3 
-            WITH wallet, wic 
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            RETURN count(con)
+            WITH wallet
+            RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value() 
+        count = self.query_context(context, query) 
 
         return count
     
@@ -57,15 +50,12 @@ class CreatorsCollectorsCypher(WICCypher):
         MATCH (author)-[r:AUTHOR]->(article:Mirror)
         WITH author, count(distinct(article)) as arts
         WHERE arts >= 2
-        MATCH (author)-[r:AUTHOR]->(article)-[:HAS_NFT]-(:ERC721)-[:HOLDS_TOKEN]-(collector:Wallet)
+        MATCH (author)-[r:AUTHOR]->(article)-[:HAS_NFT]-(:ERC721)-[:HOLDS_TOKEN]-(collector:Wallet{self.scope(context)})
         WITH collector, count(distinct(article)) as arts
         WHERE arts >= 3
-        MATCH (wic:_Wic:_Context:_{context}:_{self.subgraph_name})
-        MERGE (collector)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(collector))
+        RETURN DISTINCT collector.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count 
 
@@ -74,16 +64,13 @@ class CreatorsCollectorsCypher(WICCypher):
         count = 0 
         ### gets collectors acc. neume
         neumeQuery = f"""
-        MATCH  (wallet:Wallet)-[hol:HOLDS_TOKEN]->(music:Token:MusicNft)
+        MATCH  (wallet:Wallet{self.scope(context)})-[hol:HOLDS_TOKEN]->(music:Token:MusicNft)
         WITH wallet, count(distinct(hol)) as collected
         WHERE collected > 1
-        MATCH (context:_Context:_Wic:_{self.subgraph_name}:_{context})
-        WITH wallet, context
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(neumeQuery)[0].value()
+        count += self.query_context(context, neumeQuery)
 
         return count        
             
\ No newline at end of file
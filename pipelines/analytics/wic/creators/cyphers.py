@@ -18,16 +18,12 @@ class CreatorsCypher(WICCypher):
     @count_query_logging
     def cc_writers(self, context, benchmark):
         connect_writers = f"""
-            MATCH (author:Wallet)-[r:AUTHOR]->(article:Article:Mirror)
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH author, count(distinct(article)) AS articles_count, tofloat({benchmark}) AS benchmark, wic
+            MATCH (author:Wallet{self.scope(context)})-[r:AUTHOR]->(article:Article:Mirror)
+            WITH author, count(distinct(article)) AS articles_count, tofloat({benchmark}) AS benchmark
             WHERE articles_count >= benchmark
-            MERGE (author)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con.count = articles_count
-            RETURN count(author)
+            RETURN DISTINCT author.address AS address, {{count: articles_count}} AS properties
         """
-        count = self.query(connect_writers)[0].value()
+        count = self.query_context(context, connect_writers)
         return count 
     
     @count_query_logging
@@ -35,29 +31,23 @@ class CreatorsCypher(WICCypher):
         count = 0 
         ### gets sound.xyz artists
         soundQuery = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]->(sound:Sound:Account)
-        MATCH (context:_Wic:_{self.subgraph_name}:_{context})
-        WITH wallet, context
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]->(sound:Sound:Account)
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(soundQuery)[0].value()
+        count = self.query_context(context, soundQuery)
         return count
 
     @count_query_logging
     def web3_data_analysts(self, context):
         ## folows = stars
         query = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]->(dune:Dune:Account)
-        MATCH (context:_Wic:_Context:_{self.subgraph_name}:_{context})
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]->(dune:Dune:Account)
         WHERE dune.follows > 0
-        WITH wallet, context
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count 
 
@@ -26,13 +26,15 @@ class DaoAnalysis(WICAnalysis):
                         "types": [TYPES["experiences"]],
                         "definition": "TBD", 
                     "weight": .9,
-                        "call": self.process_dao_funding_recipient
+                        "call": self.process_dao_funding_recipient,
+                        "dependencies": ["SnapshotAdmin", "MultisigSigner"]
                     },
                 "DaoTreasuryFunder": {
                     "types": [TYPES['experiences']],
                     "definition": "TBD", 
                     "weight": .75,
-                    "call": self.process_dao_treasury_funder
+                    "call": self.process_dao_treasury_funder,
+                    "dependencies": ["SnapshotAdmin", "MultisigSigner", "DaoFundingRecipient"]
                 },
                 "TechnicalContributor": {
                     "types": [TYPES['experiences']], 
@@ -12,52 +12,40 @@ class DaoCyphers(WICCypher):
     def get_org_multisig_signers(self, context):
         query = f"""
         MATCH (multisig:MultiSig)<-[account:HAS_ACCOUNT]-(entity:Entity) 
-        MATCH (wallet:Wallet)-[signer:IS_SIGNER]->(multisig)
-        MATCH (context:_Wic:_{self.subgraph_name}:_Context:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-        SET con.toRemove = null
-        RETURN COUNT(wallet)
+        MATCH (wallet:Wallet{self.scope(context)})-[signer:IS_SIGNER]->(multisig)
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
         return count
  
     @count_query_logging
     def get_snapshot_contributors(self, context):
         query = f"""
         MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)
-        MATCH (walletother)-[:CONTRIBUTOR]->(entity)
-        MATCH (context:_Wic:_{self.subgraph_name}:_Context:_{context})
-        MERGE (walletother)-[con:_HAS_CONTEXT]->(context)
-        SET con.toRemove = null
-        RETURN COUNT(walletother)
+        MATCH (walletother{self.scope(context)})-[:CONTRIBUTOR]->(entity)
+        RETURN DISTINCT walletother.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
         return count 
  
     @count_query_logging
     def get_dao_funding_recipients(self, context):
         count = 0
         snapshot = f"""
-        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)-[trans:TRANSFERRED]->(otherWallet:Wallet)-[:_HAS_CONTEXT]-(wic:_Context)
+        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)-[trans:TRANSFERRED]->(otherWallet:Wallet{self.scope(context)})-[:_HAS_CONTEXT]-(wic:_Context)
         MATCH (otherWallet)-[:HAS_ACCOUNT]-()
         WHERE trans.nb_transfer >= 5
         WITH otherWallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (otherWallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(otherWallet))
+        RETURN DISTINCT otherWallet.address AS address
         """
-        count += self.query(snapshot)[0].value()
+        count += self.query_context(context, snapshot)
 
         propHouse = f"""
-        MATCH (wallet:Wallet)-[:AUTHOR]->(proposal:Proposal:Winner)
+        MATCH (wallet:Wallet{self.scope(context)})-[:AUTHOR]->(proposal:Proposal:Winner)
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(propHouse)[0].value()
+        count += self.query_context(context, propHouse)
         return count 
 
     ## can update this once we have Twitter / Token
@@ -65,29 +53,23 @@ class DaoCyphers(WICCypher):
     def get_dao_treasury_funders(self, context):
         count = 0 
         query = f"""
-        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)<-[trans:TRANSFERRED]-(otherWallet:Wallet)-[:_HAS_CONTEXT]-(wic:_Context)
+        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)<-[trans:TRANSFERRED]-(otherWallet:Wallet{self.scope(context)})-[:_HAS_CONTEXT]-(wic:_Context)
         MATCH (otherWallet)-[:HAS_ACCOUNT]-()
         WHERE trans.nb_transfer >= 5
         WITH otherWallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (otherWallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(otherWallet))
+        RETURN DISTINCT otherWallet.address AS address
         """
-        count += self.query(query)[0].value()
+        count += self.query_context(context, query)
 
         return count 
     @count_query_logging
     def get_technical_contributors(self, context):
         count = 0 
         query = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(g:Github)-[:CONTRIBUTOR]->(repo:Repository)-[:HAS_REPOSITORY]-(token:Token)-[:HAS_STRATEGY]-(:Entity)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(g:Github)-[:CONTRIBUTOR]->(repo:Repository)-[:HAS_REPOSITORY]-(token:Token)-[:HAS_STRATEGY]-(:Entity)
         WITH wallet 
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
         return count
 
@@ -53,9 +53,15 @@ class IncentiveFarmerAnalysis(WICAnalysis):
         susDao = self.susDao
         self.cyphers.connect_suspicious_snapshot_daos(context)
     
+    def get_mirror_benchmark(self):
+        "Cutoff of the number of articles authored by a wallet: 1.25 times the 95th percentile"
+        biadjacency, _, _ = self.snapshot.get_biadjacency("Wallet", "AUTHOR", "Article", target_key="uri", direction="out")
+        percentile = self.snapshot.get_percentile(self.snapshot.get_degrees(biadjacency), .95)
+        return percentile * 1.25 if percentile is not None else None
+
     def process_suspicious_mirror(self, context):
         self.cyphers.remove_mirror_label()
-        cutoff = self.cyphers.get_mirror_benchmark()
+        cutoff = self.get_mirror_benchmark()
         self.cyphers.label_mirror(cutoff)
         self.cyphers.connect_suspicious_mirror(context)
         self.cyphers.clean()
@@ -9,15 +9,12 @@ class FarmerCyphers(WICCypher):
     @count_query_logging
     def connect_suspicious_snapshot_daos(self, context):
         connect_wallets = f"""
-            MATCH (context:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MATCH (wallet:Wallet)-[r:VOTED]->(p:Proposal)-[:HAS_PROPOSAL]-(entity:SuspiciousDao)
-            WITH wallet, context
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-            SET con.toRemove = null
-            RETURN count(distinct(wallet)) AS count
+            MATCH (wallet:Wallet{self.scope(context)})-[r:VOTED]->(p:Proposal)-[:HAS_PROPOSAL]-(entity:SuspiciousDao)
+            WITH wallet
+            RETURN DISTINCT wallet.address AS address
         """
         logging.info(connect_wallets)
-        count = self.query(connect_wallets)[0].value()
+        count = self.query_context(context, connect_wallets)
         return count 
 
     @count_query_logging
@@ -32,17 +29,6 @@ class FarmerCyphers(WICCypher):
 
         return count 
 
-    def get_mirror_benchmark(self):
-        get_extreme = """
-            MATCH (w:Wallet)-[r:AUTHOR]->(a:Article)
-            WITH w, count(distinct(a)) AS articles
-            WITH apoc.agg.percentiles(articles)[3] * 1.25 AS arts
-            RETURN arts AS cutoff
-        """
-        cutoff = self.query(get_extreme)[0].value()
-
-        return cutoff
-
     @count_query_logging
     def label_mirror(self, benchmark):
         query = f"""
@@ -59,14 +45,11 @@ class FarmerCyphers(WICCypher):
     @count_query_logging
     def connect_suspicious_mirror(self, context):
         connect_extreme = f"""
-            MATCH (wallet:MirrorFarmer)
-            MATCH (context:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH wallet, context
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-            SET con.toRemove = null
-            RETURN count(distinct(wallet)) AS count
+            MATCH (wallet:MirrorFarmer{self.scope(context)})
+            WITH wallet
+            RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(connect_extreme)[0].value()
+        count = self.query_context(context, connect_extreme)
 
         return count 
 
@@ -86,29 +69,23 @@ class FarmerCyphers(WICCypher):
         ## needs to be replaced lol
         ## this comes from an export of a dune dashboard
         query = f"""
-        MATCH (wallet:Wallet) 
+        MATCH (wallet:Wallet{self.scope(context)}) 
         WHERE wallet.address in $addresses
         WITH wallet
-        MATCH (context:_Context:_Wic:_{context}:_{self.subgraph_name})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(context)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query, parameters={"addresses": addresses})[0].value()
+        count = self.query_context(context, query, parameters={"addresses": addresses})
 
         return count
 
     @count_query_logging
     def identify_spam_contract_deployers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:DEPLOYED]->(token:SpamContract)
-        MATCH (wic:_Wic:_{context}:_{self.subgraph_name})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        MATCH (wallet:Wallet{self.scope(context)})-[r:DEPLOYED]->(token:SpamContract)
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count 
 
@@ -117,23 +94,16 @@ class FarmerCyphers(WICCypher):
         connect = f"""
             WITH datetime(apoc.date.toISO8601(apoc.date.currentTimestamp(), 'ms')) AS timeNow
             MATCH (wallet:Wallet)-[r:_HAS_CONTEXT]->(context:_Context:_{self.subgraph_name})
-            MATCH (wallet:Wallet)-[:IS_SIGNER]-(:MultiSig)-[:IS_SIGNER]-(otherwallet)
+            MATCH (wallet:Wallet)-[:IS_SIGNER]-(:MultiSig)-[:IS_SIGNER]-(otherwallet:Wallet{self.scope(context)})
             MATCH (cosigners:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WHERE NOT (otherwallet)-[:_HAS_CONTEXT]->(:_{self.subgraph_name})
+            WHERE size([(otherwallet)-[:_HAS_CONTEXT]->(other:_{self.subgraph_name}) WHERE NOT other:_{context} | other]) = 0
             WITH otherwallet, cosigners, wallet, timeNow
-            MATCH (otherwallet)
-            MATCH (cosigners)
-            MATCH (wallet)
-            MERGE (otherwallet)-[con:_HAS_CONTEXT]->(cosigners)
             MERGE (otherwallet)-[conbud:_HAS_CONTEXT_BUDDY]->(wallet)
-            SET con.toRemove = null
-            SET conbud.toRemove = null
             SET conbud.`_context` = cosigners.`_displayName`
-            SET con.createdDt = timeNow
             SET conbud.createdDt = timeNow
-            RETURN count(otherwallet)
+            RETURN DISTINCT otherwallet.address AS address
         """
-        count = self.query(connect)[0].value()
+        count = self.query_context(context, connect)
         return count
 
     @count_query_logging
@@ -150,13 +120,10 @@ class FarmerCyphers(WICCypher):
 
         connect = f"""
         MATCH (counterParty:FarmerCounterParty)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH counterParty, wic
-        MERGE (counterParty)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(counterParty))
+        WITH counterParty
+        RETURN DISTINCT counterParty.address AS address
         """
-        count = self.query(connect)[0].value()
+        count = self.query_context(context, connect)
 
         return count
 
@@ -16,15 +16,12 @@ class InfluencersCyphers(WICCypher):
         threshold = self.query(mirrorThreshold)[0].value()
         
         mirrorConnect = f"""
-        MATCH (author:Wallet)-[aut:AUTHOR]->(mirror)-[:HAS_NFT]-(:Token)-[:HOLDS_TOKEN]-(collector:Wallet)
+        MATCH (author:Wallet{self.scope(context)})-[aut:AUTHOR]->(mirror)-[:HAS_NFT]-(:Token)-[:HOLDS_TOKEN]-(collector:Wallet)
         WITH author, count(distinct(collector)) as collectors
         WHERE collectors > {threshold}
         WITH author
-        MATCH (wic:_Wic:_Context:_{context}:_{self.subgraph_name})
-        MERGE (author)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(author))"""
-        count = self.query(mirrorConnect)[0].value()
+        RETURN DISTINCT author.address AS address"""
+        count = self.query_context(context, mirrorConnect)
 
         return count
 
@@ -32,35 +29,26 @@ class InfluencersCyphers(WICCypher):
     def get_substack_influencer(self, context):
         count = 0 
         substackQuery = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(twitter:Twitter:Account)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(twitter:Twitter:Account)
         MATCH (wallet)-[:HAS_ACCOUNT]-(substack:Substack:Account)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(substackQuery)[0].value()
+        count += self.query_context(context, substackQuery)
 
         twitterStuffs = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(twitter:Twitter:Account)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(twitter:Twitter:Account)
         WHERE (twitter.bio contains "substack" or twitter.name contains "substack" or twitter.handle contains "substack")
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wic))"""
-        count += self.query(twitterStuffs)[0].value()
+        RETURN DISTINCT wallet.address AS address"""
+        count += self.query_context(context, twitterStuffs)
 
         newsy = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(twitter:Twitter:Account)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(twitter:Twitter:Account)
         WHERE (twitter.bio contains "newsletter" or twitter.name contains "newsletter" or twitter.handle contains "newsletter")
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wic))"""
-        count += self.query(newsy)[0].value()
+        RETURN DISTINCT wallet.address AS address"""
+        count += self.query_context(context, newsy)
 
         return count 
 
@@ -72,35 +60,26 @@ class InfluencersCyphers(WICCypher):
         CALL db.index.fulltext.queryNodes("wicBios", "'podcaster' OR 'podcast'") 
         YIELD node
         UNWIND node AS podcaster
-        MATCH (podcaster)-[:HAS_ACCOUNT]-(wallet:Wallet)
+        MATCH (podcaster)-[:HAS_ACCOUNT]-(wallet:Wallet{self.scope(context)})
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wic))"""
-        count += self.query(bioQuery)[0].value()
+        RETURN DISTINCT wallet.address AS address"""
+        count += self.query_context(context, bioQuery)
  
         otherAspects = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(twitter:Twitter)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(twitter:Twitter)
         WHERE (twitter.name contains "podcast" or twitter.handle contains "podcast")
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{context}:_{self.subgraph_name})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(otherAspects)[0].value()
+        count += self.query_context(context, otherAspects)
 
         websites = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(website:Website:Account)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(website:Website:Account)
         WHERE (website.url contains "podcast" OR website.url contains "podcasts")
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(websites)[0].value()
+        count += self.query_context(context, websites)
  
         return count
  
@@ -116,14 +95,11 @@ class InfluencersCyphers(WICCypher):
         self.query(query)
  
         connect = f"""
-        MATCH (wallet:Wallet:InfluencerWallet)
-        MATCH (wic:_Wic:_{context}:_{self.subgraph_name})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        MATCH (wallet:Wallet{self.scope(context)}:InfluencerWallet)
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(connect)[0].value()
+        count = self.query_context(context, connect)
  
         return count
 
@@ -137,14 +113,11 @@ class InfluencersCyphers(WICCypher):
         cutoff = self.query(threshold)[0].value()
 
         connect = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(dune:Dune:Account)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(dune:Dune:Account)
         WHERE dune.follows > {cutoff}
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(connect)[0].value()
+        count = self.query_context(context, connect)
 
         return count 
\ No newline at end of file
@@ -14,42 +14,76 @@ class InterestsAnalysis(WICAnalysis):
                         "types": [TYPES["interests"]],
                         "definition": "TBD", 
                         "weight": 0,
+                        "keywords": {
+                            "bios": ["music", "album", "musician"],
+                            "articles": ["music", "musician", "concert"],
+                            "collected": ["music", "musician"]
+                        },
                         "call": self.process_music
                     },
                     "Gaming": {
                         "types": [TYPES['interests']],
                         "definition": "TBD", 
                         "weight": 0,
-                        "call": self.process_gaming
+                        "keywords": {
+                            "bios": ["gaming", "video games", "gamer"],
+                            "articles": ["gaming", "video games", "gamer"],
+                            "collected": ["gaming", "video games", "gamer"],
+                            "grants": ["gaming", "video games", "gamer"]
+                        }
                     },
                     "Outdoors": {
                         "types": [TYPES['interests']],
                         "definition": "TBD", 
                         "weight": 0,
-                        "call": self.process_outdoors
+                        "keywords": {
+                            "bios": ["outdoors", "nature"],
+                            "articles": ["outdoors", "nature"],
+                            "collected": ["outdoors", "nature"],
+                            "grants": ["outdoors", "nature"]
+                        }
                     },
                     "FilmVideo": {
                         "types": [TYPES['interests']], 
                         "definition": "TBD", 
                         "weight": 0,
-                        "call": self.process_film_video
+                        "keywords": {
+                            "bios": ["movies", "cinema"],
+                            "articles": ["movies", "cinema"],
+                            "collected": ["movies", "cinema"],
+                            "grants": ["movies", "cinema"]
+                        }
                     },
                     "Photography": {
                         "types": [TYPES['interests']],
                         "definition": "TBD", 
                         "weight": 0,
-                        "call": self.process_photography
+                        "keywords": {
+                            "bios": ["photography", "photographer"],
+                            "articles": ["photography", "photographer"],
+                            "collected": ["photography", "photographer"],
+                            "grants": ["photography", "photographer"]
+                        }
                     },
                     "CultureCommentary": {
                         "types": [TYPES['interests']],
                         "definition": "TBD", 
                         "weight": 0,
-                        "call": self.process_culture
+                        "keywords": {
+                            "bios": ["cultural commentary", "web3 culture"],
+                            "articles": ["cultural commentary", "web3 culture"],
+                            "collected": ["cultural commentary", "web3 culture"],
+                            "grants": ["cultural commentary", "web3 culture", "boys club"]
+                        }
                     },
                     "WritingPublishing": {
                         "types": [TYPES['interests']],
                         "definition": "TBD", 
                         "weight": 0,
+                        "keywords": {
+                            "bios": ["writing at", "substack", "author", "newsletter"],
+                            "grants": ["writing at", "substack", "author", "newsletter"]
+                        },
                         "call": self.process_writing_publishing
                     },
                 },
@@ -58,13 +92,23 @@ class InterestsAnalysis(WICAnalysis):
                     "types": [TYPES['interests']],
                     "definition": "TBD", 
                         "weight": 0,
-                    "call": self.process_data_science
+                    "keywords": {
+                        "bios": ["data science", "data scientist", "machine learning engineer"],
+                        "articles": ["data science", "data scientist", "machine learning engineer"],
+                        "collected": ["data science", "data scientist", "machine learning engineer"],
+                        "grants": ["data science", "data scientist", "machine learning engineer"]
+                    }
                 },
                 "DeSci": {
                     "types": [TYPES['interests']],
                     "definition": "TBD", 
                         "weight": 0,
-                    "call": self.process_desci
+                    "keywords": {
+                        "bios": ["desci", "decentralized science"],
+                        "articles": ["desci", "decentralized science"],
+                        "collected": ["desci", "decentralized science"],
+                        "grants": ["desci", "decentralized science"]
+                    }
                 }
             },
             "SocialJustice": {
@@ -72,19 +116,34 @@ class InterestsAnalysis(WICAnalysis):
                     "types": [TYPES['interests']],
                     "definition": "TBD", 
                         "weight": 0,
-                    "call": self.process_dei
+                    "keywords": {
+                        "bios": ["diversity equity and inclusion", "dei"],
+                        "articles": ["diversity equity and inclusion", "dei"],
+                        "collected": ["diversity equity and inclusion", "dei"],
+                        "grants": ["diversity equity and inclusion", "dei"]
+                    }
                 },
                 "RegenerativeSystems": {
                     "types": [TYPES['interests']],
                     "definition": "TBD", 
                         "weight": 0,
-                    "call": self.process_regen
+                    "keywords": {
+                        "bios": ["regen", "refi"],
+                        "articles": ["regen", "refi"],
+                        "collected": ["regen", "refi"],
+                        "grants": ["regen", "refi"]
+                    }
                 },
                 "Education": {
                     "types": [TYPES['interests']],
                     "definition": "TBD", 
                         "weight": 0,
-                    "call": self.process_education
+                    "keywords": {
+                        "bios": ["education", "educator", "teacher"],
+                        "articles": ["education", "educator", "teacher"],
+                        "collected": ["education", "educator", "teacher"],
+                        "grants": ["education", "educator", "teacher"]
+                    }
                 }
             }
         }
@@ -96,54 +155,10 @@ class InterestsAnalysis(WICAnalysis):
         logging.info("Finding people interested in music...")
         self.cyphers.find_music_interested(context)
 
-    def process_gaming(self, context):
-        logging.info("Finding people interested in gaming...")
-        self.cyphers.find_gaming_interested(context)
-    
-    def process_outdoors(self, context):
-        logging.info("Finding outdoors interested...")
-        self.cyphers.find_outdoors_interested(context)
-
-    def process_film_video(self, context):
-        logging.info("Finding film  video...")
-        self.cyphers.find_film_video(context)
-
-    def process_photography(self, context):
-        logging.info("finding photography...")
-        self.cyphers.find_photography(context)
-
-    def process_culture(self, context):
-        logging.info("finding culturecommentary...")
-        self.cyphers.find_culture(context)
-
     def process_writing_publishing(self,context):
         logging.info("finding writing/publishing..")
         self.cyphers.find_writing_publishing(context)
 
-    def process_data_science(self, context):
-        logging.info('finding data scientists...')
-        self.cyphers.find_data_scientists(context)
-
-    def process_data_science(self, context):
-        logging.info('finding data scientists...')
-        self.cyphers.find_data_scientists(context)
-
-    def process_desci(self, context):
-        logging.info("finding desci folks...")
-        self.cyphers.find_desci(context)
-
-    def process_dei(self, context):
-        logging.info('finding dei')
-        self.cyphers.find_dei(context)
-
-    def process_regen(self, context):
-        logging.info("finding regen")
-        self.cyphers.find_regen(context)
-
-    def process_education(self, context):
-        logging.info('find education')
-        self.cyphers.find_ed(context)
-
     def run(self):
         self.process_conditions()
 
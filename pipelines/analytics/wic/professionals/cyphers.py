@@ -6,31 +6,6 @@ class ProfessionalsCyphers(WICCypher):
         WICCypher.__init__(self, subgraph_name, conditions, database)
  
  
-    @count_query_logging
-    def identify_founders_bios(self, context, queryString):
- 
-        label = f"""
-        CALL db.index.fulltext.queryNodes("wicBios", "{queryString}") 
-        YIELD node
-        UNWIND node AS founder
-        MATCH (founder)-[:HAS_ACCOUNT]-(wallet:Wallet)
-        WHERE NOT wallet:FounderWallet
-        SET wallet:FounderWallet"""
- 
-        self.query(label)
- 
-        connect = f"""
-        MATCH (wallet:FounderWallet:Wallet)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))"""
- 
-        count = self.query(connect)[0].value()
- 
-        return count
- 
     @count_query_logging
     def identify_podcasters_bios(self, context, queryString):
  
@@ -45,167 +20,43 @@ class ProfessionalsCyphers(WICCypher):
         self.query(label)
  
         connect = f"""
-        MATCH (wallet:Wallet:PodcasterWallet)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))"""
+        MATCH (wallet:Wallet{self.scope(context)}:PodcasterWallet)
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address"""
  
-        count = self.query(connect)[0].value()
+        count = self.query_context(context, connect)
  
         return count
  
     @count_query_logging
     def identify_investors_bios(self, context):
         count = 0 
-        label = """
-        CALL db.index.fulltext.queryNodes("wicBios", "'investment fund' OR 'venture capital firm'  OR  'investing in' OR 'VC' OR 'investment firm' OR 'seed stage' OR 'pre-seed") 
-        YIELD node 
-        UNWIND node AS nn 
-        SET nn:Investment"""
-        self.query(label)
-
-        connectDirect = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(twitter:Twitter:Investment) 
-        WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
-        """
-        count += self.query(connectDirect)[0].value()
-
         connectIndirect = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(:Account)-[:BIO_MENTIONED]->(account:Account:Investor)
-        WHERE NOT (wallet)-[:_HAS_CONTEXT]->(:_{context}:_{self.subgraph_name})
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(:Account)-[:BIO_MENTIONED]->(account:Account:Investor)
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (walelt)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wic))
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(connectIndirect)[0].value()
+        count += self.query_context(context, connectIndirect)
   
         return count
  
-    @count_query_logging
-    def identify_marketers_bios(self, context, queryString):
- 
-        label = f"""
-        CALL db.index.fulltext.queryNodes("wicBios", "{queryString}") 
-        YIELD node
-        UNWIND node AS marketer
-        MATCH (marketer)-[:HAS_ACCOUNT]-(wallet:Wallet)
-        WHERE NOT wallet:MarketerWallet
-        SET wallet:MarketerWallet"""
- 
-        self.query(label)
- 
-        connect = f"""
-        MATCH (wallet:Wallet:MarketerWallet)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))"""
-        count = self.query(connect)[0].value()
- 
-        return count
- 
-    @count_query_logging
-    def identify_community_lead_bios(self, context, queryString):
-        label = f"""
-        CALL db.index.fulltext.queryNodes("wicBios", "{queryString}") 
-        YIELD node
-        UNWIND node AS communityLead
-        MATCH (communityLead)-[:HAS_ACCOUNT]-(wallet:Wallet)
-        WHERE NOT wallet:CommunityLeadWallet
-        SET wallet:CommunityLeadWallet"""
- 
-        self.query(label)
- 
-        connect = f"""
-        MATCH (wallet:Wallet:CommunityLeadWallet)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))"""
-        count = self.query(connect)[0].value()
- 
-        return count
- 
- 
-    @count_query_logging
-    def identify_devrel_bios(self, context, queryString):
-        label = f"""
-        CALL db.index.fulltext.queryNodes("wicBios", "{queryString}") 
-        YIELD node
-        UNWIND node AS devRel
-        MATCH (devRel)-[:HAS_ACCOUNT]-(wallet:Wallet)
-        WHERE NOT wallet:DevRelWallet
-        SET wallet:DevRelWallet"""
- 
-        self.query(label)
- 
-        connect = f"""
-        MATCH (wallet:Wallet:DevRelWallet)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))"""
-        count = self.query(connect)[0].value()
- 
-        return count
- 
-    @count_query_logging
-    def identify_sales_partnerships(self, context, queryString):
-        label = f"""
-        CALL db.index.fulltext.queryNodes("wicBios", "{queryString}") 
-        YIELD node
-        UNWIND node AS companyOfficer
-        MATCH (companyOfficer)-[:HAS_ACCOUNT]-(wallet:Wallet)
-        WHERE NOT wallet:BdWallet
-        SET wallet:BdWallet"""
- 
-        self.query(label)
- 
-        connect = f"""
-        MATCH (wallet:Wallet:BdWallet)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))"""
-        count = self.query(connect)[0].value()
- 
-        return count
-
     @count_query_logging
     def get_dao_funding_recipients(self, context):
         count = 0
         snapshot = f"""
-        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)-[trans:TRANSFERRED]->(otherWallet:Wallet)-[:_HAS_CONTEXT]-(wic:_Context)
+        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)-[trans:TRANSFERRED]->(otherWallet:Wallet{self.scope(context)})-[:_HAS_CONTEXT]-(wic:_Context)
         WHERE trans.nb_transfer > 1
         WITH otherWallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (otherWallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(otherWallet))
+        RETURN DISTINCT otherWallet.address AS address
         """
-        count += self.query(snapshot)[0].value()
+        count += self.query_context(context, snapshot)
 
         propHouse = f"""
-        MATCH (wallet:Wallet)-[:AUTHOR]->(proposal:Proposal:Winner)
+        MATCH (wallet:Wallet{self.scope(context)})-[:AUTHOR]->(proposal:Proposal:Winner)
         WITH wallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wallet))
+        RETURN DISTINCT wallet.address AS address
         """
-        count += self.query(propHouse)[0].value()
+        count += self.query_context(context, propHouse)
 
         return count 
 
@@ -213,15 +64,12 @@ class ProfessionalsCyphers(WICCypher):
     def get_dao_treasury_funders(self, context):
         count = 0 
         query = f"""
-        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)<-[trans:TRANSFERRED]-(otherWallet:Wallet)-[:_HAS_CONTEXT]-(wic:_Context)
+        MATCH (entity:Entity)-[:HAS_ACCOUNT]-(wallet:Wallet)<-[trans:TRANSFERRED]-(otherWallet:Wallet{self.scope(context)})-[:_HAS_CONTEXT]-(wic:_Context)
         WHERE trans.nb_transfer > 1
         WITH otherWallet
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (otherWallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(otherWallet))
+        RETURN DISTINCT otherWallet.address AS address
         """
-        count += self.query(query)[0].value()
+        count += self.query_context(context, query)
 
         return count 
 
@@ -229,13 +77,10 @@ class ProfessionalsCyphers(WICCypher):
     def get_technical_contributors(self, context):
         count = 0 
         query = f"""
-        MATCH (wallet:Wallet)-[:HAS_ACCOUNT]-(g:Github)-[:CONTRIBUTOR]->(repo:Repository)-[:HAS_REPOSITORY]-(token:Token)-[:HAS_STRATEGY]-(:Entity)
+        MATCH (wallet:Wallet{self.scope(context)})-[:HAS_ACCOUNT]-(g:Github)-[:CONTRIBUTOR]->(repo:Repository)-[:HAS_REPOSITORY]-(token:Token)-[:HAS_STRATEGY]-(:Entity)
         WITH wallet 
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        RETURN COUNT(DISTINCT(wic))
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
@@ -11,16 +11,12 @@ class ProtocolPoliticiansCyphers(WICCypher):
         ### I would like to revisit this after we do network enrichment for ML. 
         ### I/e maybe we need to add VOTED edges between wallets and entities and put count on the edge
         query = f"""
-        MATCH (w:Wallet)-[r:VOTED]->(p:Proposal)-[:HAS_PROPOSAL]-(e:Entity)
-        MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-        WITH w, count(distinct(p)) AS votes, wic
+        MATCH (w:Wallet{self.scope(context)})-[r:VOTED]->(p:Proposal)-[:HAS_PROPOSAL]-(e:Entity)
+        WITH w, count(distinct(p)) AS votes
         WHERE votes > 10
-        MERGE (w)-[con:_HAS_CONTEXT]->(wic)
-        SET con.toRemove = null
-        SET con._count = votes
-        RETURN count(distinct(w))
+        RETURN DISTINCT w.address AS address, {{_count: votes}} AS properties
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
         return count 
 
     def get_proposal_authors_benchmark(self):
@@ -36,45 +32,33 @@ class ProtocolPoliticiansCyphers(WICCypher):
     def connect_proposal_author(self, context, benchmark): ##FocusedProposalAuthor
         engaged_query = f"""
             WITH tofloat({benchmark}) AS engaged_benchmark
-            MATCH (w:Wallet)-[r:AUTHOR]->(p:Proposal)-[:HAS_PROPOSAL]-(e:Entity)
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH w, count(distinct(p)) AS authored, engaged_benchmark, wic
-            WITH w, wic, (tofloat(authored) / engaged_benchmark) AS againstBenchmark
-            MERGE (w)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._againstBenchmark = againstBenchmark
-            RETURN count(distinct(w))
+            MATCH (w:Wallet{self.scope(context)})-[r:AUTHOR]->(p:Proposal)-[:HAS_PROPOSAL]-(e:Entity)
+            WITH w, count(distinct(p)) AS authored, engaged_benchmark
+            WITH w, (tofloat(authored) / engaged_benchmark) AS againstBenchmark
+            RETURN DISTINCT w.address AS address, {{_againstBenchmark: againstBenchmark}} AS properties
         """
-        count = self.query(engaged_query)[0].value()
+        count = self.query_context(context, engaged_query)
         return count 
 
     @count_query_logging
     def connect_delegates(self, context): 
         delegates = f"""
-            MATCH (delegator:Wallet)-[:DELEGATES_TO]->(delegate:Wallet)
+            MATCH (delegator:Wallet)-[:DELEGATES_TO]->(delegate:Wallet{self.scope(context)})
             WHERE id(delegator) <> id(delegate)
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH delegate, wic, count(distinct(delegator)) AS delegators_count
-            MERGE (delegate)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._count = delegators_count
-            RETURN count(distinct(delegate))
+            WITH delegate, count(distinct(delegator)) AS delegators_count
+            RETURN DISTINCT delegate.address AS address, {{_count: delegators_count}} AS properties
         """
-        count = self.query(delegates)[0].value()
+        count = self.query_context(context, delegates)
         return count 
 
     @count_query_logging
     def connect_dao_admins(self, context):
         query = f"""
-            MATCH (w:Wallet)-[r:CONTRIBUTOR]->(i:Entity)
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH w,wic, count(distinct(i)) AS contributing
-            MERGE (w)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._count = contributing
-            RETURN count(distinct(w))
+            MATCH (w:Wallet{self.scope(context)})-[r:CONTRIBUTOR]->(i:Entity)
+            WITH w, count(distinct(i)) AS contributing
+            RETURN DISTINCT w.address AS address, {{_count: contributing}} AS properties
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
         return count
 
 
@@ -65,8 +65,13 @@ class EcoDevAnalysis(WICAnalysis):
         self.gdaos = ['Metacartel', 'Unlock Protocol', 'MetaGammaDelta', 'Grants', 'Gitcoin', 'Unlock Protocol']
         self.incubators = ['Seed Club']
 
+    def get_grant_admin_benchmark(self):
+        "Median number of grants a wallet is an admin or a member of"
+        biadjacency, _, _ = self.snapshot.get_biadjacency("Wallet", "IS_ADMIN|MEMBER_OF", "Grant", direction="out")
+        return self.snapshot.get_percentile(self.snapshot.get_degrees(biadjacency), .5)
+
     def process_gitcoin_grant_admins(self, context):
-        benchmark = self.cyphers.get_grant_admin_benchmark()
+        benchmark = self.get_grant_admin_benchmark()
         self.cyphers.connect_gitcoin_grant_admins(context, benchmark)
 
     def process_gitcoin_grant_donor(self, context):
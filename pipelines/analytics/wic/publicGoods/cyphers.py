@@ -18,42 +18,24 @@ class EcoDevCyphers(WICCypher):
     @count_query_logging
     def connect_gitcoin_grant_donors(self, context):
         connect_query = f"""
-            MATCH (wallet:Wallet)-[r:DONATION]->(g:Grant)
+            MATCH (wallet:Wallet{self.scope(context)})-[r:DONATION]->(g:Grant)
             WITH wallet, count(distinct(g)) AS donations
             WHERE donations > 2
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            RETURN count(distinct(wallet))
+            RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(connect_query)[0].value()
+        count = self.query_context(context, connect_query)
         return count 
 
-    def get_grant_admin_benchmark(self):
-        benchmark_query = """
-            MATCH (wallet:Wallet)-[r:IS_ADMIN|MEMBER_OF]->(grant:Grant)
-            WITH wallet, count(distinct(grant)) AS grants_admin
-            WITH apoc.agg.percentiles(grants_admin, [.5]) AS percentile
-            RETURN tofloat(percentile[0]) AS benchmark
-        """
-        benchmark = self.query(benchmark_query)[0].value()
-        return benchmark
-
     @count_query_logging
     def connect_gitcoin_grant_admins(self, context, benchmark):
         connect_query = f"""
             WITH {benchmark} AS benchmark 
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MATCH (wallet:Wallet)-[:IS_ADMIN]-(grant:Grant)
-            WITH wallet, count(distinct(grant)) AS grants_admin, wic, benchmark
-            WITH wallet, wic, (tofloat(grants_admin) / benchmark) AS againstBenchmark
-            MATCH (wallet)
-            MATCH (wic)
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._againstBenchmark = againstBenchmark
-            RETURN count(distinct(wallet))
+            MATCH (wallet:Wallet{self.scope(context)})-[:IS_ADMIN]-(grant:Grant)
+            WITH wallet, count(distinct(grant)) AS grants_admin, benchmark
+            WITH wallet, (tofloat(grants_admin) / benchmark) AS againstBenchmark
+            RETURN DISTINCT wallet.address AS address, {{_againstBenchmark: againstBenchmark}} AS properties
         """
-        count = self.query(connect_query)[0].value()
+        count = self.query_context(context, connect_query)
         return count
 
     @count_query_logging
@@ -76,14 +58,11 @@ class EcoDevCyphers(WICCypher):
     @count_query_logging
     def connect_grant_dao_wallets(self, context):
         connect_wallets = f"""
-            MATCH (wallet:Wallet)-[r:VOTED]->(p:Proposal)-[:HAS_PROPOSAL]-(e:Entity)-[:_PARADIGM_CASE]-(wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH wallet, count(distinct(e)) AS ents, wic
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._count = ents
-            RETURN count(distinct(wallet))
+            MATCH (wallet:Wallet{self.scope(context)})-[r:VOTED]->(p:Proposal)-[:HAS_PROPOSAL]-(e:Entity)-[:_PARADIGM_CASE]-(wic:_Wic:_{self.subgraph_name}:_Context:_{context})
+            WITH wallet, count(distinct(e)) AS ents
+            RETURN DISTINCT wallet.address AS address, {{_count: ents}} AS properties
         """
-        count = self.query(connect_wallets)[0].value()
+        count = self.query_context(context, connect_wallets)
         return count
 
     def get_gitcoin_bounty_creator_benchmark(self):
@@ -99,18 +78,12 @@ class EcoDevCyphers(WICCypher):
     def connect_gitcoin_bounty_creators(self, context, benchmark):
         connect_query = f"""
             WITH tofloat({benchmark}) AS benchmark
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MATCH (bounty:Bounty:Gitcoin)-[:IS_OWNER]-(g:Account:Github)-[:HAS_ACCOUNT]-(wallet:Wallet)
-            WITH wallet, count(distinct(bounty)) AS bounties, wic, benchmark
-            WITH wallet, wic, (tofloat(bounties) / benchmark) AS againstBenchmark
-            MATCH (wallet)
-            MATCH (wic)
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._againstBenchmark = againstBenchmark
-            RETURN count(distinct(wallet))
+            MATCH (bounty:Bounty:Gitcoin)-[:IS_OWNER]-(g:Account:Github)-[:HAS_ACCOUNT]-(wallet:Wallet{self.scope(context)})
+            WITH wallet, count(distinct(bounty)) AS bounties, benchmark
+            WITH wallet, (tofloat(bounties) / benchmark) AS againstBenchmark
+            RETURN DISTINCT wallet.address AS address, {{_againstBenchmark: againstBenchmark}} AS properties
         """
-        count = self.query(connect_query)[0].value()
+        count = self.query_context(context, connect_query)
         return count
 
     def get_gitcoin_bounty_fullfilers_benchmark(self):
@@ -126,21 +99,14 @@ class EcoDevCyphers(WICCypher):
     def connect_gitcoin_bounty_fulfillers(self, context, benchmark):
         connect_query = f"""
             WITH tofloat({benchmark}) AS benchmark
-            MATCH (bounty:Bounty:Gitcoin)-[:HAS_FULLFILLED]-(g:Account:Github)-[:HAS_WALLET]-(wallet:Wallet)
+            MATCH (bounty:Bounty:Gitcoin)-[:HAS_FULLFILLED]-(g:Account:Github)-[:HAS_WALLET]-(wallet:Wallet{self.scope(context)})
             WITH wallet, count(distinct(bounty)) AS bounties, benchmark
             WITH wallet, bounties, benchmark 
             WITH wallet, (tofloat(bounties) / benchmark) AS againstBenchmark
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            MATCH (wallet)
-            WITH wic, wallet, againstBenchmark
-            MATCH (wallet)
-            MATCH (wic)
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            SET con._againstBenchmark = againstBenchmark
-            RETURN count(distinct(wallet))
+            WITH wallet, againstBenchmark
+            RETURN DISTINCT wallet.address AS address, {{_againstBenchmark: againstBenchmark}} AS properties
         """
-        count = self.query(connect_query)[0].value()
+        count = self.query_context(context, connect_query)
         return count 
 
     @count_query_logging
@@ -163,31 +129,21 @@ class EcoDevCyphers(WICCypher):
     @count_query_logging
     def connect_incubators_members(self, root_context, context):
         connect_affiliates_voted = f"""
-            MATCH (wallet:Wallet)-[:VOTED]-(p:Proposal)-[:HAS_PROPOSAL]-(e)-[:_PARADIGM_CASE]-(:_Context:_{root_context})
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH wallet, wic
-            MATCH (wallet)
-            MATCH (wic)
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            RETURN count(distinct(wallet))
+            MATCH (wallet:Wallet{self.scope(context)})-[:VOTED]-(p:Proposal)-[:HAS_PROPOSAL]-(e)-[:_PARADIGM_CASE]-(:_Context:_{root_context})
+            WITH wallet
+            RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(connect_affiliates_voted)[0].value
+        count = self.query_context(context, connect_affiliates_voted)
         return count
 
     @count_query_logging
     def connect_incubators_participant(self, root_context, context):
         connect_participants_voted = f"""
-            MATCH (wallet:Wallet)-[:VOTED]-(:Proposal)-[]-(incubated:Entity)<-[:INCUBATED]-(incubator:Entity)
-            MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-            WITH wallet, wic
-            MATCH (wallet)
-            MATCH (wic)
-            MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-            SET con.toRemove = null
-            RETURN count(distinct(wallet))
+            MATCH (wallet:Wallet{self.scope(context)})-[:VOTED]-(:Proposal)-[]-(incubated:Entity)<-[:INCUBATED]-(incubator:Entity)
+            WITH wallet
+            RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(connect_participants_voted)[0].value()
+        count = self.query_context(context, connect_participants_voted)
         return count 
 
         
@@ -13,13 +13,10 @@ class TradersCyphers(WICCypher):
             query = f"""
                 LOAD CSV WITH HEADERS FROM '{url}' AS sudo
                 MATCH (wallet:Wallet {{address: sudo.seller}}) 
-                MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-                WITH wallet, wic
-                MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-                SET con.toRemove = null
-                RETURN count(wallet)
+                WITH wallet
+                RETURN DISTINCT wallet.address AS address
             """
-            count += self.query(query)[0].value()
+            count += self.query_context(context, query)
 
         return count 
 
@@ -30,13 +27,10 @@ class TradersCyphers(WICCypher):
             query = f"""
                 LOAD CSV WITH HEADERS FROM '{url}' AS blur
                 MATCH (wallet:Wallet {{address: blur.address}}) 
-                MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-                WITH wallet, wic
-                MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-                SET con.toRemove = null
-                RETURN count(wallet)
+                WITH wallet
+                RETURN DISTINCT wallet.address AS address
             """
-            count += self.query(query)[0].value()
+            count += self.query_context(context, query)
 
         return count 
 
@@ -47,156 +41,131 @@ class TradersCyphers(WICCypher):
             connect_wallets = f"""
                 LOAD CSV WITH HEADERS FROM '{url}' AS borrower
                 MATCH (wallet:Wallet {{address: borrower.address}})
-                MATCH (wic:_Wic:_{self.subgraph_name}:_Context:_{context})
-                WITH wallet, wic
-                MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-                SET con.toRemove = null
-                RETURN count(wallet) 
+                WITH wallet
+                RETURN DISTINCT wallet.address AS address
             """
-            count += self.query(connect_wallets)[0].value()
+            count += self.query_context(context, connect_wallets)
         
         return count 
 
     @count_query_logging
     def connect_x2y2_borrowers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:BORROWER]->(m:Marketplace {{name:"x2y2"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:BORROWER]->(m:Marketplace {{name:"x2y2"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
         
         return count
 
     @count_query_logging
     def connect_arcade_borrowers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:BORROWER]->(m:Marketplace {{name:"arcade.xyz"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:BORROWER]->(m:Marketplace {{name:"arcade.xyz"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_paraspace_borrowers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:BORROWER]->(m:Marketplace {{name:"paraspace"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:BORROWER]->(m:Marketplace {{name:"paraspace"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_nftfi_borrowers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:BORROWER]->(m:Marketplace {{name:"nftfi"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:BORROWER]->(m:Marketplace {{name:"nftfi"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_bend_borrowers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:BORROWER]->(m:Marketplace {{name:"bend"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:BORROWER]->(m:Marketplace {{name:"bend"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_paraspace_lenders(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:LENDER]->(m:Marketplace {{name:"paraspace"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:LENDER]->(m:Marketplace {{name:"paraspace"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_x2y2_lenders(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:LENDER]->(m:Marketplace {{name:"x2y2"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:LENDER]->(m:Marketplace {{name:"x2y2"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_bend_lenders(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:LENDER]->(m:Marketplace {{name:"bend"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:LENDER]->(m:Marketplace {{name:"bend"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_arcade_lenders(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:LENDER]->(m:Marketplace {{name:"arcade.xyz"}})
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:LENDER]->(m:Marketplace {{name:"arcade.xyz"}})
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_nftfi_lenders(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:LENT]->(m:Loan)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:LENT]->(m:Loan)
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
     @count_query_logging
     def connect_nftfi_borrowers(self, context):
         query = f"""
-        MATCH (wallet:Wallet)-[r:BORROWED]->(m:Loan)
-        MATCH (wic:_Wic:_Context:_{self.subgraph_name}:_{context})
-        WITH wallet, wic
-        MERGE (wallet)-[con:_HAS_CONTEXT]->(wic)
-        RETURN COUNT(*)
+        MATCH (wallet:Wallet{self.scope(context)})-[r:BORROWED]->(m:Loan)
+        WITH wallet
+        RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
+        count = self.query_context(context, query)
 
         return count
 
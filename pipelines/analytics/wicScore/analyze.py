@@ -1,9 +1,8 @@
-import networkx as nx
 import logging
+import os
 import numpy as np
-from scipy import stats
 from tqdm import tqdm
-from ..helpers import Analysis, Networks
+from ..helpers import Analysis
 from .cyphers import WICScoreAnalyticsCyphers
 
 
@@ -12,43 +11,58 @@ class WICScoreAnalysis(Analysis):
     def __init__(self):
         self.cyphers = WICScoreAnalyticsCyphers()
         super().__init__()
+        self.page_size = 50000
+        self.batch_size = 10000
+        self.epsilon = float(os.environ.get("WIC_SCORE_EPSILON", 0.01))
 
-    def compute_score(self, data):
-        weighted_degrees = [r["score"] for r in data]
-        scores = []
-        min = np.min(weighted_degrees)
-        max = np.max(weighted_degrees)
-        for deg in weighted_degrees:
-            if deg < 0:
-                scores.append(deg/min)
-            elif deg > 0:
-                scores.append(deg/max)
-            else:
-                scores.append(deg)
-        scores = [score * 100 for score in scores] 
-        return scores
+    def get_scores_data(self):
+        """Reads the summed context weights of the wallets by pages of addresses.
+        return addresses, weights, previous_scores (nan for wallets without a score)"""
+        addresses, weights, previous_scores = [], [], []
+        after = ""
+        progress = tqdm(desc="Reading the WIC weights")
+        while True:
+            records = self.cyphers.get_WIC_scores(after, self.page_size)
+            if not records:
+                break
+            addresses.extend([record["address"] for record in records])
+            weights.extend([record["score"] or 0 for record in records])
+            previous_scores.extend([record["previousScore"] for record in records])
+            after = records[-1]["address"]
+            progress.update(len(records))
+        progress.close()
+        return (np.array(addresses, dtype=object), np.array(weights, dtype=np.float64),
+            np.array(previous_scores, dtype=np.float64))
 
-    def calculate_score(self, data):
-        logging.info(f"Calculating score for {len(data)} wallets")
-        scores = self.compute_score(data)
-        results = {}
-        for i in range(len(data)):
-            results[data[i]["address"]] = scores[i]
-        return results
+    def compute_score(self, weighted_degrees):
+        """Rescales the weighted degrees between -100 and 100: negative degrees are divided by the minimum
+        and positive degrees by the maximum."""
+        scores = np.zeros(len(weighted_degrees), dtype=np.float64)
+        negative = weighted_degrees < 0
+        positive = weighted_degrees > 0
+        if negative.any():
+            scores[negative] = weighted_degrees[negative] / weighted_degrees.min()
+        if positive.any():
+            scores[positive] = weighted_degrees[positive] / weighted_degrees.max()
+        return scores * 100
+
+    def save_scores(self, addresses, scores, previous_scores):
+        "Writes, in concurrent batches, the scores of the wallets whose score changed by at least epsilon"
+        changed = np.isnan(previous_scores) | (np.abs(scores - previous_scores) >= self.epsilon)
+        logging.info(f"Saving the scores of {changed.sum()} wallets, {(~changed).sum()} changed by less than {self.epsilon}")
+        results = [
+            {"address": address, "reputationScore": score}
+            for address, score in zip(addresses[changed], scores[changed].tolist())
+        ]
+        batches = [results[i:i + self.batch_size] for i in range(0, len(results), self.batch_size)]
+        self.parallel_process(self.cyphers.save_reputation_score, batches, description="Saving the scores ...")
 
     def run(self):
-        logging.info(f"Calculating positive scores")
-        data = self.cyphers.get_WIC_scores()
-        scores = self.calculate_score(data)
-        logging.info(f"Saving the results ...")
-        results = []
-        for wallet in scores.keys():
-            results.append({
-                "address": wallet,
-                "reputationScore": scores.get(wallet, None),
-            })
-        self.cyphers.save_reputation_score(results)
+        addresses, weights, previous_scores = self.get_scores_data()
+        logging.info(f"Calculating score for {len(addresses)} wallets")
+        scores = self.compute_score(weights)
+        self.save_scores(addresses, scores, previous_scores)
    
 if __name__ == '__main__':
     analytics = WICScoreAnalysis()
-    analytics.run()
\ No newline at end of file
+    analytics.run()
@@ -1,4 +1,3 @@
-from tqdm import tqdm
 from ...helpers import Cypher
 from ...helpers import get_query_logging, count_query_logging
 from ...helpers import Queries
@@ -15,17 +14,23 @@ class WICScoreAnalyticsCyphers(Cypher):
         pass
 
     @get_query_logging
-    def get_WIC_scores(self):
+    def get_WIC_scores(self, after="", limit=50000):
+        "Returns the summed context weights of the next limit wallets with a WIC edge after the address after, ordered by address"
         query = f"""
-            MATCH (w:Wallet)-[:_HAS_CONTEXT]-(wic:_Wic)
-            RETURN distinct(w.address) as address, apoc.coll.sum(collect(wic._weight)) as score
+            MATCH (w:Wallet)
+            WHERE w.address > $after AND (w)-[:_HAS_CONTEXT]-(:_Wic)
+            WITH w
+            ORDER BY w.address
+            LIMIT $limit
+            MATCH (w)-[:_HAS_CONTEXT]-(wic:_Wic)
+            RETURN w.address as address, apoc.coll.sum(collect(wic._weight)) as score, w.reputationScore as previousScore
+            ORDER BY address
         """
-        result = self.query(query)
+        result = self.query(query, parameters={"after": after, "limit": limit})
         return result
 
     @count_query_logging
     def save_reputation_score(self, data):
-        count = 0
         query = """
             UNWIND $data as data
             MATCH (wallet:Wallet {address: data.address})
@@ -33,6 +38,5 @@ class WICScoreAnalyticsCyphers(Cypher):
             SET wallet.lastScoreComputeDt = datetime()
             RETURN count(wallet)
         """
-        for batch in tqdm(range(0, len(data), 10000), desc="Saving the scores ..."):
-            count += self.query(query, {"data": data[batch:batch+10000]})[0].value()
+        count = self.query(query, {"data": data})[0].value()
         return count
@@ -2,6 +2,7 @@ import logging
 import time
 import os
 from . import Requests
+from .blockRanges import BlockRangeLogFetcher
 from tqdm import tqdm
 
 DEBUG = os.environ.get("DEBUG", False)
@@ -136,6 +137,7 @@ class Alchemy(Requests):
                           erc721: bool = True,
                           erc1155: bool = True,
                           specialnft: bool = True,
+                          withMetadata: bool = False,
                           order: str|None = "asc",
                           chain: str|None = "ethereum",
                           pageKey: str|None = None,
@@ -157,7 +159,9 @@ class Alchemy(Requests):
                 - erc721: (boolean) Wether or not to include erc721 
                 - erc1155: (boolean) Wether or not to include erc1155 
                 - specialnft: (boolean) Wether or not to include specialnft 
+                - withMetadata: (boolean) Wether or not to include the block timestamp of each transfer
                 - chain: (ethereum|arbitrum|polygon|optimism) which chain to get this data from
+            Returns None if a page could not be read, partial results are never returned.
         """
         results = []
         time.sleep(counter)
@@ -168,6 +172,7 @@ class Alchemy(Requests):
             "order": order,
             "excludeZeroValue": excludeZeroValue
         }
+        if withMetadata: params["withMetadata"] = withMetadata
         if tokens: params["contractAddresses"] = tokens
         if fromBlock: params["fromBlock"] = fromBlock
         if toBlock: params["toBlock"] = toBlock
@@ -201,11 +206,12 @@ class Alchemy(Requests):
             results.extend(result)
             pageKey = content["result"].get("pageKey", None)
             if pageKeyIterate and pageKey:
-                newResults = self.getAssetTransfers(tokens, fromBlock=fromBlock, toBlock=toBlock, fromAddress=fromAddress, toAddress=toAddress, maxCount=maxCount, excludeZeroValue=excludeZeroValue, external=external, internal=internal, erc20=erc20, erc721=erc721, erc1155=erc1155, specialnft=specialnft, pageKey=pageKey, pageKeyIterate=pageKeyIterate, order=order, chain=chain)
-                if newResults:
-                    results.extend(newResults)
+                newResults = self.getAssetTransfers(tokens, fromBlock=fromBlock, toBlock=toBlock, fromAddress=fromAddress, toAddress=toAddress, maxCount=maxCount, excludeZeroValue=excludeZeroValue, external=external, internal=internal, erc20=erc20, erc721=erc721, erc1155=erc1155, specialnft=specialnft, withMetadata=withMetadata, pageKey=pageKey, pageKeyIterate=pageKeyIterate, order=order, chain=chain)
+                if newResults is None:
+                    return None
+                results.extend(newResults)
         else:
-            return self.getAssetTransfers(tokens, fromBlock=fromBlock, toBlock=toBlock, fromAddress=fromAddress, toAddress=toAddress, maxCount=maxCount, excludeZeroValue=excludeZeroValue, external=external, internal=internal, erc20=erc20, erc721=erc721, erc1155=erc1155, specialnft=specialnft, pageKey=pageKey, pageKeyIterate=pageKeyIterate, order=order, chain=chain, counter=counter+1)
+            return self.getAssetTransfers(tokens, fromBlock=fromBlock, toBlock=toBlock, fromAddress=fromAddress, toAddress=toAddress, maxCount=maxCount, excludeZeroValue=excludeZeroValue, external=external, internal=internal, erc20=erc20, erc721=erc721, erc1155=erc1155, specialnft=specialnft, withMetadata=withMetadata, pageKey=pageKey, pageKeyIterate=pageKeyIterate, order=order, chain=chain, counter=counter+1)
         return results
     
     def getTokenBalances(self, 
@@ -351,6 +357,83 @@ class Alchemy(Requests):
         else:
             return self.getLogs(contractAddress, fromBlock=fromBlock, toBlock=toBlock, topics=topics, blockHash=blockHash, chain=chain, counter=counter+1)
 
+    def getLogsWindow(self, 
+                      contractAddress: str, 
+                      fromBlock: int, 
+                      toBlock: int, 
+                      topics: list[str]|None = None, 
+                      chain: str = "ethereum", 
+                      counter: int = 0) -> list[dict] | None:
+        """
+            Helper function to get the log data for a contract in a single block window.
+            Returns None if the window is over the provider limits (too many results or too wide a range) so that it can be split.
+            Parameters are:
+                - contractAddress: (address) The address of the contract
+                - fromBlock: (int) start block
+                - toBlock: (int) end block
+                - topics: [(topicHash)] An array of topic hashes
+                - chain: (ethereum|arbitrum|polygon|optimism) which chain to get this data from
+        """
+        time.sleep(counter)
+        if counter > self.max_retries:
+            return None
+
+        params = {
+            "address": contractAddress,
+            "fromBlock": hex(fromBlock),
+            "toBlock": hex(toBlock)
+        }
+        if topics: params["topics"] = topics
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "eth_getLogs",
+            "params": [params]
+        }
+
+        if DEBUG: logging.debug(f"Calling url: {self.alchemy_api_url[chain]} with payload: {payload}")
+        response_data = self.post_request(self.alchemy_api_url[chain], json=payload, headers=self.headers, return_json=True)
+        if response_data and type(response_data) == dict and "result" in response_data:
+            return response_data["result"]
+        if response_data and type(response_data) == dict and "error" in response_data:
+            logging.info(f"Block window {fromBlock}-{toBlock} rejected: {response_data['error'].get('message', '')}")
+            return None
+        return self.getLogsWindow(contractAddress, fromBlock, toBlock, topics=topics, chain=chain, counter=counter+1)
+
+    def getLogsByRange(self, 
+                       contractAddress: str, 
+                       fromBlock: int, 
+                       toBlock: int, 
+                       topics: list[str]|None = None, 
+                       window: int = 2000, 
+                       max_workers: int = 4, 
+                       calls_per_second: float = 20, 
+                       checkpoint = None, 
+                       chain: str = "ethereum") -> list[dict]:
+        """
+            Helper function to get all the log data for a contract over a block range.
+            The range is split in windows fetched concurrently, and any window rejected for returning too many results is bisected.
+            Logs are returned ordered by (blockNumber, logIndex).
+            Parameters are:
+                - contractAddress: (address) The address of the contract
+                - fromBlock: (int) start block
+                - toBlock: (int) end block
+                - topics: [(topicHash)] An array of topic hashes
+                - window: (int) The initial number of blocks per query
+                - max_workers: (int) The number of concurrent queries
+                - calls_per_second: (float) The rate budget shared by all the queries
+                - checkpoint: (function) Called with the highest block fully fetched so far
+                - chain: (ethereum|arbitrum|polygon|optimism) which chain to get this data from
+        """
+        fetcher = BlockRangeLogFetcher(
+            lambda start, end: self.getLogsWindow(contractAddress, start, end, topics=topics, chain=chain),
+            result_cap=10000,
+            max_workers=max_workers,
+            calls_per_second=calls_per_second
+        )
+        return fetcher.fetch(fromBlock, toBlock, window=window, checkpoint=checkpoint)
+
     def create_webhook(self, network, webhook_type, webhook_url, addresses=[], nft_filters=None, graphql__query=None, app_id=None, nft_metadata_filters=None, counter=0):
         """
             Create webhook endpoint for Alchemy. 
@@ -394,32 +477,32 @@ class Alchemy(Requests):
         if response and type(response) == dict:
             return response["data"]
         else:
-            self.create_webhook(network, webhook_type, webhook_url, addresses=addresses, nft_filters=nft_filters, graphql__query=graphql__query, app_id=app_id, nft_metadata_filters=nft_metadata_filters, counter=counter+1)
+            return self.create_webhook(network, webhook_type, webhook_url, addresses=addresses, nft_filters=nft_filters, graphql__query=graphql__query, app_id=app_id, nft_metadata_filters=nft_metadata_filters, counter=counter+1)
 
-    def update_webhook_address(self, webhook_id, addresses=[], removal=False, counter=0):
+    def update_webhook_address(self, webhook_id, addresses=[], removal=False, chunk_size=500, counter=0):
         """
-            Update address for webhook address endpoint. 
+            Update address for webhook address endpoint. The addresses are sent by chunks of chunk_size.
             Required: 
                 - webhook_id: ID of the address activity webhook
-                - addresses_to_add: List of addresses to add, use [] if none.
-                - addresses_to_remove: List of addresses to remove, use [] if none.
+                - addresses: List of addresses to add or remove
+                - removal: If True the addresses are removed from the webhook, otherwise they are added
+            Returns the addresses that were sent, the chunks that still failed after the retries are left out.
             Refere to: https://docs.alchemy.com/reference/update-webhook-addresses for more info
         """
 
         time.sleep(counter)
         if counter > self.max_retries:
-            return None
-        response = {}
-        for i in tqdm(range(0, len(addresses), 500)):
+            return []
+        for i in tqdm(range(0, len(addresses), chunk_size)):
             url = "https://dashboard.alchemy.com/api/update-webhook-addresses"
             payload = {
                 "webhook_id": webhook_id
             }
 
             if removal:
-                payload["addresses_to_remove"] = addresses
+                payload["addresses_to_remove"] = addresses[i:i + chunk_size]
             else:
-                payload["addresses_to_add"] = addresses
+                payload["addresses_to_add"] = addresses[i:i + chunk_size]
 
             headers = {
                 "accept": "application/json",
@@ -428,11 +511,10 @@ class Alchemy(Requests):
             }
 
             response = self.patch_request(url, json=payload, headers=headers, return_json=True)
-            if response and type(response) == dict:
-                pass
-            else:
-                self.update_webhook_address(webhook_id, addresses=addresses, removal=removal, counter=counter+1)
-        return response
+            if type(response) != dict:
+                # Only the chunks that were not sent yet are retried
+                return addresses[:i] + self.update_webhook_address(webhook_id, addresses=addresses[i:], removal=removal, chunk_size=chunk_size, counter=counter+1)
+        return addresses
 
 
     def update_webhook_tokens(self, webhook_id, addresses_to_add=[], addresses_to_remove=[], counter=0):
@@ -6,9 +6,15 @@ from .requests import Requests
 from .queries import Queries
 from .multiprocessing import Multiprocessing
 from .utils import Utils
+from .blockRanges import BlockRangeLogFetcher
+from .eventDecoder import EventLogDecoder
 from .etherscan import Etherscan
 from .Alchemy import Alchemy
+from .blockTimestamps import BlockTimestampIndex
+from .cursorStore import AddressCursorStore
+from .balanceLedger import TokenBalanceLedger
 from .web3Utils import Web3Utils
 from .base import Base
 from .twitter import Twitter
-from .decorators import *
\ No newline at end of file
+from .decorators import *
+from .deployerCache import DeployerCache
\ No newline at end of file
@@ -0,0 +1,175 @@
+import io
+import logging
+import threading
+from datetime import datetime
+import numpy as np
+
+
+class TokenBalanceLedger:
+    """
+    Persistent (wallet, token) -> raw balance table, saved in an S3 bucket.
+    Keys are kept as a sorted array of 40 bytes values (wallet address + token address) and balances
+    as 32 bytes big endian integers, so a lookup is a binary search.
+    Balances are moved with signed transfer deltas (apply_deltas) or set from an authoritative source (set_balance).
+    Updates are kept in memory and written to the bucket as small delta files (save_delta),
+    which are merged back into the base file by compact.
+    Files are saved under the prefix: {prefix}/base.npz and {prefix}/delta_*.npz
+    """
+    def __init__(self, s3, prefix: str) -> None:
+        self.s3 = s3
+        self.prefix = prefix
+        self.keys = np.array([], dtype="S40")
+        self.balances = np.zeros((0, 32), dtype=np.uint8)
+        self.pending = {}
+        self.changed = set()
+        self.delta_counter = 0
+        self.delta_files = []
+        self.lock = threading.Lock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self.pending)
+
+    @staticmethod
+    def encode(wallet: str, token: str) -> bytes | None:
+        "Numpy strips trailing null bytes from S40 values, so they are stripped here too to keep comparisons consistent"
+        try:
+            wallet = bytes.fromhex(wallet.lower().replace("0x", "", 1))
+            token = bytes.fromhex(token.lower().replace("0x", "", 1))
+        except (ValueError, AttributeError):
+            return None
+        if len(wallet) != 20 or len(token) != 20:
+            return None
+        return (wallet + token).rstrip(b"\x00")
+
+    @staticmethod
+    def decode(key: bytes) -> tuple[str, str]:
+        key = key.ljust(40, b"\x00")
+        return "0x" + key[:20].hex(), "0x" + key[20:].hex()
+
+    @staticmethod
+    def to_bytes(balances: list[int]) -> np.ndarray:
+        data = b"".join(balance.to_bytes(32, "big") for balance in balances)
+        return np.frombuffer(data, dtype=np.uint8).reshape(-1, 32)
+
+    @staticmethod
+    def to_int(balance: np.ndarray) -> int:
+        return int.from_bytes(balance.tobytes(), "big")
+
+    def read_npz(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        result = self.s3.s3_client.get_object(Bucket=self.s3.bucket_name, Key=key)
+        content = np.load(io.BytesIO(result["Body"].read()))
+        return content["keys"], content["balances"]
+
+    def write_npz(self, key: str, keys: np.ndarray, balances: np.ndarray) -> None:
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, keys=keys, balances=balances)
+        self.s3.s3_client.put_object(Bucket=self.s3.bucket_name, Key=key, Body=buffer.getvalue())
+
+    def merge(self, parts: list[tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Merges (keys, balances) arrays, the later parts win on duplicated keys. Returns sorted arrays.
+        A balance of 2**256 - 1 is used as a tombstone for removed keys and dropped from the result.
+        """
+        if not parts:
+            return np.array([], dtype="S40"), np.zeros((0, 32), dtype=np.uint8)
+        keys = np.concatenate([part[0] for part in parts])[::-1]
+        balances = np.concatenate([part[1] for part in parts])[::-1]
+        keys, index = np.unique(keys, return_index=True)
+        balances = balances[index]
+        alive = ~(balances == 255).all(axis=1)
+        return keys[alive], balances[alive]
+
+    def load(self) -> None:
+        "Loads the base file and all the delta files from the bucket"
+        files = [obj.key for obj in self.s3.bucket.objects.filter(Prefix=f"{self.prefix}/")]
+        parts = []
+        if f"{self.prefix}/base.npz" in files:
+            parts.append(self.read_npz(f"{self.prefix}/base.npz"))
+        self.delta_files = sorted(key for key in files if key.startswith(f"{self.prefix}/delta_"))
+        for key in self.delta_files:
+            parts.append(self.read_npz(key))
+        self.keys, self.balances = self.merge(parts)
+        logging.info(f"Loaded {len(self.keys)} balances from {len(self.delta_files)} delta files")
+
+    def lookup(self, key: bytes) -> int | None:
+        if key in self.pending:
+            return self.pending[key]
+        position = np.searchsorted(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.to_int(self.balances[position])
+        return None
+
+    def get(self, wallet: str, token: str) -> int | None:
+        "Returns the balance of the wallet for the token, or None if the pair is unknown"
+        key = self.encode(wallet, token)
+        if key is None:
+            return None
+        return self.lookup(key)
+
+    def apply_deltas(self, deltas: dict[tuple[str, str], int]) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        """
+        Adds signed deltas to the known balances.
+        Returns the pairs that are not in the ledger yet (their starting balance is unknown, they are left untouched)
+        and the pairs that would go negative, which means the ledger drifted from the chain (they are removed).
+        parameters:
+            - deltas: Dictionary of (wallet, token) -> signed raw amount
+        """
+        unknown, drifted = [], []
+        with self.lock:
+            for (wallet, token), delta in deltas.items():
+                key = self.encode(wallet, token)
+                if key is None:
+                    continue
+                balance = self.lookup(key)
+                if balance is None:
+                    unknown.append((wallet, token))
+                elif balance + delta < 0 or balance + delta >= 2**256 - 1:
+                    drifted.append((wallet, token))
+                    self.pending[key] = None
+                    self.changed.discard(key)
+                elif delta != 0:
+                    self.pending[key] = balance + delta
+                    self.changed.add(key)
+        return unknown, drifted
+
+    def set_balance(self, wallet: str, token: str, balance: int) -> None:
+        "Sets an authoritative balance, the pair is marked as changed if it differs from the ledger"
+        key = self.encode(wallet, token)
+        if key is None or balance < 0 or balance >= 2**256 - 1:
+            return
+        with self.lock:
+            if self.lookup(key) != balance:
+                self.pending[key] = balance
+                self.changed.add(key)
+
+    def pop_changes(self) -> list[tuple[str, str, int]]:
+        "Returns the (wallet, token, balance) rows changed since the last call"
+        with self.lock:
+            changed, self.changed = self.changed, set()
+            rows = [(*self.decode(key), self.lookup(key)) for key in changed]
+        return [row for row in rows if row[2] is not None]
+
+    def save_delta(self) -> None:
+        "Writes the pending updates to the bucket as a delta file and merges them in memory"
+        with self.lock:
+            if not self.pending:
+                return
+            keys = np.array(list(self.pending.keys()), dtype="S40")
+            balances = self.to_bytes([2**256 - 1 if balance is None else balance for balance in self.pending.values()])
+            self.pending = {}
+        key = f"{self.prefix}/delta_{datetime.now().strftime('%Y%m%d%H%M%S')}_{self.delta_counter:06d}.npz"
+        self.delta_counter += 1
+        self.write_npz(key, keys, balances)
+        self.delta_files.append(key)
+        self.keys, self.balances = self.merge([(self.keys, self.balances), (keys, balances)])
+        logging.info(f"Saved {len(keys)} balances to {key}")
+
+    def compact(self) -> None:
+        "Writes the full ledger as the base file and removes the delta files"
+        self.save_delta()
+        self.write_npz(f"{self.prefix}/base.npz", self.keys, self.balances)
+        for key in self.delta_files:
+            self.s3.s3_client.delete_object(Bucket=self.s3.bucket_name, Key=key)
+        logging.info(f"Compacted {len(self.keys)} balances and {len(self.delta_files)} delta files")
+        self.delta_files = []
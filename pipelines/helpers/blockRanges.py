@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable
+
+
+class BlockRangeLogFetcher:
+    """
+    Fetches event logs over a block range by splitting it into windows.
+    - Windows are fetched concurrently, with a shared rate limit across all threads.
+    - A window that hits the provider's result cap (or errors) is bisected and each half is fetched again.
+    - Results are merged and ordered by (blockNumber, logIndex).
+    - The checkpoint callback receives the highest block for which every window up to it has completed.
+    The fetch_window function must take (fromBlock, toBlock) and return a list of logs, or None if the call failed.
+    """
+    def __init__(self,
+                 fetch_window: Callable[[int, int], list[dict] | None],
+                 result_cap: int,
+                 max_workers: int = 4,
+                 calls_per_second: float = 5) -> None:
+        self.fetch_window = fetch_window
+        self.result_cap = result_cap
+        self.max_workers = max_workers
+        self.min_interval = 1 / calls_per_second if calls_per_second else 0
+        self.lock = threading.Lock()
+        self.last_call = 0
+
+    @staticmethod
+    def hex_or_int(value: str | int | None) -> int:
+        "Block numbers and log indexes come back as hex strings, sometimes as the empty '0x'."
+        if type(value) == int:
+            return value
+        if not value or value == "0x":
+            return 0
+        return int(value, 16)
+
+    def log_sort_key(self, log: dict) -> tuple[int, int]:
+        return (self.hex_or_int(log.get("blockNumber")), self.hex_or_int(log.get("logIndex")))
+
+    def throttle(self) -> None:
+        "Blocks the calling thread until the next call fits in the rate budget."
+        with self.lock:
+            wait_time = self.last_call + self.min_interval - time.time()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            self.last_call = time.time()
+
+    def fetch_range(self, fromBlock: int, toBlock: int) -> list[dict] | None:
+        "Fetches a single window, bisecting it until every sub window is below the result cap."
+        self.throttle()
+        logs = self.fetch_window(fromBlock, toBlock)
+        if logs is not None and len(logs) < self.result_cap:
+            return logs
+        if fromBlock >= toBlock:
+            if logs is None:
+                logging.error(f"Could not get the logs for block {fromBlock}")
+            else:
+                logging.error(f"Block {fromBlock} has more logs than the result cap ({self.result_cap}), results are truncated")
+            return logs
+        middle = (fromBlock + toBlock) // 2
+        logging.info(f"Splitting block range {fromBlock}-{toBlock} at {middle}")
+        left = self.fetch_range(fromBlock, middle)
+        if left is None:
+            return None
+        right = self.fetch_range(middle + 1, toBlock)
+        if right is None:
+            return None
+        return left + right
+
+    def fetch(self,
+              fromBlock: int,
+              toBlock: int,
+              window: int = 2000,
+              checkpoint: Callable[[int], None] | None = None) -> list[dict]:
+        """
+        Fetches all logs between fromBlock and toBlock (both included).
+        Windows that fail are logged and the checkpoint stops advancing before them.
+        parameters:
+            - fromBlock: (int) The starting block
+            - toBlock: (int) The end block
+            - window: (int) The initial size of the block windows
+            - checkpoint: (function) Called with the highest block fully completed so far
+        """
+        windows = [(start, min(start + window - 1, toBlock)) for start in range(fromBlock, toBlock + 1, window)]
+        results = {}
+        failed = set()
+        next_window = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for index, (start, end) in enumerate(windows):
+                pending[executor.submit(self.fetch_range, start, end)] = index
+                if len(pending) < self.max_workers * 2 and index < len(windows) - 1:
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window_index = pending.pop(future)
+                    logs = future.result()
+                    if logs is None:
+                        failed.add(window_index)
+                    else:
+                        results[window_index] = logs
+                completed = next_window
+                while next_window in results:
+                    next_window += 1
+                if checkpoint and next_window > completed:
+                    checkpoint(windows[next_window - 1][1])
+            for future in pending:
+                logs = future.result()
+                if logs is None:
+                    failed.add(pending[future])
+                else:
+                    results[pending[future]] = logs
+        while next_window in results:
+            next_window += 1
+        if checkpoint and next_window > 0:
+            checkpoint(windows[next_window - 1][1])
+        if failed:
+            logging.error(f"{len(failed)} block windows could not be fetched, the first one starts at block {windows[min(failed)][0]}")
+        logs = [log for index in sorted(results) for log in results[index]]
+        logs.sort(key=self.log_sort_key)
+        return logs
@@ -0,0 +1,133 @@
+import bisect
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .Alchemy import Alchemy
+
+
+class BlockTimestampIndex:
+    """
+    Local block number -> timestamp index for one chain, persisted in a sqlite file.
+    Every exact lookup is kept in the index. On chains with a fixed slot time, the timestamp of a block
+    between two known blocks is interpolated when the known blocks prove that no slot was missed in between:
+    if every block takes at least slot_time seconds and the two ends are exactly (hi - lo) * slot_time apart,
+    then every block in between is exactly slot_time apart. Otherwise the block is fetched from Alchemy.
+    """
+    # chain: (first block of the fixed slot time regime, slot time in seconds)
+    fixed_slot_times = {
+        "ethereum": (15537394, 12),
+        "optimism": (105235063, 2),
+    }
+
+    def __init__(self, chain: str = "ethereum", path: str | None = None, alchemy: Alchemy | None = None, max_workers: int = 8) -> None:
+        self.chain = chain
+        self.path = path or os.path.join(tempfile.gettempdir(), f"block_timestamps_{chain}.db")
+        self.alchemy = alchemy or Alchemy()
+        self.max_workers = max_workers
+        self.slot_time = self.fixed_slot_times.get(chain, None)
+        self.timestamps = {}
+        self.blocks = []
+        self.unsaved = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        "Loads the index from the local sqlite file"
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, timestamp INTEGER NOT NULL)")
+        self.timestamps = dict(connection.execute("SELECT number, timestamp FROM blocks"))
+        connection.close()
+        self.blocks = sorted(self.timestamps)
+        logging.info(f"Loaded {len(self.blocks)} block timestamps for {self.chain}")
+
+    def save(self) -> None:
+        "Writes the blocks added since the last save to the local sqlite file"
+        with self.lock:
+            rows = list(self.unsaved.items())
+            self.unsaved = {}
+        if not rows:
+            return
+        connection = sqlite3.connect(self.path)
+        connection.executemany("INSERT OR REPLACE INTO blocks (number, timestamp) VALUES (?, ?)", rows)
+        connection.commit()
+        connection.close()
+        logging.info(f"Saved {len(rows)} new block timestamps for {self.chain}")
+
+    def add(self, block: int, timestamp: int) -> None:
+        with self.lock:
+            if block in self.timestamps:
+                return
+            self.timestamps[block] = timestamp
+            self.unsaved[block] = timestamp
+            bisect.insort(self.blocks, block)
+
+    def interpolate(self, block: int) -> int | None:
+        "Returns the exact timestamp of the block if it can be derived from its known neighbours, None otherwise"
+        if not self.slot_time or block < self.slot_time[0]:
+            return None
+        slot_time = self.slot_time[1]
+        with self.lock:
+            position = bisect.bisect_left(self.blocks, block)
+            if position == 0 or position == len(self.blocks):
+                return None
+            low, high = self.blocks[position - 1], self.blocks[position]
+            low_timestamp, high_timestamp = self.timestamps[low], self.timestamps[high]
+        if low < self.slot_time[0]:
+            return None
+        if high_timestamp - low_timestamp != (high - low) * slot_time:
+            return None
+        return low_timestamp + (block - low) * slot_time
+
+    def fetch(self, block: int) -> int | None:
+        "Exact lookup through Alchemy, the result is added to the index"
+        result = self.alchemy.getBlockByNumber(hex(block), chain=self.chain)
+        if not result or "timestamp" not in result:
+            return None
+        timestamp = int(result["timestamp"], 16)
+        self.add(block, timestamp)
+        return timestamp
+
+    def get_timestamp(self, block: int | str) -> int | None:
+        """
+        Returns the timestamp of a block, from the index, by verified interpolation or by an exact lookup.
+        The block can be an int or a hex string.
+        """
+        if type(block) == str:
+            block = int(block, 16)
+        if block in self.timestamps:
+            return self.timestamps[block]
+        timestamp = self.interpolate(block)
+        if timestamp is not None:
+            return timestamp
+        return self.fetch(block)
+
+    def sample(self, step: int, fromBlock: int | None = None, toBlock: int | None = None, max_samples: int = 1000) -> None:
+        """
+        Fetches one block every step blocks between fromBlock and toBlock so that later lookups in that range can be interpolated.
+        By default it samples from the last known block (or max_samples steps back) to the latest block.
+        Chains without a fixed slot time are skipped, their samples can never be used for interpolation.
+        """
+        if not self.slot_time:
+            logging.info(f"No fixed slot time on {self.chain}, skipping sampling")
+            return
+        if toBlock is None:
+            latest = self.alchemy.getBlockByNumber("latest", chain=self.chain)
+            if not latest:
+                logging.error(f"Could not get the latest block for {self.chain}, skipping sampling")
+                return
+            toBlock = int(latest["number"], 16)
+            self.add(toBlock, int(latest["timestamp"], 16))
+        if fromBlock is None:
+            fromBlock = toBlock - step * max_samples
+            if len(self.blocks) > 1:
+                fromBlock = max(fromBlock, self.blocks[-2] - step)
+            fromBlock = max(fromBlock, self.slot_time[0])
+        fromBlock = max(fromBlock, 0)
+        fromBlock = fromBlock - fromBlock % step
+        missing = [block for block in range(fromBlock, toBlock + 1, step) if block not in self.timestamps]
+        logging.info(f"Sampling {len(missing)} blocks on {self.chain}")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self.fetch, missing))
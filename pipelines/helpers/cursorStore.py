@@ -0,0 +1,137 @@
+import io
+import logging
+import threading
+from datetime import datetime
+import numpy as np
+
+
+class AddressCursorStore:
+    """
+    Compact persistent store of address -> block cursors, saved in an S3 bucket.
+    Addresses are kept as a sorted array of 20 bytes values next to an array of uint32 blocks,
+    so a lookup is a binary search and a million wallets take about 24Mb.
+    Updates are kept in memory and written to the bucket as small delta files (save_delta),
+    which are merged back into the base file by compact.
+    Files are saved under the prefix: {prefix}/base.npz and {prefix}/delta_*.npz
+    """
+    def __init__(self, s3, prefix: str) -> None:
+        self.s3 = s3
+        self.prefix = prefix
+        self.addresses = np.array([], dtype="S20")
+        self.blocks = np.array([], dtype=np.uint32)
+        self.pending = {}
+        self.delta_counter = 0
+        self.delta_files = []
+        self.lock = threading.Lock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.addresses) + len(self.pending)
+
+    @staticmethod
+    def encode(address: str) -> bytes | None:
+        "Numpy strips trailing null bytes from S20 values, so they are stripped here too to keep comparisons consistent"
+        try:
+            return bytes.fromhex(address.lower().replace("0x", "", 1)).rstrip(b"\x00")
+        except (ValueError, AttributeError):
+            return None
+
+    def read_npz(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        result = self.s3.s3_client.get_object(Bucket=self.s3.bucket_name, Key=key)
+        content = np.load(io.BytesIO(result["Body"].read()))
+        return content["addresses"], content["blocks"]
+
+    def write_npz(self, key: str, addresses: np.ndarray, blocks: np.ndarray) -> None:
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, addresses=addresses, blocks=blocks)
+        self.s3.s3_client.put_object(Bucket=self.s3.bucket_name, Key=key, Body=buffer.getvalue())
+
+    def merge(self, parts: list[tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+        "Merges (addresses, blocks) arrays, the later parts win on duplicated addresses. Returns sorted arrays."
+        if not parts:
+            return np.array([], dtype="S20"), np.array([], dtype=np.uint32)
+        addresses = np.concatenate([part[0] for part in parts])[::-1]
+        blocks = np.concatenate([part[1] for part in parts])[::-1]
+        addresses, index = np.unique(addresses, return_index=True)
+        return addresses, blocks[index].astype(np.uint32)
+
+    def load(self) -> None:
+        "Loads the base file and all the delta files from the bucket"
+        keys = [obj.key for obj in self.s3.bucket.objects.filter(Prefix=f"{self.prefix}/")]
+        parts = []
+        if f"{self.prefix}/base.npz" in keys:
+            parts.append(self.read_npz(f"{self.prefix}/base.npz"))
+        self.delta_files = sorted(key for key in keys if key.startswith(f"{self.prefix}/delta_"))
+        for key in self.delta_files:
+            parts.append(self.read_npz(key))
+        self.addresses, self.blocks = self.merge(parts)
+        logging.info(f"Loaded {len(self.addresses)} cursors from {len(self.delta_files)} delta files")
+
+    def get(self, address: str, default: int = 0) -> int:
+        "Returns the cursor of an address, or default if the address is unknown"
+        encoded = self.encode(address)
+        if encoded is None:
+            return default
+        if encoded in self.pending:
+            return self.pending[encoded]
+        position = np.searchsorted(self.addresses, encoded)
+        if position < len(self.addresses) and self.addresses[position] == encoded:
+            return int(self.blocks[position])
+        return default
+
+    def get_many(self, addresses: list[str], default: int = 0) -> np.ndarray:
+        "Vectorized get for a list of addresses, returns an int64 array"
+        encoded = [self.encode(address) for address in addresses]
+        keys = np.array([key if key is not None else b"" for key in encoded], dtype="S20")
+        positions = np.searchsorted(self.addresses, keys)
+        positions = np.minimum(positions, max(len(self.addresses) - 1, 0))
+        result = np.full(len(keys), default, dtype=np.int64)
+        if len(self.addresses):
+            found = (self.addresses[positions] == keys) & np.array([key is not None for key in encoded], dtype=bool)
+            result[found] = self.blocks[positions[found]]
+        for index, key in enumerate(encoded):
+            if key in self.pending:
+                result[index] = self.pending[key]
+        return result
+
+    def update(self, addresses: list[str], block: int) -> None:
+        "Sets the cursor of all the addresses to block. The change is only persisted on save_delta."
+        with self.lock:
+            for address in addresses:
+                encoded = self.encode(address)
+                if encoded is not None:
+                    self.pending[encoded] = block
+
+    def save_delta(self) -> None:
+        "Writes the pending updates to the bucket as a delta file and merges them in memory"
+        with self.lock:
+            if not self.pending:
+                return
+            addresses = np.array(list(self.pending.keys()), dtype="S20")
+            blocks = np.array(list(self.pending.values()), dtype=np.uint32)
+            self.pending = {}
+        key = f"{self.prefix}/delta_{datetime.now().strftime('%Y%m%d%H%M%S')}_{self.delta_counter:06d}.npz"
+        self.delta_counter += 1
+        self.write_npz(key, addresses, blocks)
+        self.delta_files.append(key)
+        self.addresses, self.blocks = self.merge([(self.addresses, self.blocks), (addresses, blocks)])
+        logging.info(f"Saved {len(addresses)} cursors to {key}")
+
+    def compact(self) -> None:
+        "Writes the full store as the base file and removes the delta files"
+        self.save_delta()
+        self.write_npz(f"{self.prefix}/base.npz", self.addresses, self.blocks)
+        for key in self.delta_files:
+            self.s3.s3_client.delete_object(Bucket=self.s3.bucket_name, Key=key)
+        logging.info(f"Compacted {len(self.addresses)} cursors and {len(self.delta_files)} delta files")
+        self.delta_files = []
+
+    def migrate(self, cursors: dict[str, int]) -> None:
+        "Imports cursors from the legacy metadata dictionary and writes them as the base file"
+        logging.info(f"Migrating {len(cursors)} cursors from the metadata")
+        encoded = [(self.encode(address), block) for address, block in cursors.items()]
+        encoded = [(address, block) for address, block in encoded if address is not None]
+        addresses = np.array([address for address, _ in encoded], dtype="S20")
+        blocks = np.array([block for _, block in encoded], dtype=np.uint32)
+        self.addresses, self.blocks = self.merge([(addresses, blocks), (self.addresses, self.blocks)])
+        self.compact()
@@ -85,6 +85,56 @@ class Cypher:
             return responses[-1]
         return responses
 
+    def iterate(self, 
+                match_query: str, 
+                write_query: str, 
+                parameters: dict|None = None, 
+                batch_size: int|None = None, 
+                parallel: bool = False, 
+                statistic: str|None = None,
+                raise_on_failure: bool = False) -> int:
+        """
+        Runs a bulk mutation with apoc.periodic.iterate: match_query streams the rows once and write_query is run
+        on every batch of rows in its own transaction, instead of re-running the whole match for every batch.
+        - match_query: The query returning the rows to process, ex: MATCH (wallet:Wallet) WHERE NOT wallet:Account RETURN wallet
+        - write_query: The query run on each batch, it receives the columns of the rows, ex: SET wallet:Account
+        - parameters: (Optional) Parameters available to both queries
+        - batch_size: (Optional) Number of rows per transaction, NEO_BATCH_SIZE (10000) by default
+        - parallel: Runs the batches on NEO_CONCURRENCY threads. Only for writes that can't lock the same nodes
+          from two batches (labels or properties of distinct nodes), relationships writes must stay sequential.
+        - statistic: (Optional) Return this update statistic (ex: relationshipsCreated) instead of the number of committed rows
+        - raise_on_failure: Raises if a batch failed, for callers that must not record progress on a partial write
+        Logs the batches per second and the failed batches.
+        """
+        batch_size = batch_size or int(os.environ.get("NEO_BATCH_SIZE", 10000))
+        query = """
+            CALL apoc.periodic.iterate($matchQuery, $writeQuery, {
+                batchSize: $batchSize, 
+                parallel: $parallel, 
+                concurrency: $concurrency, 
+                params: $params
+            })
+            YIELD batches, total, timeTaken, committedOperations, failedBatches, errorMessages, updateStatistics
+            RETURN batches, total, timeTaken, committedOperations, failedBatches, errorMessages, updateStatistics
+        """
+        result = self.query(query, parameters={
+            "matchQuery": match_query,
+            "writeQuery": write_query,
+            "batchSize": batch_size,
+            "parallel": parallel,
+            "concurrency": int(os.environ.get("NEO_CONCURRENCY", 4)),
+            "params": parameters or {}
+        })[0]
+        rate = result["batches"] / max(result["timeTaken"], 1)
+        logging.info(f"Processed {result['total']} rows in {result['batches']} batches of {batch_size} in {result['timeTaken']}s ({rate:.1f} batches/s)")
+        if result["failedBatches"]:
+            logging.error(f"{result['failedBatches']} batches failed: {result['errorMessages']}")
+            if raise_on_failure:
+                raise Exception(f"{result['failedBatches']} batches failed: {result['errorMessages']}")
+        if statistic:
+            return result["updateStatistics"][statistic]
+        return result["committedOperations"]
+
     def sanitize_text(self, text: str|None) -> str:
         """
         Helper function to sanitize text before injecting it into a Neo4J query. 
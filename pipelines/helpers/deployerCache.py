@@ -0,0 +1,138 @@
+import io
+import logging
+import threading
+from datetime import datetime
+import numpy as np
+
+
+class DeployerCache:
+    """
+    Permanent store of the deployer of every contract looked up on a chain, saved in an S3 bucket.
+    The deployer and creation transaction of a contract never change, so an entry is never updated once written.
+    Only deployers are stored: an address without a deployer may not be indexed yet or be deployed later, so it must be looked up again.
+    Contract and deployer addresses are kept as sorted arrays of 20 bytes values and the transaction hashes as 32 bytes values.
+    New entries are kept in memory and written to the bucket as small delta files (save_delta),
+    which are merged back into the base file by compact.
+    Files are saved under the prefix: {prefix}/{chain}/base.npz and {prefix}/{chain}/delta_*.npz
+    """
+    def __init__(self, s3, prefix: str, chain: str = "ethereum") -> None:
+        self.s3 = s3
+        self.prefix = f"{prefix}/{chain}"
+        self.chain = chain
+        self.contracts = np.array([], dtype="S20")
+        self.deployers = np.array([], dtype="S20")
+        self.tx_hashes = np.array([], dtype="S32")
+        self.pending = {}
+        self.delta_counter = 0
+        self.delta_files = []
+        self.lock = threading.Lock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.contracts) + len(self.pending)
+
+    @staticmethod
+    def encode(value: str | None) -> bytes | None:
+        "Numpy strips trailing null bytes from S20 and S32 values, so they are stripped here too to keep comparisons consistent"
+        try:
+            return bytes.fromhex(value.lower().replace("0x", "", 1)).rstrip(b"\x00")
+        except (ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def decode(value: bytes, size: int) -> str:
+        return "0x" + value.ljust(size, b"\x00").hex()
+
+    def read_npz(self, key: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        result = self.s3.s3_client.get_object(Bucket=self.s3.bucket_name, Key=key)
+        content = np.load(io.BytesIO(result["Body"].read()))
+        return content["contracts"], content["deployers"], content["txHashes"]
+
+    def write_npz(self, key: str, contracts: np.ndarray, deployers: np.ndarray, tx_hashes: np.ndarray) -> None:
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, contracts=contracts, deployers=deployers, txHashes=tx_hashes)
+        self.s3.s3_client.put_object(Bucket=self.s3.bucket_name, Key=key, Body=buffer.getvalue())
+
+    def merge(self, parts: list[tuple[np.ndarray, np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        "Merges (contracts, deployers, txHashes) arrays, the first part wins on duplicated contracts. Returns sorted arrays."
+        if not parts:
+            return np.array([], dtype="S20"), np.array([], dtype="S20"), np.array([], dtype="S32")
+        contracts = np.concatenate([part[0] for part in parts])
+        deployers = np.concatenate([part[1] for part in parts])
+        tx_hashes = np.concatenate([part[2] for part in parts])
+        contracts, index = np.unique(contracts, return_index=True)
+        return contracts, deployers[index].astype("S20"), tx_hashes[index].astype("S32")
+
+    def load(self) -> None:
+        "Loads the base file and all the delta files from the bucket"
+        keys = [obj.key for obj in self.s3.bucket.objects.filter(Prefix=f"{self.prefix}/")]
+        parts = []
+        if f"{self.prefix}/base.npz" in keys:
+            parts.append(self.read_npz(f"{self.prefix}/base.npz"))
+        self.delta_files = sorted(key for key in keys if key.startswith(f"{self.prefix}/delta_"))
+        for key in self.delta_files:
+            parts.append(self.read_npz(key))
+        self.contracts, self.deployers, self.tx_hashes = self.merge(parts)
+        logging.info(f"Loaded {len(self.contracts)} {self.chain} deployers from {len(self.delta_files)} delta files")
+
+    def get_many(self, contracts: list[str]) -> list[tuple[str, str] | None]:
+        """Vectorized lookup of a list of contract addresses.
+        Returns for each contract (deployer, txHash), or None if its deployer is not known."""
+        encoded = [self.encode(contract) for contract in contracts]
+        keys = np.array([key if key is not None else b"" for key in encoded], dtype="S20")
+        positions = np.searchsorted(self.contracts, keys)
+        positions = np.minimum(positions, max(len(self.contracts) - 1, 0))
+        found = np.zeros(len(keys), dtype=bool)
+        if len(self.contracts):
+            found = (self.contracts[positions] == keys) & np.array([key is not None for key in encoded], dtype=bool)
+        results = []
+        for index, key in enumerate(encoded):
+            if key in self.pending:
+                deployer, tx_hash = self.pending[key]
+            elif found[index]:
+                deployer, tx_hash = self.deployers[positions[index]], self.tx_hashes[positions[index]]
+            else:
+                results.append(None)
+                continue
+            results.append((self.decode(deployer, 20), self.decode(tx_hash, 32)))
+        return results
+
+    def add(self, contract: str, deployer: str, tx_hash: str) -> None:
+        "Records the deployer of a contract. Known contracts are not changed. Persisted on save_delta."
+        encoded = self.encode(contract)
+        encoded_deployer = self.encode(deployer)
+        if encoded is None or not encoded_deployer:
+            return
+        position = np.searchsorted(self.contracts, encoded)
+        if position < len(self.contracts) and self.contracts[position] == encoded:
+            return
+        with self.lock:
+            if encoded not in self.pending:
+                self.pending[encoded] = (encoded_deployer, self.encode(tx_hash) or b"")
+
+    def save_delta(self) -> None:
+        "Writes the pending entries to the bucket as a delta file and merges them in memory"
+        with self.lock:
+            if not self.pending:
+                return
+            contracts = np.array(list(self.pending.keys()), dtype="S20")
+            deployers = np.array([value[0] for value in self.pending.values()], dtype="S20")
+            tx_hashes = np.array([value[1] for value in self.pending.values()], dtype="S32")
+            self.pending = {}
+        key = f"{self.prefix}/delta_{datetime.now().strftime('%Y%m%d%H%M%S')}_{self.delta_counter:06d}.npz"
+        self.delta_counter += 1
+        self.write_npz(key, contracts, deployers, tx_hashes)
+        self.delta_files.append(key)
+        self.contracts, self.deployers, self.tx_hashes = self.merge([
+            (self.contracts, self.deployers, self.tx_hashes), (contracts, deployers, tx_hashes)
+        ])
+        logging.info(f"Saved {len(contracts)} deployers to {key}")
+
+    def compact(self) -> None:
+        "Writes the full store as the base file and removes the delta files"
+        self.save_delta()
+        self.write_npz(f"{self.prefix}/base.npz", self.contracts, self.deployers, self.tx_hashes)
+        for key in self.delta_files:
+            self.s3.s3_client.delete_object(Bucket=self.s3.bucket_name, Key=key)
+        logging.info(f"Compacted {len(self.contracts)} deployers and {len(self.delta_files)} delta files")
+        self.delta_files = []
@@ -1,8 +1,12 @@
 import os
+import threading
 import time
+import pandas as pd
 from . import Requests
 from hexbytes import HexBytes
 from .web3Utils import Web3Utils
+from .blockRanges import BlockRangeLogFetcher
+from .eventDecoder import EventLogDecoder
 
 
 class Etherscan(Requests):
@@ -24,10 +28,20 @@ class Etherscan(Requests):
             "arbitrum": os.environ.get("ETHERSCAN_API_KEY_ARBITRUM", ""),
             "binance": os.environ.get("ETHERSCAN_API_KEY_BINANCE", ""),
         }
+        # Each variable can hold several comma separated keys, the first one is used by default
+        self.etherscan_api_key_pools = {
+            chain: [key.strip() for key in keys.split(",") if key.strip()] or [""]
+            for chain, keys in self.etherscan_api_keys.items()
+        }
+        self.etherscan_api_keys = {chain: keys[0] for chain, keys in self.etherscan_api_key_pools.items()}
+        self.calls_per_second = float(os.environ.get("ETHERSCAN_CALLS_PER_SECOND", 5))
+        self.next_calls = {}
+        self.keys_lock = threading.Lock()
         self.headers = {"Content-Type": "application/json"}
         self.pagination_count = 1000
         self.max_retries = max_retries
         self.w3utils = Web3Utils()
+        self.event_decoders = {}
         super().__init__()
 
     def is_valid_response(
@@ -46,6 +60,24 @@ class Etherscan(Requests):
             return False
         return True
 
+    def get_api_key(self, chain: str = "ethereum") -> str:
+        """
+        Returns the key of the chain with the earliest free slot in its rate budget (ETHERSCAN_CALLS_PER_SECOND per key),
+        and blocks the calling thread until the slot. Threads sharing the Etherscan instance spread their calls across all the keys.
+        parameters:
+            - chain: (ethereum|optimism|polygon) the chain of interest
+        """
+        interval = 1 / self.calls_per_second if self.calls_per_second else 0
+        with self.keys_lock:
+            keys = self.etherscan_api_key_pools[chain]
+            key = min(keys, key=lambda key: self.next_calls.get((chain, key), 0))
+            next_call = max(self.next_calls.get((chain, key), 0), time.time())
+            self.next_calls[(chain, key)] = next_call + interval
+        wait_time = next_call - time.time()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return key
+
     def convert_etherscan_log_to_web3_log(self, log: dict) -> dict:
         log["transactionHash"] = HexBytes(log["transactionHash"])
         log["blockHash"] = HexBytes(log["blockHash"])
@@ -139,12 +171,16 @@ class Etherscan(Requests):
         else:
             self.get_token_information(tokenAddress, counter=counter + 1)
 
-    def get_contract_deployer(self, contractAddresses: str, chain: str = "ethereum", counter: int = 0) -> dict | None:
+    def get_contract_deployer(
+        self, contractAddresses: list[str], chain: str = "ethereum", apikey: str | None = None, counter: int = 0
+    ) -> list[dict] | None:
         """
         Helper method to get the address of the deployer of a contract.
+        Addresses that are not contracts are missing from the result.
         parameters:
             - contractAddresses: ([address]) An array of contract addresses, up to 5 address!
             - chain: (ethereum|optimism|polygon) the chain of interest
+            - apikey: The key to use, see get_api_key. Defaults to the first key of the chain
         """
 
         assert len(contractAddresses) <= 5, "contractAddress cannot be more than 5 addresses"
@@ -157,14 +193,16 @@ class Etherscan(Requests):
             "module": "contract",
             "action": "getcontractcreation",
             "contractaddresses": ",".join(contractAddresses),
-            "apikey": self.etherscan_api_keys[chain],
+            "apikey": apikey or self.etherscan_api_keys[chain],
         }
         content = self.get_request(self.etherscan_api_url[chain], params=params, headers=self.headers, json=True)
+        if type(content) == dict and content.get("message") == "No data found":
+            return []
         if self.is_valid_response(content):
             result = content["result"]
             return result
         else:
-            self.get_contract_deployer(contractAddresses, counter=counter + 1)
+            return self.get_contract_deployer(contractAddresses, chain=chain, apikey=apikey, counter=counter + 1)
 
     def get_event_logs(
         self,
@@ -231,6 +269,96 @@ class Etherscan(Requests):
             )
         return results
 
+    def get_event_logs_window(
+        self,
+        address: str,
+        fromBlock: int,
+        toBlock: int,
+        topic0: str | None = None,
+        chain: str = "ethereum",
+        counter: int = 0,
+    ) -> list[dict] | None:
+        """
+        Helper method to get a single page of transactions logs of a smart contract for a block window.
+        If the result contains pagination_count logs, the window was truncated and must be split.
+        parameters:
+            - address: (address) A contract addresses.
+            - fromBlock: (int) The starting block to get transactions from
+            - toBlock: (int) The end block to get transactions from
+            - topic0: (hex) To filter on the first topic.
+            - chain: (ethereum|optimism|polygon) the chain of interest
+        """
+        time.sleep(counter)
+        if counter > self.max_retries:
+            return None
+
+        params = {
+            "module": "logs",
+            "action": "getLogs",
+            "address": address,
+            "fromBlock": fromBlock,
+            "toBlock": toBlock,
+            "topic0": topic0,
+            "page": 1,
+            "offset": self.pagination_count,
+            "apikey": self.etherscan_api_keys[chain],
+        }
+        content = self.get_request(self.etherscan_api_url[chain], params=params, headers=self.headers, json=True)
+        if self.is_valid_response(content):
+            return content["result"]
+        return self.get_event_logs_window(
+            address, fromBlock, toBlock, topic0=topic0, chain=chain, counter=counter + 1
+        )
+
+    def get_event_logs_by_range(
+        self,
+        address: str,
+        fromBlock: int,
+        toBlock: int | None = None,
+        topic0: str | None = None,
+        window: int = 100000,
+        max_workers: int = 4,
+        calls_per_second: float = 5,
+        checkpoint=None,
+        chain: str = "ethereum",
+    ) -> list[dict]:
+        """
+        Helper method to get all the transactions logs of a smart contract over a block range.
+        The range is split in windows fetched concurrently, and any window that hits the 1000 results cap is bisected.
+        Logs are returned ordered by (blockNumber, logIndex).
+        parameters:
+            - address: (address) A contract addresses.
+            - fromBlock: (int) The starting block to get transactions from
+            - toBlock: (int) The end block to get transactions from, defaults to the latest block
+            - topic0: (hex) To filter on the first topic.
+            - window: (int) The initial number of blocks per query
+            - max_workers: (int) The number of concurrent queries
+            - calls_per_second: (float) The rate budget shared by all the queries
+            - checkpoint: (function) Called with the highest block fully fetched so far
+            - chain: (ethereum|optimism|polygon) the chain of interest
+        """
+        if toBlock is None:
+            toBlock = self.get_last_block_number(chain=chain)
+        fetcher = BlockRangeLogFetcher(
+            lambda start, end: self.get_event_logs_window(address, start, end, topic0=topic0, chain=chain),
+            result_cap=self.pagination_count,
+            max_workers=max_workers,
+            calls_per_second=calls_per_second,
+        )
+        return fetcher.fetch(int(fromBlock or 0), toBlock, window=window, checkpoint=checkpoint)
+
+    def get_event_decoder(self, contractAddress: str, abi: dict | None = None, chain: str = "ethereum") -> EventLogDecoder:
+        """
+        Returns the batch event decoder of a contract, cached per chain and address.
+        If the ABI is not provided in the parameters, it automatically retrieves the abi of the contract using the etherscan API.
+        """
+        key = (chain, contractAddress.lower())
+        if key not in self.event_decoders:
+            if not abi:
+                abi = self.get_smart_contract_ABI(contractAddress, chain)
+            self.event_decoders[key] = EventLogDecoder(abi)
+        return self.event_decoders[key]
+
     def parse_event_logs(
         self,
         contractAddress: str,
@@ -239,10 +367,12 @@ class Etherscan(Requests):
         topic: str | None = None,
         abi: dict | None = None,
         chain: str = "ethereum",
-    ) -> list[dict] | None:
+        as_dataframe: bool = False,
+    ) -> dict[str, list] | pd.DataFrame:
         """
         Parse the event logs from a transaction.
         If the ABI is not provided in the parameters, it automatically retrieves the abi of the contract using the etherscan API.
+        Logs are decoded in bulk and returned as columns: event, address, transactionHash, blockNumber, logIndex and one column per event argument.
         Parameters:
           - contractAddress: The address of the deployed contract.
           - logs: The list of logs to parse
@@ -250,20 +380,17 @@ class Etherscan(Requests):
           - topic: Optional filter to filter for only a given topic (only valid for topic0)
           - abi: Optional a dictionary object of the contract ABI
           - chain: The chain where the contract is deployed
+          - as_dataframe: Return a pandas DataFrame instead of a dictionary of lists
         """
-        if not abi:
-            abi = self.get_smart_contract_ABI(contractAddress, chain)
-        contract = self.w3utils.get_smart_contract(contractAddress, abi)
+        decoder = self.get_event_decoder(contractAddress, abi=abi, chain=chain)
 
         if topic:
             logs = [log for log in logs if topic in log["topics"]]
 
-        results = []
-        for log in logs:
-            w3log = self.convert_etherscan_log_to_web3_log(log)
-            result = contract.events[eventName]().processLog(w3log)
-            results.append(result)
-        return results
+        results = decoder.decode(logs, eventNames=[eventName], as_dataframe=as_dataframe)
+        if eventName not in results:
+            return pd.DataFrame() if as_dataframe else {}
+        return results[eventName]
 
     def get_decoded_event_logs(
         self,
@@ -274,9 +401,11 @@ class Etherscan(Requests):
         topic0: str | None = None,
         abi: dict | None = None,
         chain: str = "ethereum",
-    ) -> list[dict] | None:
+        as_dataframe: bool = False,
+    ) -> dict[str, list] | pd.DataFrame:
         """
         Wrapper method that calls internal functions to get the decoded transactions logs of a smart contract for a given Event.
+        The logs are returned as columns, see parse_event_logs.
         It is recommended to use the topic0 filter to make the queries faster!
         parameters:
             - address: (address) A contract addresses.
@@ -286,8 +415,8 @@ class Etherscan(Requests):
             - topic0: (hex) To filter on the first topic.
             - chain: (ethereum|optimism|polygon) the chain of interest
         """
-        raw_logs = self.get_event_logs(address, fromBlock=fromBlock, toBlock=toBlock, topic0=topic0, chain=chain)
-        decoded_logs = self.parse_event_logs(address, raw_logs, eventName, topic=topic0, abi=abi, chain=chain)
+        raw_logs = self.get_event_logs_by_range(address, fromBlock=fromBlock, toBlock=toBlock, topic0=topic0, chain=chain)
+        decoded_logs = self.parse_event_logs(address, raw_logs, eventName, topic=topic0, abi=abi, chain=chain, as_dataframe=as_dataframe)
         return decoded_logs
 
     def get_internal_transactions(
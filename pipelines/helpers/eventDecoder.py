@@ -0,0 +1,135 @@
+import json
+import logging
+import eth_utils
+import pandas as pd
+from eth_abi import decode_abi, decode_single
+
+
+class EventLogDecoder:
+    """
+    Batch decoder for raw event logs (as returned by Etherscan getLogs or eth_getLogs).
+    The topic0 -> event ABI table is computed once per contract, logs are grouped by event signature
+    and each group is decoded with eth_abi directly, without going through web3 processLog.
+    Results are columnar: a dictionary of lists per event name.
+    """
+    def __init__(self, abi: str | list[dict]) -> None:
+        if type(abi) == str:
+            abi = json.loads(abi)
+        self.events = {}
+        for item in abi:
+            if item["type"] != "event" or item.get("anonymous", False):
+                continue
+            topic = "0x" + eth_utils.event_abi_to_log_topic(item).hex()
+            inputs = item["inputs"]
+            self.events[topic] = {
+                "name": item["name"],
+                "indexed": [(arg["name"], self.collapse_type(arg)) for arg in inputs if arg["indexed"]],
+                "data_names": [arg["name"] for arg in inputs if not arg["indexed"]],
+                "data_types": [self.collapse_type(arg) for arg in inputs if not arg["indexed"]],
+            }
+        self.topics = {spec["name"]: topic for topic, spec in self.events.items()}
+
+    def collapse_type(self, arg: dict) -> str:
+        "Converts a tuple ABI input to its canonical type string, ex: (address,uint256)[]"
+        if not arg["type"].startswith("tuple"):
+            return arg["type"]
+        components = ",".join(self.collapse_type(component) for component in arg["components"])
+        return f"({components}){arg['type'][len('tuple'):]}"
+
+    def is_hashed_topic(self, abi_type: str) -> bool:
+        "Indexed dynamic types are stored as their keccak hash in the topics and cannot be decoded."
+        return abi_type in ["string", "bytes"] or abi_type.endswith("]") or abi_type.startswith("(")
+
+    def normalize(self, abi_type: str, values: list) -> list:
+        "Checksums addresses to match what web3 returns"
+        if abi_type == "address":
+            return [eth_utils.to_checksum_address(value) for value in values]
+        if abi_type == "address[]":
+            return [[eth_utils.to_checksum_address(address) for address in value] for value in values]
+        return values
+
+    def decode_topics(self, abi_type: str, topics: list[bytes]) -> list:
+        if self.is_hashed_topic(abi_type):
+            return topics
+        return self.normalize(abi_type, [decode_single(abi_type, topic) for topic in topics])
+
+    def hex_to_int(self, value: str | int) -> int:
+        if type(value) == int:
+            return value
+        if value == "0x":
+            return 0
+        return int(value, 16)
+
+    def group_logs(self, logs: list[dict], eventNames: list[str] | None = None) -> dict[str, list[dict]]:
+        "Groups the logs by topic0, dropping the ones that don't match any (requested) event of the ABI"
+        topics = set(self.events.keys())
+        if eventNames:
+            topics = set(self.topics[name] for name in eventNames if name in self.topics)
+        groups = {}
+        for log in logs:
+            if len(log["topics"]) == 0:
+                continue
+            topic = log["topics"][0].lower()
+            if topic in topics:
+                groups.setdefault(topic, []).append(log)
+        return groups
+
+    def decode_group(self, topic: str, logs: list[dict]) -> dict[str, list]:
+        spec = self.events[topic]
+        columns = {
+            "event": [spec["name"]] * len(logs),
+            "address": [eth_utils.to_checksum_address(log["address"]) for log in logs],
+            "transactionHash": [log["transactionHash"] for log in logs],
+            "blockNumber": [self.hex_to_int(log["blockNumber"]) for log in logs],
+            "logIndex": [self.hex_to_int(log["logIndex"]) for log in logs],
+        }
+        for position, (name, abi_type) in enumerate(spec["indexed"]):
+            topics = [bytes.fromhex(log["topics"][position + 1][2:]) for log in logs]
+            columns[name] = self.decode_topics(abi_type, topics)
+
+        if spec["data_types"]:
+            rows = [decode_abi(spec["data_types"], bytes.fromhex(log["data"][2:])) for log in logs]
+            for position, (name, abi_type) in enumerate(zip(spec["data_names"], spec["data_types"])):
+                columns[name] = self.normalize(abi_type, [row[position] for row in rows])
+        return columns
+
+    def decode(self,
+               logs: list[dict],
+               eventNames: list[str] | None = None,
+               as_dataframe: bool = False) -> dict[str, dict[str, list]] | dict[str, pd.DataFrame]:
+        """
+        Decodes the logs and returns a dictionary keyed by event name.
+        Each value is a dictionary of columns (or a DataFrame if as_dataframe is True).
+        Logs that fail to decode are logged and skipped.
+        parameters:
+            - logs: The raw logs to decode
+            - eventNames: Optional list of event names to restrict the decoding to
+            - as_dataframe: Return pandas DataFrames instead of dictionaries of lists
+        """
+        results = {}
+        for topic, group in self.group_logs(logs, eventNames).items():
+            try:
+                columns = self.decode_group(topic, group)
+            except Exception as e:
+                logging.error(f"Batch decoding of {self.events[topic]['name']} failed, decoding one log at a time: {e}")
+                columns = self.decode_one_by_one(topic, group)
+            results[self.events[topic]["name"]] = pd.DataFrame(columns) if as_dataframe else columns
+        return results
+
+    def decode_one_by_one(self, topic: str, logs: list[dict]) -> dict[str, list]:
+        "Fallback used when a group contains malformed logs"
+        columns = {}
+        for log in logs:
+            try:
+                decoded = self.decode_group(topic, [log])
+            except Exception as e:
+                logging.error(f"Could not decode log {log.get('logIndex')} of transaction {log.get('transactionHash')}: {e}")
+                continue
+            for name, values in decoded.items():
+                columns.setdefault(name, []).extend(values)
+        return columns
+
+    @staticmethod
+    def to_records(columns: dict[str, list]) -> list[dict]:
+        "Converts columnar results back to a list of dictionaries"
+        return [dict(zip(columns.keys(), values)) for values in zip(*columns.values())]
@@ -98,6 +98,18 @@ class Indexes(Cypher):
         self.query(query)
         query = """CREATE FULLTEXT INDEX wicTwitter IF NOT EXISTS FOR (a:Twitter) ON EACH [a.bio]"""
 
+    def changeTracking(self, labels: list[str], types: list[str], properties: list[str]) -> None:
+        "Range indexes on the change properties (lastUpdateDt, createdDt...) of every given node label and relationship type"
+        for label in labels:
+            for prop in properties:
+                query = f"CREATE INDEX `ChangeTracking_{label}_{prop}` IF NOT EXISTS FOR (n:`{label}`) ON (n.{prop})"
+                self.query(query)
+        for relationship_type in types:
+            for prop in properties:
+                query = f"CREATE INDEX `ChangeTracking_rel_{relationship_type}_{prop}` IF NOT EXISTS FOR ()-[r:`{relationship_type}`]-() ON (r.{prop})"
+                self.query(query)
+        self.query("CALL db.awaitIndexes(3600)")
+
     def sound(self):
         query = "CREATE INDEX Sound IF NOT EXISTS FOR (e:Sound) ON (e.handle)"
         self.query(query)
@@ -233,6 +233,32 @@ class Queries(Cypher):
             count += self.query(query)[0].value()
         return count
 
+    @count_query_logging
+    def unlink_partitions(self, urls, partitionTarget, targetField, label):
+        "Removes the HAS_PARTITION links of the targets in the CSV. CSV Must have the column: [targetField]"
+        count = 0
+        for url in tqdm(urls):
+            query = f"""
+                LOAD CSV WITH HEADERS FROM '{url}' AS partitions
+                MATCH (target:{partitionTarget} {{ {targetField}: partitions.targetField }})-[link:HAS_PARTITION]->(partition:Partition:{label} {{partitionTarget: "{partitionTarget}"}})
+                DELETE link
+                RETURN count(link)
+            """
+            count += self.query(query)[0].value()
+        return count
+
+    @count_query_logging
+    def delete_empty_partitions(self, partitionTarget, label):
+        "Deletes the partitions that have no HAS_PARTITION link left"
+        query = f"""
+            MATCH (partition:Partition:{label} {{partitionTarget: "{partitionTarget}"}})
+            WHERE NOT (partition)<-[:HAS_PARTITION]-()
+            DELETE partition
+            RETURN count(partition)
+        """
+        count = self.query(query)[0].value()
+        return count
+
     @count_query_logging
     def create_or_merge_tokens(self, urls, token_type, chain_id = 1):
         "CSV Must have the columns: [contractAddress, symbol, decimal]"
@@ -256,3 +282,15 @@ class Queries(Cypher):
             """
             count += self.query(query)[0].value()
         return count
+
+    def get_twitter_bios(self, after="", limit=10000):
+        "Returns a page of limit Twitter accounts with a bio (handle, bio), ordered by handle and starting after the handle after"
+        query = """
+            MATCH (twitter:Twitter:Account)
+            WHERE twitter.handle > $after AND twitter.bio IS NOT NULL
+            RETURN twitter.handle AS handle, twitter.bio AS bio
+            ORDER BY twitter.handle
+            LIMIT $limit
+        """
+        results = self.query(query, parameters={"after": after, "limit": limit})
+        return results
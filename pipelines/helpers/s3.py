@@ -111,6 +111,19 @@ class S3Utils:
         except Exception as e:
             logging.error("Something went wrong while uploading to S3!")
             raise e
+
+    def load_file(self, 
+                  s3_path: str, 
+                  local_path: str) -> bool:
+        "Downloads a file from the S3 bucket set during initialization. Returns False if the file does not exist."
+        if not self.check_if_file_exists(s3_path):
+            return False
+        try:
+            self.s3_client.download_file(self.bucket_name, s3_path, local_path)
+        except Exception as e:
+            logging.error("Something went wrong while downloading from S3!")
+            raise e
+        return True
       
     def save_df_as_csv(self, 
                        df: pd.DataFrame, 
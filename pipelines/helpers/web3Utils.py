@@ -9,6 +9,7 @@ from ens import ENS
 from web3 import Web3
 from web3.logs import DISCARD
 import eth_utils
+from hexbytes import HexBytes
 
 class Web3Utils:
     def __init__(self, chain="ethereum", max_retries=10) -> None:
@@ -19,6 +20,7 @@ class Web3Utils:
             "arbitrum": f"https://arb-mainnet.g.alchemy.com/v2/{os.environ['ALCHEMY_API_KEY']}"
         }
         self.max_retries = max_retries
+        self.contract_events = {}
         self.w3 = Web3(Web3.HTTPProvider(self.alchemy_urls[chain]))
         self.ns = ENS.fromWeb3(self.w3)
         self.text_records = ["avatar", "description", "display", "email", "keywords", "mail", "notice", "location", "phone", "url", "com.github", "com.peepeth", "com.linkedin", "com.twitter", "io.keybase", "org.telegram"]
@@ -57,6 +59,44 @@ class Web3Utils:
         decoded_log = contract.events[event_name]().processReceipt(receipt, errors=DISCARD)
         return decoded_log
 
+    def get_event_topic(self, contract, name):
+        "Returns the topic0 hash of an event as a 0x prefixed hex string"
+        event = [abi for abi in contract.abi if abi["type"] == "event" and abi["name"] == name][0]
+        return "0x" + eth_utils.event_abi_to_log_topic(event).hex()
+
+    def get_contract_event(self, contract, name):
+        "Returns the contract event object and its topic0, cached per contract and event name"
+        key = (contract.address, name)
+        if key not in self.contract_events:
+            self.contract_events[key] = (contract.events[name](), self.get_event_topic(contract, name))
+        return self.contract_events[key]
+
+    def convert_rpc_log_to_web3_log(self, log):
+        "Converts a raw eth_getLogs result to the format expected by web3 processLog"
+        w3log = dict(log)
+        w3log["transactionHash"] = HexBytes(log["transactionHash"])
+        w3log["blockHash"] = HexBytes(log["blockHash"])
+        w3log["topics"] = [HexBytes(topic) for topic in log["topics"]]
+        for key in ["blockNumber", "logIndex", "transactionIndex"]:
+            if type(log[key]) == str:
+                w3log[key] = int(log[key], 16) if log[key] != "0x" else 0
+        return w3log
+
+    def decode_event_logs(self, contract, logs, name):
+        """
+        Decodes the logs of a given event directly from eth_getLogs results, without fetching the transactions receipts.
+        Logs of other events are skipped.
+        """
+        event, topic = self.get_contract_event(contract, name)
+        decoded_logs = []
+        for log in logs:
+            if len(log["topics"]) == 0 or log["topics"][0].lower() != topic:
+                continue
+            try:
+                decoded_logs.append(event.processLog(self.convert_rpc_log_to_web3_log(log)))
+            except Exception as e:
+                logging.error(f"Could not decode {name} log in transaction {log['transactionHash']}: {e}")
+        return decoded_logs
 
     def get_ens_name(self, address, counter=0):
         if counter > self.max_retries:
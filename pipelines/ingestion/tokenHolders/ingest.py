@@ -2,6 +2,7 @@ import logging
 from ..helpers import Ingestor
 from .cyphers import TokenHoldersCyphers
 import re
+import numpy as np
 import pandas as pd
 import sys
 try:
@@ -9,6 +10,11 @@ try:
 except:
     pass
 
+HEX_DIGITS = np.full(256, 255, dtype=np.uint8)
+for value, digit in enumerate("0123456789abcdef"):
+    HEX_DIGITS[ord(digit)] = value
+    HEX_DIGITS[ord(digit.upper())] = value
+
 class TokenHoldersIngestor(Ingestor):
     def __init__(self, bucket_name="token-holders"):
         self.cyphers = TokenHoldersCyphers()
@@ -79,36 +85,94 @@ class TokenHoldersIngestor(Ingestor):
             urls = self.save_df_as_csv(token_data[tokenType], f"ingestor_tokens_{tokenType}_{self.asOf}", max_lines=5000)
             self.cyphers.create_or_merge_tokens(urls, tokenType)
 
+    def parse_decimal(self, decimal):
+        if type(decimal) == str and "0x" in decimal:
+            return int(decimal, 16)
+        elif type(decimal) == str:
+            return int(decimal)
+        return decimal
+
+    def get_numeric_balance(self, balance, contractType, decimal):
+        "Exact conversion of a single balance, used for the values the vectorized path cannot convert exactly"
+        if contractType == "erc20" and decimal:
+            numericBalance = int(balance, 16) / 10**decimal
+        else:
+            numericBalance = int(balance, 16)
+            if numericBalance > 10**9:
+                numericBalance = numericBalance // 10**18
+        return str(numericBalance)
+
+    def hex_to_uint128(self, balances):
+        """
+        Converts hex strings to 128 bits integers in bulk.
+        Full width balances (0x + 64 hex digits, what Alchemy returns) are decoded as one ascii buffer with a lookup table,
+        any other width is converted with int().
+        Returns the high and low uint64 halves and a mask of the balances that do not fit in 128 bits (their value is left to 0).
+        """
+        balances = balances.values
+        high = np.zeros(len(balances), dtype=np.uint64)
+        low = np.zeros(len(balances), dtype=np.uint64)
+        too_big = np.zeros(len(balances), dtype=bool)
+        lengths = np.fromiter(map(len, balances), dtype=np.int64, count=len(balances))
+        full = lengths == 66
+        if full.any():
+            ascii_digits = np.frombuffer("".join(balances[full]).encode("ascii"), dtype=np.uint8).reshape(-1, 66)[:, 2:]
+            nibbles = HEX_DIGITS[ascii_digits]
+            words = (nibbles[:, 0::2] << 4 | nibbles[:, 1::2]).astype(np.uint8).copy().view(">u8")
+            invalid = (nibbles == 255).any(axis=1)
+            positions = np.flatnonzero(full)
+            too_big[positions] = invalid | (words[:, 0] != 0) | (words[:, 1] != 0)
+            high[positions] = np.where(invalid, 0, words[:, 2])
+            low[positions] = np.where(invalid, 0, words[:, 3])
+        for position in np.flatnonzero(~full):
+            value = int(balances[position], 16)
+            if value >= 2**128:
+                too_big[position] = True
+            else:
+                high[position], low[position] = value >> 64, value & (2**64 - 1)
+        return high, low, too_big
+
     def prepare_holdings_data(self):
         logging.info("Preparing balances data")
-        data = []
         wallets = [wallet for wallet in self.scraper_data["balances"] if not self.is_zero_address(wallet)]
-        for wallet in wallets:
-            for balance in self.scraper_data["balances"][wallet]:
-                if type(balance) == dict and "error" not in balance:
-                    contractAddress = balance["contractAddress"]
-                    if contractAddress in self.scraper_data["tokens"] and self.is_valid_address(contractAddress) and not self.is_zero_address(contractAddress):
-                        decimal = self.scraper_data["tokens"][contractAddress]["decimal"]
-                        if type(decimal) == str and "0x" in decimal:
-                            decimal = int(decimal, 16)
-                        elif type(decimal) == str:
-                            decimal = int(decimal)
-                        if balance["tokenBalance"] == "0x":
-                            balance["tokenBalance"] = "0x0"
-                        if self.scraper_data["tokens"][contractAddress]["contractType"] == "erc20" and decimal:
-                            numericBalance = int(balance["tokenBalance"], 16) / 10**decimal
-                        else:
-                            numericBalance = int(balance["tokenBalance"], 16)
-                            if numericBalance > 10**9:
-                                numericBalance = numericBalance // 10**18
-                        data.append({
-                            "address": wallet,
-                            "contractAddress": contractAddress,
-                            "balance": balance["tokenBalance"],
-                            "numericBalance": str(numericBalance)
-                        })
-        data = pd.DataFrame.from_dict(data)
-        return data
+        rows = [
+            (wallet, balance["contractAddress"], balance["tokenBalance"])
+            for wallet in wallets
+            for balance in self.scraper_data["balances"][wallet]
+            if type(balance) == dict and "error" not in balance
+        ]
+        data = pd.DataFrame(rows, columns=["address", "contractAddress", "balance"])
+        del rows
+
+        # Invalid and zero token addresses are dropped from the token table, so the join filters them out of the holdings
+        tokens = pd.DataFrame.from_dict(self.scraper_data["tokens"], orient="index", columns=["contractType", "decimal"])
+        tokens = tokens[[self.is_valid_address(token) and not self.is_zero_address(token) for token in tokens.index]]
+        tokens["decimal"] = tokens["decimal"].apply(self.parse_decimal)
+        data = data.merge(tokens, left_on="contractAddress", right_index=True, how="inner").reset_index(drop=True)
+        data["balance"] = data["balance"].where(data["balance"] != "0x", "0x0")
+
+        high, low, too_big = self.hex_to_uint128(data["balance"])
+        decimals = pd.to_numeric(data["decimal"], errors="coerce").fillna(0).values
+        is_erc20 = ((data["contractType"] == "erc20") & data["decimal"].notna() & (decimals != 0)).values
+        # ERC20 balances are divided in float64 (10**decimals is exact up to 22 decimals), other tokens are kept as exact integers
+        float_path = is_erc20 & ~too_big & (decimals > 0) & (decimals <= 22)
+        int_path = ~is_erc20 & ~too_big & (high == 0)
+        exact_path = ~(float_path | int_path)
+
+        numeric = pd.Series("", index=data.index, dtype=object)
+        values = high[float_path].astype(np.float64) * 2.0**64 + low[float_path].astype(np.float64)
+        numeric[float_path] = pd.Series(values / np.power(10.0, decimals[float_path])).astype(str).values
+        integers = low[int_path]
+        integers = np.where(integers > 10**9, integers // np.uint64(10**18), integers)
+        numeric[int_path] = integers.astype(str)
+        if exact_path.any():
+            subset = data[exact_path]
+            numeric[exact_path] = [
+                self.get_numeric_balance(balance, contractType, None if pd.isna(decimal) else int(decimal))
+                for balance, contractType, decimal in zip(subset["balance"], subset["contractType"], subset["decimal"])
+            ]
+        data["numericBalance"] = numeric
+        return data[["address", "contractAddress", "balance", "numericBalance"]]
 
     def ingest_holdings(self):
         logging.info("Ingesting balances data")
@@ -0,0 +1,80 @@
+import logging
+import time
+from .cyphers import AccountsCyphers
+
+# Benchmark of link_same_handles against the previous cartesian product query on synthetic accounts.
+# The accounts are created with their own label in the database of NEO_URI and deleted afterwards.
+# Run with: python -m pipelines.postProcessing.accounts.benchmark
+
+LABEL = "_HandleBenchmark"
+
+def cartesian_link_same_handles(cyphers, label):
+    "Previous implementation: every pair of accounts is compared"
+    query = f"""
+        MATCH (account1:{label})
+        MATCH (account2:{label})
+        WHERE id(account1) <> id(account2)
+        AND account1.handle IS NOT NULL
+        AND account2.handle IS NOT NULL
+        AND account1.handle = account2.handle
+        AND NOT (account1)-[:HAS_ACCOUNT]-(account2)
+        MERGE (account1)-[r:HAS_ACCOUNT]-(account2)
+        SET r.citation = "Same handle"
+        return count(r)
+    """
+    return cyphers.query(query)[0].value()
+
+def create_accounts(cyphers, n_accounts, accounts_per_handle=2):
+    "Creates n_accounts synthetic accounts, accounts_per_handle of them sharing each handle"
+    query = f"""
+        UNWIND range(0, $n_accounts - 1) AS i
+        CREATE (:{LABEL} {{handle: 'handle-' + toString(i / $accounts_per_handle)}})
+    """
+    cyphers.query(query, parameters={"n_accounts": n_accounts, "accounts_per_handle": accounts_per_handle})
+
+def delete_accounts(cyphers):
+    match_query = f"""
+        MATCH (account:{LABEL})
+        RETURN account
+    """
+    write_query = """
+        DETACH DELETE account
+    """
+    cyphers.iterate(match_query, write_query)
+
+def timed(function, *args, **kwargs):
+    start = time.time()
+    result = function(*args, **kwargs)
+    return result, time.time() - start
+
+def benchmark_link_same_handles(sizes=(1000, 2000, 4000, 8000, 16000), cartesian_max_size=16000):
+    """
+    Times the grouped and the cartesian implementations on growing numbers of accounts.
+    The grouped time should grow linearly with the number of accounts and the cartesian one quadratically.
+    The cartesian implementation is skipped above cartesian_max_size accounts.
+    Returns a dictionary of timings in seconds by number of accounts.
+    """
+    cyphers = AccountsCyphers()
+    cyphers.query(f"CREATE INDEX HandleBenchmark IF NOT EXISTS FOR (n:{LABEL}) ON (n.handle)")
+    results = {}
+    try:
+        for size in sizes:
+            results[size] = {}
+            delete_accounts(cyphers)
+            create_accounts(cyphers, size)
+            count, results[size]["grouped"] = timed(cyphers.link_same_handles, label=LABEL)
+            results[size]["grouped_links"] = count
+            if size <= cartesian_max_size:
+                delete_accounts(cyphers)
+                create_accounts(cyphers, size)
+                count, results[size]["cartesian"] = timed(cartesian_link_same_handles, cyphers, LABEL)
+                results[size]["cartesian_links"] = count
+            logging.info(f"{size} accounts: {results[size]}")
+    finally:
+        delete_accounts(cyphers)
+        cyphers.query("DROP INDEX HandleBenchmark IF EXISTS")
+    return results
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    benchmark_link_same_handles()
@@ -1,85 +1,93 @@
 from ...helpers import count_query_logging
-from ...helpers import Cypher
+from ...helpers import Cypher, Indexes
 
 
 class AccountsCyphers(Cypher):
     def __init__(self, database=None):
         super().__init__(database)
 
+    def create_indexes(self):
+        indexes = Indexes()
+        indexes.accounts()
+
     @count_query_logging
     def set_wallet_account_label(self):
-        query = """
-            CALL apoc.periodic.commit("
-                MATCH (wallet:Wallet)
-                WHERE NOT wallet:Account 
-                WITH wallet LIMIT 10000
-                SET wallet:Account 
-                RETURN count(*)
-            ")
-        """
-        count = self.query(query)[0].value()
+        match_query = """
+            MATCH (wallet:Wallet)
+            WHERE NOT wallet:Account 
+            RETURN wallet
+        """
+        write_query = """
+            SET wallet:Account 
+        """
+        count = self.iterate(match_query, write_query, parallel=True)
         return count
     
     @count_query_logging
     def set_account_type(self, label):
-        query = f"""
-            CALL apoc.periodic.commit("
-                MATCH (account:{label}) 
-                WHERE account.accountType IS NULL 
-                WITH account LIMIT 10000
-                SET account.accountType = '{label}'
-                RETURN count(*)
-            ")
-        """
-        count = self.query(query)[0].value()
+        match_query = f"""
+            MATCH (account:{label}) 
+            WHERE account.accountType IS NULL 
+            RETURN account
+        """
+        write_query = """
+            SET account.accountType = $label
+        """
+        count = self.iterate(match_query, write_query, parameters={"label": label}, parallel=True)
         return count
     
     @count_query_logging
     def link_wallet_twitter_accounts(self):
-        query = f"""
-            CALL apoc.periodic.commit("
-                MATCH (wallet:Wallet)-[:HAS_ALIAS]-(alias:Alias:Ens)-[:HAS_ALIAS]-(twitter:Twitter:Account)
-                WHERE NOT (wallet)-[:HAS_ACCOUNT]-(twitter)
-                AND NOT (alias)-[:HAS_ALIAS]-(:Entity)
-                WITH wallet, twitter LIMIT 10000 
-                MERGE (twitter)-[r:HAS_ACCOUNT]->(wallet)
-                SET r.citation = 'Twitter - self-attested in tweet or bio.'
-                RETURN count(*)
-            ")
-        """
-        count = self.query(query)[0].value()
+        match_query = """
+            MATCH (wallet:Wallet)-[:HAS_ALIAS]-(alias:Alias:Ens)-[:HAS_ALIAS]-(twitter:Twitter:Account)
+            WHERE NOT (wallet)-[:HAS_ACCOUNT]-(twitter)
+            AND NOT (alias)-[:HAS_ALIAS]-(:Entity)
+            RETURN DISTINCT wallet, twitter
+        """
+        write_query = """
+            MERGE (twitter)-[r:HAS_ACCOUNT]->(wallet)
+            SET r.citation = 'Twitter - self-attested in tweet or bio.'
+        """
+        count = self.iterate(match_query, write_query)
         return count
     
     @count_query_logging
     def link_wallet_github_accounts(self):
-        query = f"""
-            CALL apoc.periodic.commit("
-                MATCH (wallet:Wallet)<-[:HAS_WALLET]-(github:Github)
-                WHERE NOT (wallet)-[:HAS_ACCOUNT]->(github)
-                WITH wallet, github LIMIT 10000
-                MERGE (wallet)-[r:HAS_ACCOUNT]->(github)
-                SET r.citation = 'Github has wallet'
-                RETURN count(distinct(r))
-            ")
-        """
-        count = self.query(query)[0].value()
+        match_query = """
+            MATCH (wallet:Wallet)<-[:HAS_WALLET]-(github:Github)
+            WHERE NOT (wallet)-[:HAS_ACCOUNT]->(github)
+            RETURN DISTINCT wallet, github
+        """
+        write_query = """
+            MERGE (wallet)-[r:HAS_ACCOUNT]->(github)
+            SET r.citation = 'Github has wallet'
+        """
+        count = self.iterate(match_query, write_query)
         return count
 
     @count_query_logging
-    def link_same_handles(self):
-        query = f"""
-            MATCH (account1:Account)
-            MATCH (account2:Account)
-            WHERE id(account1) <> id(account2) 
-            AND account1.handle IS NOT NULL 
-            AND account2.handle IS NOT NULL 
-            AND account1.handle = account2.handle 
-            AND NOT (account1)-[:HAS_ACCOUNT]-(account2)
-            MERGE (account1)-[r:HAS_ACCOUNT]-(account2)
-            SET r.citation = "Same handle"
-            return count(r)
+    def link_same_handles(self, label="Account", batch_size=1000):
+        """Links the accounts sharing the same handle, handle by handle: the handles used by more than one account
+        are grouped in a single pass, then the accounts of each handle are found through the handle index
+        and only the missing links between them are created. Returns the number of links created."""
+        match_query = f"""
+            MATCH (account:{label})
+            WHERE account.handle IS NOT NULL
+            WITH account.handle AS handle, count(account) AS accounts
+            WHERE accounts > 1
+            RETURN handle
+        """
+        write_query = f"""
+            MATCH (account:{label} {{handle: handle}})
+            WITH handle, collect(account) AS accounts
+            UNWIND range(0, size(accounts) - 2) AS i
+            UNWIND range(i + 1, size(accounts) - 1) AS j
+            WITH accounts[i] AS account1, accounts[j] AS account2
+            WHERE NOT (account1)-[:HAS_ACCOUNT]-(account2)
+            MERGE (account1)-[r:HAS_ACCOUNT]->(account2)
+            SET r.citation = 'Same handle'
         """
-        count = self.query(query)[0].value()
+        count = self.iterate(match_query, write_query, batch_size=batch_size, statistic="relationshipsCreated")
         return count
 
     @count_query_logging
@@ -145,58 +153,50 @@ class AccountsCyphers(Cypher):
 
     @count_query_logging
     def create_mirror_accounts(self):
-        query = f"""
-        CALL apoc.periodic.commit('
+        match_query = """
             MATCH (m:Article)-[:AUTHOR]-(wallet:Wallet)
             MATCH (m:Mirror:Account)
-            OPTIONAL MATCH (wallet)-[:HAS_ALIAS]-(alias:Alias {{primary:True}})
+            OPTIONAL MATCH (wallet)-[:HAS_ALIAS]-(alias:Alias {primary:True})
             WHERE NOT wallet.address = m.author
-            WITH wallet.address AS address, coalesce(alias.name, wallet.address) AS handle, "https://mirror.xyz/" + wallet.address AS url LIMIT 10000
-            MERGE (account:Mirror:Account {{author:address}})
+            RETURN DISTINCT wallet.address AS address, coalesce(alias.name, wallet.address) AS handle, "https://mirror.xyz/" + wallet.address AS url
+        """
+        write_query = """
+            MERGE (account:Mirror:Account {author:address})
             ON CREATE SET account.url = url, account.handle = handle, account.accountType = "Mirror", account.uuid = apoc.create.uuid()
             ON MATCH SET account.lastUpdateDt = timestamp()
-            RETURN COUNT(*)
-        ')
         """
-        count = self.query(query)[0].value()
+        count = self.iterate(match_query, write_query)
         return count 
 
     @count_query_logging
     def link_mirror_accounts(self):
-        query = """
-        CALL apoc.periodic.commit('
-            MATCH (wallet:Wallet)
+        match_query = """
             MATCH (account:Account:Mirror)
+            MATCH (wallet:Wallet {address: account.author})
             WHERE NOT (wallet)-[:HAS_ACCOUNT]-(:Mirror:Account)
-            AND wallet.address = account.author 
-            WITH wallet, account limit 5000
+            RETURN wallet, account
+        """
+        write_query = """
             MERGE (wallet)-[accn:HAS_ACCOUNT]->(account)
             SET accn.citation = "Has mirror account"
-            RETURN count(*)
-        ')
         """
-        count = self.query(query)[0].value()
-
+        count = self.iterate(match_query, write_query, batch_size=5000)
         return count
 
     @count_query_logging
     def handle_token_accounts(self):
-        twitter = """
-        CALL apoc.periodic.commit('
+        match_query = """
             MATCH (token:Token) 
             WHERE ((token:ERC721) or (token:ERC1155)) 
             AND token.twitterUsername IS NOT NULL 
             AND NOT (token)-[:HAS_ACCOUNT]-(:Twitter)
-            WITH token limit 1000
-            MATCH (twitter:Twitter)
-            WHERE tolower(token.twitterUsername) = twitter.handle 
-            WITH token, twitter 
+            RETURN token
+        """
+        write_query = """
+            MATCH (twitter:Twitter {handle: tolower(token.twitterUsername)})
             MERGE (token)-[acc:HAS_ACCOUNT]->(twitter)
             SET acc.citation = "Is a token account"
-            RETURN COUNT(*)
-        ')
         """
-        self.query(twitter)
-
-        return None 
+        count = self.iterate(match_query, write_query, batch_size=1000)
+        return count
     
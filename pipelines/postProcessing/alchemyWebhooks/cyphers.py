@@ -16,7 +16,7 @@ class WebhooksCyphers(Cypher):
     def get_webhooks(self, webhook_label) -> dict[str]:
         query = f"""
             MATCH (webhook:Alchemy:{webhook_label})
-            RETURN webhook.id as webhook_id, webhook.network as network, apoc.node.degree(webhook, "IS_MEMBER_OF") as degree
+            RETURN webhook.id as webhook_id, webhook.network as network, apoc.node.degree(webhook, "IS_WATCHED_BY") as degree
         """
         records = self.query(query)
         webhooks = {}
@@ -73,6 +73,33 @@ class WebhooksCyphers(Cypher):
         data = [(record["address"], record["webhook_id"]) for record in records]
         return data
     
+    @get_query_logging
+    def get_selected_items(self, label):
+        "Returns the addresses of the items that must be watched (notifySelected = true), label: Wallet | Token"
+        query = f"""
+            MATCH (item:{label})
+            WHERE item.notifySelected = true
+            RETURN item.address as address
+        """
+        records = self.query(query)
+        items = [record["address"] for record in records]
+        return items
+
+    @get_query_logging
+    def get_watched_items(self, label, webhook_label):
+        """Returns the current assignment of the items to the webhooks as (address, webhook_id, network) tuples
+        Parameters:
+            - label: Wallet | Token
+            - webhook_label: AddressesWebhook | TokensWebhook
+        """
+        query = f"""
+            MATCH (item:{label})-[:IS_WATCHED_BY]->(webhook:Alchemy:{webhook_label})
+            RETURN item.address as address, webhook.id as webhook_id, webhook.network as network
+        """
+        records = self.query(query)
+        data = [(record["address"], record["webhook_id"], record["network"]) for record in records]
+        return data
+
     @count_query_logging
     def remove_item_from_webhook(self, webhook_id, addresses, label, webhook_label):
         """Parameters:
@@ -21,59 +21,92 @@ class WebhooksProcessor(Processor):
         for i in range(0, len(array), chunk_size):
             yield array[i:i + chunk_size]
 
-    def process_addresses_removals(self):
-        data = self.cyphers.get_items_to_remove("Wallet", "AddressesWebhook")
-        for_removal = {}
-        for wallet, webhook_id in data:
-            if webhook_id not in for_removal:
-                for_removal[webhook_id] = []
-            for_removal[webhook_id].append(wallet)
-        for webhook_id in for_removal:
-            self.alchemy.update_webhook_address(webhook_id=webhook_id, addresses=for_removal[webhook_id], removal=True)
-            self.cyphers.remove_item_from_webhook(webhook_id, for_removal[webhook_id], "Wallet", "AddressesWebhook")
-    
-    def process_addresses_additions(self):
-        wallets = self.cyphers.get_items_to_watch("Wallet", "AddressesWebhook")
-        current_index = 0
-        webhooks = self.cyphers.get_webhooks("AddressesWebhook")
-        additions = {}
-        for network in self.networks:
-            additions[network] = {}
-        for network in webhooks:
-            for webhook_id in webhooks[network]:
-                additions[network][webhook_id] = []
-        for wallet in tqdm(wallets, desc="Sorting addresses to existing webhooks ..."):
-            if not self.is_zero_address(wallet):
-                for network in webhooks:
-                    for webhook_id in webhooks[network]:
-                        if webhooks[network][webhook_id] < self.max_wallet_address_webhook:
-                            additions[network][webhook_id].append(wallet)
-                            webhooks[network][webhook_id] += 1
-                            break
-                current_index += 1
-            
-        for network in tqdm(additions, desc="Updating webhooks..."):
-            for webhook_id in additions[network]:
-                self.alchemy.update_webhook_address(webhook_id, addresses=additions[network][webhook_id])
-                self.cyphers.connect_items_to_webhook(webhook_id, additions[network][webhook_id], "Wallet", "AddressesWebhook")
+    def allocate_webhooks(self, items, assignments, webhooks, capacity):
+        """
+        Computes the webhook of every item on every network, moving as few items as possible:
+        - Items that must not be watched anymore, or are watched twice on a network, are removed from their webhook.
+          The webhooks of the networks that are not in self.networks are left as they are.
+        - Items already watched on a network keep their webhook.
+        - The other items fill the remaining capacity of the existing webhooks of the network, the emptiest first,
+          then go to new webhooks of at most capacity items.
+        parameters:
+            - items: The addresses that must be watched on every network
+            - assignments: The current (address, webhook_id, network) assignments
+            - webhooks: The existing webhooks {network: {webhook_id: degree}}
+            - capacity: The maximum number of items of a webhook
+        return additions {webhook_id: [address]}, removals {webhook_id: [address]}, creations [(network, [address])]
+        """
+        items = set(items)
+        additions, removals, creations = {}, {}, []
+        kept = {network: {} for network in self.networks}
+        for address, webhook_id, network in assignments:
+            if network not in kept:
+                continue
+            if address not in items or address in kept[network]:
+                removals.setdefault(webhook_id, []).append(address)
+            else:
+                kept[network][address] = webhook_id
 
-        done = {}
         for network in self.networks:
-            done[network] = set()
-            for webhook_id in additions[network]:
-                for wallet in additions[network][webhook_id]:
-                    done[network].add(wallet)
+            loads = {webhook_id: 0 for webhook_id in webhooks.get(network, {})}
+            for webhook_id in kept[network].values():
+                loads[webhook_id] = loads.get(webhook_id, 0) + 1
+            missing = sorted(items - set(kept[network]))
+            start = 0
+            for webhook_id in sorted(loads, key=lambda webhook_id: loads[webhook_id]):
+                remaining = capacity - loads[webhook_id]
+                if remaining <= 0 or start >= len(missing):
+                    continue
+                additions.setdefault(webhook_id, []).extend(missing[start:start + remaining])
+                start += remaining
+            for chunk in self.split(missing[start:], capacity):
+                creations.append((network, chunk))
+        return additions, removals, creations
+
+    def update_webhook(self, change):
+        """Sends the removals then the additions of a webhook to Alchemy.
+        Returns the webhook with the addresses that were actually removed and added, chunks that failed are left out."""
+        webhook_id, to_remove, to_add = change
+        removed = self.alchemy.update_webhook_address(webhook_id, addresses=to_remove, removal=True) if to_remove else []
+        if len(removed) < len(to_remove):
+            logging.error(f"Could not remove {len(to_remove) - len(removed)} addresses from the webhook {webhook_id}")
+        added = self.alchemy.update_webhook_address(webhook_id, addresses=to_add) if to_add else []
+        if len(added) < len(to_add):
+            logging.error(f"Could not add {len(to_add) - len(added)} addresses to the webhook {webhook_id}")
+        return webhook_id, removed, added
+
+    def create_webhook(self, creation):
+        "Creates a new webhook on Alchemy with its addresses, returns the webhook and its addresses if it succeeded"
+        network, addresses = creation
+        webhook = self.alchemy.create_webhook(network=network, webhook_type="ADDRESS_ACTIVITY", webhook_url=self.addressCallbackURL, addresses=addresses)
+        if not webhook:
+            logging.error(f"Could not create a webhook for {len(addresses)} addresses on {network}")
+            return None
+        return webhook, addresses
+
+    def process_addresses(self):
+        """Syncs the address webhooks with the wallets to watch: the assignment of the wallets to the webhooks of every network
+        is computed at once, and only the additions and removals are sent to Alchemy, concurrently, then saved in the graph."""
+        wallets = [wallet for wallet in self.cyphers.get_selected_items("Wallet") if wallet and not self.is_zero_address(wallet)]
+        assignments = self.cyphers.get_watched_items("Wallet", "AddressesWebhook")
+        webhooks = self.cyphers.get_webhooks("AddressesWebhook")
+        additions, removals, creations = self.allocate_webhooks(wallets, assignments, webhooks, self.max_wallet_address_webhook)
+        logging.info(f"Adding {sum(map(len, additions.values()))} addresses to {len(additions)} webhooks, removing {sum(map(len, removals.values()))} addresses from {len(removals)} webhooks and creating {len(creations)} webhooks")
+
+        changes = [(webhook_id, removals.get(webhook_id, []), additions.get(webhook_id, [])) for webhook_id in set(removals) | set(additions)]
+        results = self.parallel_process(self.update_webhook, changes, "Updating webhooks...")
+        for webhook_id, removed, added in results:
+            if removed:
+                self.cyphers.remove_item_from_webhook(webhook_id, removed, "Wallet", "AddressesWebhook")
+            if added:
+                self.cyphers.connect_items_to_webhook(webhook_id, added, "Wallet", "AddressesWebhook")
 
-        for network in tqdm(self.networks, desc="Creating new webhooks ..."):
-            tmp_wallets = []
-            for wallet in wallets:
-                if wallet not in done[network]:
-                    tmp_wallets.append(wallet)
-            for wallet_chunk in self.split(tmp_wallets, 50000):
-                webhook = self.alchemy.create_webhook(network=network, webhook_type="ADDRESS_ACTIVITY", webhook_url=self.addressCallbackURL, addresses=wallet_chunk)
+        results = self.parallel_process(self.create_webhook, creations, "Creating new webhooks ...")
+        for result in results:
+            if result:
+                webhook, addresses = result
                 self.cyphers.create_webhook(webhook["network"], webhook["id"], webhook["webhook_url"], "AddressesWebhook")
-                self.cyphers.connect_items_to_webhook(webhook["id"], wallet_chunk, "Wallet", "AddressesWebhook")
-                current_index += self.max_wallet_address_webhook
+                self.cyphers.connect_items_to_webhook(webhook["id"], addresses, "Wallet", "AddressesWebhook")
 
     def process_tokens_removals(self):
         data = self.cyphers.get_items_to_remove("Token", "TokensWebhook")
@@ -103,8 +136,7 @@ class WebhooksProcessor(Processor):
                 self.cyphers.connect_items_to_webhook(webhook_id, tmp_tokens, "Token", "TokensWebhook")
 
     def run(self):
-        self.process_addresses_removals()
-        self.process_addresses_additions()
+        self.process_addresses()
 
 if __name__ == "__main__":
     P = WebhooksProcessor()
@@ -28,66 +28,86 @@ class AccountsCyphers(Cypher):
         return contexts
     
     @count_query_logging
-    def create_audience(self, params):
-        query = f"""
-            MERGE (audience:Audience {{audienceId: $audienceId}})
-            SET audience.name = $name
-            SET audience.collectionName = $name
-            SET audience.imageUrl = $imageUrl
-            SET audience.description = $description
+    def create_audiences(self, audiences):
+        "Creates or updates all the audiences at once, audiences is a list of {audienceId, name, imageUrl, description}"
+        query = """
+            UNWIND $audiences AS params
+            MERGE (audience:Audience {audienceId: params.audienceId})
+            SET audience.name = params.name
+            SET audience.collectionName = params.name
+            SET audience.imageUrl = params.imageUrl
+            SET audience.description = params.description
             RETURN count(audience)
         """
-        count = self.query(query, parameters=params)[0].value()
+        count = self.query(query, parameters={"audiences": audiences})[0].value()
         return count
 
-    @count_query_logging
-    def flag_existing_edges(self):
+    @get_query_logging
+    def get_audience_wallets(self, wic, is_context):
+        "Returns the addresses of the wallets that must be part of the audience of a WIC context or condition"
+        if is_context:
+            query = f"""
+                MATCH (wallet:Wallet)-[:_HAS_CONTEXT]-(wic:_Wic:_Context:_{wic})
+                RETURN DISTINCT wallet.address AS address
+            """
+        else:
+            query = f"""
+                MATCH (wallet:Wallet)-[:_HAS_CONTEXT]-(:_Wic:_Context)-[:_HAS_CONDITION]-(:_Wic:_Condition:_{wic})
+                RETURN DISTINCT wallet.address AS address
+            """
+        records = self.query(query)
+        wallets = set([record["address"] for record in records])
+        return wallets
+
+    @get_query_logging
+    def get_audience_members(self, audience_id):
+        "Returns the addresses of the wallets currently part of an audience"
         query = """
-            CALL apoc.periodic.commit("
-                MATCH (audience:Audience)-[edge:IS_PART_OF]-(wallet:Wallet)
-                WHERE edge.toRemove = false
-                WITH edge LIMIT 10000
-                SET edge.toRemove = true
-                RETURN count(edge)            
-            ")
+            MATCH (audience:Audience {audienceId: $audienceId})-[:IS_PART_OF]-(wallet:Wallet)
+            RETURN DISTINCT wallet.address AS address
         """
-        count = self.query(query)[0].value()
-        return count
+        records = self.query(query, parameters={"audienceId": audience_id})
+        members = set([record["address"] for record in records])
+        return members
 
     @count_query_logging
-    def create_audience_by_context(self, wic):
-        query = f"""
-            MATCH (wallet:Wallet)-[:_HAS_CONTEXT]-(wic:_Wic:_Context:_{wic})
-            MATCH (audience:Audience {{audienceId: "{wic}"}})
-            MERGE (wallet)-[edge:IS_PART_OF]-(audience)
-            SET edge.toRemove = false
-            RETURN count(wallet)
+    def add_audience_members(self, audience_id, addresses, batch_size=10000):
+        count = 0
+        query = """
+            MATCH (audience:Audience {audienceId: $audienceId})
+            UNWIND $addresses AS address
+            MATCH (wallet:Wallet {address: address})
+            MERGE (wallet)-[edge:IS_PART_OF]->(audience)
+            RETURN count(edge)
         """
-        count = self.query(query)[0].value()
+        for i in range(0, len(addresses), batch_size):
+            count += self.query(query, parameters={"audienceId": audience_id, "addresses": addresses[i:i + batch_size]})[0].value()
         return count
 
     @count_query_logging
-    def create_audience_by_condition(self, wic):
-        query = f"""
-            MATCH (wallet:Wallet)-[:_HAS_CONTEXT]-(:_Wic:_Context)-[:_HAS_CONDITION]-(:_Wic:_Condition:_{wic})
-            MATCH (audience:Audience {{audienceId: "{wic}"}})
-            MERGE (wallet)-[edge:IS_PART_OF]-(audience)
-            SET edge.toRemove = false
-            RETURN count(wallet)
+    def remove_audience_members(self, audience_id, addresses, batch_size=10000):
+        count = 0
+        query = """
+            MATCH (audience:Audience {audienceId: $audienceId})
+            UNWIND $addresses AS address
+            MATCH (wallet:Wallet {address: address})-[edge:IS_PART_OF]-(audience)
+            DELETE edge
+            RETURN count(edge)
         """
-        count = self.query(query)[0].value()
+        for i in range(0, len(addresses), batch_size):
+            count += self.query(query, parameters={"audienceId": audience_id, "addresses": addresses[i:i + batch_size]})[0].value()
         return count
 
     @count_query_logging
-    def clean_edges(self):
-        query = """
-            CALL apoc.periodic.commit("
-                MATCH (audience:Audience)-[edge:IS_PART_OF]-(wallet:Wallet)
-                WHERE edge.toRemove = true
-                WITH edge LIMIT 10000
-                DELETE edge
-                RETURN count(edge)            
-            ")
+    def clean_audiences(self, audience_ids):
+        "Removes the members of the audiences whose WIC does not exist anymore"
+        match_query = """
+            MATCH (audience:Audience)-[edge:IS_PART_OF]-(wallet:Wallet)
+            WHERE NOT audience.audienceId IN $audienceIds
+            RETURN edge
         """
-        count = self.query(query)[0].value()
-        return count
+        write_query = """
+            DELETE edge
+        """
+        count = self.iterate(match_query, write_query, parameters={"audienceIds": audience_ids})
+        return count
\ No newline at end of file
@@ -17,7 +17,7 @@ class AccountsProcessor(Processor):
         wics = conditions + contexts
         return wics
 
-    def process_wic(self, wic):
+    def get_audience_params(self, wic):
         wic_name = wic.get("_displayName", "")
         params = {
             "audienceId": wic_name,
@@ -25,19 +25,32 @@ class AccountsProcessor(Processor):
             "imageUrl": wic.get("_imageUrl", ""),
             "description": wic.get("_definition", "")
         }
-        self.cyphers.create_audience(params)
-        if "_Context" in wic.labels:
-            self.cyphers.create_audience_by_context(wic_name)
-        else:
-            self.cyphers.create_audience_by_condition(wic_name)
-            
+        return params
+
+    def get_audience_delta(self, wic):
+        """Compares the wallets of a WIC to the current members of its audience.
+        return audience_id, wallets to add, wallets to remove"""
+        wic_name = wic.get("_displayName", "")
+        wallets = self.cyphers.get_audience_wallets(wic_name, "_Context" in wic.labels)
+        members = self.cyphers.get_audience_members(wic_name)
+        wallets.discard(None)
+        members.discard(None)
+        return wic_name, list(wallets - members), list(members - wallets)
+
     def process_audiences(self):
+        """Creates all the audiences in one query, then computes the membership changes of every audience in parallel
+        and only writes the wallets added to or removed from each audience."""
         wics = self.get_current_wics()
-        self.cyphers.flag_existing_edges()
-        for wic in wics:
-            logging.info(f"Creating audience for WIC: {wic}")
-            self.process_wic(wic)
-        self.cyphers.clean_edges()
+        audiences = [self.get_audience_params(wic) for wic in wics]
+        self.cyphers.create_audiences(audiences)
+        deltas = self.parallel_process(self.get_audience_delta, wics, "Computing the audiences memberships")
+        for audience_id, added, removed in deltas:
+            logging.info(f"Audience {audience_id}: {len(added)} wallets to add and {len(removed)} to remove")
+            if added:
+                self.cyphers.add_audience_members(audience_id, added)
+            if removed:
+                self.cyphers.remove_audience_members(audience_id, removed)
+        self.cyphers.clean_audiences([audience["audienceId"] for audience in audiences])
 
     def run(self):
         self.process_audiences()
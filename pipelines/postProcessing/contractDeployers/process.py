@@ -1,6 +1,7 @@
-import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from ...helpers import Etherscan
+from ...helpers import Etherscan, DeployerCache
 from .cyphers import ContractDeployersCyphers
 from ..helpers import Processor
 from tqdm import tqdm
@@ -10,54 +11,102 @@ class ContractDeployersProcessor(Processor):
         self.cyphers = ContractDeployersCyphers()
         self.etherscan = Etherscan()
         self.chunk_size = 1000
+        self.batch_size = 5
+        self.max_delta_files = 10
         super().__init__(bucket_name)
-    
+        self.cache = DeployerCache(self, "deployers_cache")
+
+    def get_deployers(self, batch):
+        """Looks up the deployers of a batch of up to 5 contracts with the next free Etherscan key.
+        Returns the (contract, deployer, txHash) of each contract (deployer and txHash are None if Etherscan does not know it),
+        or None if the request failed."""
+        key = self.etherscan.get_api_key()
+        data = self.etherscan.get_contract_deployer(batch, apikey=key)
+        if data is None:
+            return None
+        deployers = {result["contractAddress"].lower(): result for result in data}
+        results = []
+        for contract in batch:
+            result = deployers.get(contract, {})
+            results.append((contract, result.get("contractCreator"), result.get("txHash")))
+        return results
+
+    def write_deployers(self, results, label, name):
+        "Writes a list of (contract, deployer, txHash) to the graph, skipping contracts without deployer"
+        results = [
+            {
+                "contractAddress": contract,
+                "address": deployer,
+                "txHash": tx_hash
+            }
+            for contract, deployer, tx_hash in results
+            if deployer
+        ]
+        if not results:
+            return
+        urls = self.save_json_as_csv(results, f"{name}_{self.asOf}")
+        self.cyphers.queries.create_wallets(urls)
+        self.cyphers.link_or_merge_deployers(urls, label)
+
+    def process_contracts(self, contracts, label):
+        """
+        Links the deployers of a list of contracts.
+        The deployers already in the cache are written directly, the unknown contracts are looked up by batches of 5
+        dispatched concurrently across all the Etherscan keys. Results are written to the graph and saved in the cache
+        every chunk_size contracts. Only the deployers found are cached, contracts without a deployer and failed lookups
+        are looked up again on the next run.
+        parameters:
+            - contracts: The addresses of the contracts
+            - label: The label of the contract nodes (MultiSig, Token...)
+        """
+        contracts = sorted(set(contract.lower() for contract in contracts if contract))
+        cached = self.cache.get_many(contracts)
+        known = [(contract, *result) for contract, result in zip(contracts, cached) if result is not None]
+        unknown = [contract for contract, result in zip(contracts, cached) if result is None]
+        logging.info(f"{len(known)} {label} deployers found in the cache, {len(unknown)} to look up")
+
+        for i in tqdm(range(0, len(known), self.chunk_size), desc=f"Writing the cached {label} deployers"):
+            self.write_deployers(known[i: i+self.chunk_size], label, f"deployers_{label}_cached_{i}")
+
+        batches = [unknown[i: i+self.batch_size] for i in range(0, len(unknown), self.batch_size)]
+        workers = max(int(len(self.etherscan.etherscan_api_key_pools["ethereum"]) * self.etherscan.calls_per_second), 1)
+        results = []
+        failed = 0
+        chunk = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.get_deployers, batch) for batch in batches]
+            for future in tqdm(as_completed(futures), total=len(futures), desc=f"Getting {label} deployers address"):
+                data = future.result()
+                if data is None:
+                    failed += 1
+                    continue
+                for contract, deployer, tx_hash in data:
+                    if deployer:
+                        self.cache.add(contract, deployer, tx_hash)
+                results.extend(data)
+                if len(results) >= self.chunk_size:
+                    self.write_deployers(results, label, f"deployers_{label}_{chunk}")
+                    self.cache.save_delta()
+                    results = []
+                    chunk += 1
+        self.write_deployers(results, label, f"deployers_{label}_{chunk}")
+        self.cache.save_delta()
+        if failed:
+            logging.error(f"Could not get the deployers of {failed} batches of {label}")
+
     def process_multisigs(self):
         multisigs = self.cyphers.get_multisigs()
-        for i in tqdm(range(0, len(multisigs), self.chunk_size), desc="Getting Multisig deployers address"):
-            current_multisigs = multisigs[i: i+self.chunk_size]
-            results = []
-            for j in range(0, len(current_multisigs), 5):
-                data = self.etherscan.get_contract_deployer(current_multisigs[j: j+5])
-                if data:
-                    results.extend(data)
-            results = [
-                {
-                    "contractAddress": result["contractAddress"],
-                    "address": result["contractCreator"],
-                    "txHash": result["txHash"]
-                } 
-                for result in results
-            ]
-            urls = self.save_json_as_csv(results, f"process_multisig_{self.asOf}_{i}")
-            self.cyphers.queries.create_wallets(urls)
-            self.cyphers.link_or_merge_deployers(urls, "MultiSig")
+        self.process_contracts(multisigs, "MultiSig")
 
     def process_tokens(self):
-        multisigs = self.cyphers.get_tokens()
-        multisigs = [multisig for multisig in multisigs if multisig]
-        for i in tqdm(range(0, len(multisigs), self.chunk_size), desc="Getting Tokens deployers address"):
-            current_multisigs = multisigs[i: i+self.chunk_size]
-            results = []
-            for j in range(0, len(current_multisigs), 5):
-                data = self.etherscan.get_contract_deployer(current_multisigs[j: j+5])
-                if data:
-                    results.extend(data)
-            results = [
-                {
-                    "contractAddress": result["contractAddress"],
-                    "address": result["contractCreator"],
-                    "txHash": result["txHash"]
-                } 
-                for result in results
-            ]
-            urls = self.save_json_as_csv(results, f"process_multisig_{self.asOf}_{i}")
-            self.cyphers.queries.create_wallets(urls)
-            self.cyphers.link_or_merge_deployers(urls, "Token")
+        tokens = self.cyphers.get_tokens()
+        self.process_contracts(tokens, "Token")
 
     def run(self):
         self.process_multisigs()
         self.process_tokens()
+        if len(self.cache.delta_files) > self.max_delta_files:
+            self.cache.compact()
 
 if __name__ == "__main__":
     P = ContractDeployersProcessor()
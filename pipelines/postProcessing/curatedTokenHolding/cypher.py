@@ -282,4 +282,41 @@ class CuratedTokenHoldingCyphers(Cypher):
             RETURN count(newedge)
         """
         count += cast(int, self.query(query, parameters={"tokens": tokens})[0].value())
+        return count
+
+    @count_query_logging
+    def move_token_ids_to_held(self, urls) -> int:
+        "CSV must have the columns: [address, contractAddress, tokenId] of the token ids that are not held anymore"
+        count = 0
+        for url in tqdm(urls):
+            query = f"""
+                LOAD CSV WITH HEADERS FROM '{url}' AS holdings
+                MATCH (wallet:Wallet {{address: toLower(holdings.address)}})-[edge:HOLDS_TOKEN {{tokenId: holdings.tokenId}}]->(token:Token {{address: toLower(holdings.contractAddress)}})
+                MERGE (wallet)-[newedge:HELD_TOKEN]->(token)
+                SET newedge.tokenId = edge.tokenId
+                SET newedge.ingestedBy = "{self.UPDATED_ID}"
+                SET newedge.lastUpdateDt = datetime()
+                DELETE edge
+                RETURN count(newedge)
+            """
+            count += cast(int, self.query(query)[0].value())
+        return count
+
+    @count_query_logging
+    def move_holdings_to_held(self, urls) -> int:
+        "CSV must have the columns: [address, contractAddress] of the wallets that do not hold the token anymore"
+        count = 0
+        for url in tqdm(urls):
+            query = f"""
+                LOAD CSV WITH HEADERS FROM '{url}' AS holdings
+                MATCH (wallet:Wallet {{address: toLower(holdings.address)}})-[edge:HOLDS]->(token:Token {{address: toLower(holdings.contractAddress)}})
+                MERGE (wallet)-[newedge:HELD]->(token)
+                SET newedge.balance = edge.balance
+                SET newedge.numericBalance = toFloatOrNull(edge.numericBalance)
+                SET newedge.ingestedBy = "{self.UPDATED_ID}"
+                SET newedge.lastUpdateDt = datetime()
+                DELETE edge
+                RETURN count(newedge)
+            """
+            count += cast(int, self.query(query)[0].value())
         return count
\ No newline at end of file
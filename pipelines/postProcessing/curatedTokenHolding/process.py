@@ -1,6 +1,9 @@
 
 from datetime import datetime, timedelta, timezone
+import io
 import logging
+import numpy as np
+import pandas as pd
 from .cypher import CuratedTokenHoldingCyphers
 from ..helpers import Processor
 from ...helpers import Alchemy, Etherscan
@@ -18,6 +21,8 @@ class CuratedTokenHoldingProcessor(Processor):
         self.ERC20_last_block = self.metadata.get("ERC20_last_block", {})
         self.alchemy = Alchemy() 
         self.etherscan = Etherscan() 
+        self.full_refresh = os.environ.get("HOLDERS_FULL_REFRESH", False)
+        self.current_block = 0
 
     def get_NFTs_tokens(self) -> list[str]:
         tokens_data = self.cyphers.get_manual_selection_NFT_tokens()
@@ -50,62 +55,182 @@ class CuratedTokenHoldingProcessor(Processor):
         logging.info(f"{len(tokens)} ERC20 tokens retrieved for processing!")
         return tokens
 
-    def get_holders_for_NFT_tokens(self):
-        tokens = self.get_NFTs_tokens()
-        for i in range(0, len(tokens), self.NFT_chunk_size):
-            current_tokens = tokens[i: i+self.NFT_chunk_size]
-            data = self.parallel_process(self.alchemy.getOwnersForCollection, current_tokens, description="Getting NFT token Holders")
-            results = []
-            for token, holders in zip(current_tokens, data):
-                for element in holders:
-                    for balance in element["tokenBalances"]:
-                        tmp = {
-                            "contractAddress": token,
-                            "address": element["ownerAddress"],
-                            "tokenId": balance["tokenId"],
-                            "balance": balance["balance"]
-                        }
-                        results.append(tmp)
-            self.cyphers.mark_current_hold_edges(current_tokens)
-            urls = self.save_json_as_csv(results, f"process_nft_tokens_{self.asOf}_{i}")
-            self.cyphers.queries.create_wallets(urls)
-            self.cyphers.clean_NFT_token_holding(urls)
-            self.cyphers.link_or_merge_NFT_token_holding(urls)
-            self.cyphers.move_old_hold_edges_to_held(current_tokens)
-            self.cyphers.update_tokens(current_tokens)
-    
-    def get_holders_for_ERC20_token(self, token):
-        data = self.etherscan.get_token_holders(token)
-        metadata = self.etherscan.get_token_information(token)
-        if metadata and data:
-            results = []
-            divisor = metadata["divisor"]
-            for holder in data:
-                numericBalance = None
-                if divisor:
-                    try:
-                        numericBalance = int(holder["TokenHolderQuantity"]) / 10**int(divisor)
-                    except:
-                        pass
+    def load_holders_snapshot(self, token):
+        """Loads the holders of a token saved by the last run, sorted by key (address, or address|tokenId for NFTs),
+        along with the block they were read at. Returns None if there is no snapshot yet."""
+        key = f"holders_snapshots/{token}.npz"
+        if self.full_refresh or not self.check_if_file_exists(key):
+            return None
+        result = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        content = np.load(io.BytesIO(result["Body"].read()))
+        return {name: content[name] for name in content.files}
+
+    def save_holders_snapshot(self, token, snapshot):
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **snapshot)
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=f"holders_snapshots/{token}.npz", Body=buffer.getvalue())
+
+    def get_holders_snapshot(self, holdings, block):
+        "Builds the snapshot of the holders of a token from its holdings DataFrame (address, tokenId, balance)"
+        holdings = holdings.assign(address=holdings["address"].str.lower())
+        keys = (holdings["address"] + "|" + holdings["tokenId"]).to_numpy(dtype=str)
+        keys, index = np.unique(keys[::-1], return_index=True)
+        # Duplicated keys keep their last balance
+        index = len(holdings) - 1 - index
+        return {
+            "keys": keys,
+            "addresses": holdings["address"].to_numpy(dtype=str)[index],
+            "tokenIds": holdings["tokenId"].to_numpy(dtype=str)[index],
+            "balances": holdings["balance"].to_numpy(dtype=str)[index],
+            "block": np.array(block)
+        }
+
+    def diff_holders(self, previous, current):
+        """Compares two snapshots of the holders of a token.
+        return the indices of the added and changed keys in current, the indices of the removed keys in previous,
+        and the addresses that do not hold any of the token anymore"""
+        position = np.searchsorted(previous["keys"], current["keys"])
+        position = np.minimum(position, max(len(previous["keys"]) - 1, 0))
+        known = np.zeros(len(current["keys"]), dtype=bool)
+        if len(previous["keys"]):
+            known = previous["keys"][position] == current["keys"]
+        changed = np.zeros(len(current["keys"]), dtype=bool)
+        changed[known] = previous["balances"][position[known]] != current["balances"][known]
+        removed = ~np.isin(previous["keys"], current["keys"])
+        gone = np.setdiff1d(previous["addresses"], current["addresses"])
+        return np.flatnonzero(~known | changed), np.flatnonzero(removed), gone
+
+    def has_transfers(self, token, block, nft):
+        "Returns False if the token had no transfer since block, True otherwise (or if the transfers could not be read)"
+        transfers = self.alchemy.getAssetTransfers(
+            tokens=[token],
+            fromBlock=hex(int(block) + 1),
+            maxCount=1,
+            excludeZeroValue=False,
+            external=False,
+            internal=False,
+            erc20=not nft,
+            erc721=nft,
+            erc1155=nft,
+            specialnft=False,
+            pageKeyIterate=False
+        )
+        if transfers is None:
+            return True
+        return len(transfers) > 0
+
+    def get_NFT_holdings(self, token):
+        holders = self.alchemy.getOwnersForCollection(token)
+        if not holders:
+            return None
+        results = []
+        for element in holders:
+            for balance in element["tokenBalances"]:
                 tmp = {
                     "contractAddress": token,
-                    "address": holder["TokenHolderAddress"],
-                    "balance": holder["TokenHolderQuantity"],
-                    "numericBalance": numericBalance
+                    "address": element["ownerAddress"],
+                    "tokenId": balance["tokenId"],
+                    "balance": balance["balance"]
                 }
                 results.append(tmp)
-            self.cyphers.mark_current_hold_edges([token])
-            urls = self.save_json_as_csv(results, f"process_erc20_tokens_{self.asOf}_{token}")
-            self.cyphers.queries.create_wallets(urls)
+        return pd.DataFrame(results, columns=["contractAddress", "address", "tokenId", "balance"]).astype(str)
+
+    def get_ERC20_holdings(self, token):
+        data = self.etherscan.get_token_holders(token)
+        metadata = self.etherscan.get_token_information(token)
+        if not metadata or not data:
+            return None
+        results = []
+        divisor = metadata["divisor"]
+        for holder in data:
+            numericBalance = None
+            if divisor:
+                try:
+                    numericBalance = int(holder["TokenHolderQuantity"]) / 10**int(divisor)
+                except:
+                    pass
+            tmp = {
+                "contractAddress": token,
+                "address": holder["TokenHolderAddress"],
+                "tokenId": "",
+                "balance": holder["TokenHolderQuantity"],
+                "numericBalance": numericBalance
+            }
+            results.append(tmp)
+        return pd.DataFrame(results, columns=["contractAddress", "address", "tokenId", "balance", "numericBalance"])
+
+    def write_all_holdings(self, token, holdings, nft):
+        "First run for a token: writes all its holders and moves the HOLDS edges of the other wallets to HELD"
+        self.cyphers.mark_current_hold_edges([token])
+        urls = self.save_df_as_csv(holdings, f"process_{'nft' if nft else 'erc20'}_tokens_{self.asOf}_{token}")
+        self.cyphers.queries.create_wallets(urls)
+        if nft:
+            self.cyphers.clean_NFT_token_holding(urls)
+            self.cyphers.link_or_merge_NFT_token_holding(urls)
+        else:
             self.cyphers.link_or_merge_ERC20_token_holding(urls)
-            self.cyphers.move_old_hold_edges_to_held([token])
+        self.cyphers.move_old_hold_edges_to_held([token])
+
+    def write_holdings_diff(self, token, holdings, previous, current, nft):
+        "Writes only the holders that were added or whose balance changed, and moves the removed ones to HELD"
+        updated, removed, gone = self.diff_holders(previous, current)
+        logging.info(f"Token {token}: {len(updated)} holdings added or changed, {len(removed)} removed")
+        file_name = f"process_{'nft' if nft else 'erc20'}_tokens_{self.asOf}_{token}"
+        if len(updated):
+            rows = holdings.set_index(holdings["address"].str.lower() + "|" + holdings["tokenId"])
+            rows = rows[~rows.index.duplicated(keep="last")].loc[current["keys"][updated]]
+            urls = self.save_df_as_csv(rows.reset_index(drop=True), f"{file_name}_updated")
+            self.cyphers.queries.create_wallets(urls)
+            if nft:
+                self.cyphers.link_or_merge_NFT_token_holding(urls)
+            else:
+                self.cyphers.link_or_merge_ERC20_token_holding(urls)
+        if nft and len(removed):
+            rows = pd.DataFrame({"address": previous["addresses"][removed], "contractAddress": token, "tokenId": previous["tokenIds"][removed]})
+            urls = self.save_df_as_csv(rows, f"{file_name}_removed")
+            self.cyphers.move_token_ids_to_held(urls)
+        if len(gone):
+            urls = self.save_df_as_csv(pd.DataFrame({"address": gone, "contractAddress": token}), f"{file_name}_gone")
+            self.cyphers.move_holdings_to_held(urls)
+
+    def process_token(self, token, nft):
+        """
+        Updates the holders of a token from the difference with the snapshot of the holders saved by the last run.
+        The token is skipped if it had no transfer since that snapshot.
+        Tokens without a snapshot are written fully, which also moves the outdated HOLDS edges to HELD.
+        """
+        previous = self.load_holders_snapshot(token)
+        if previous is not None and not self.has_transfers(token, previous["block"], nft):
+            logging.info(f"Token {token} had no transfer since block {previous['block']}, skipping")
             self.cyphers.update_tokens([token])
+            return
+        holdings = self.get_NFT_holdings(token) if nft else self.get_ERC20_holdings(token)
+        if holdings is None:
+            logging.error(f"Could not get the holders of token {token}")
+            return
+        current = self.get_holders_snapshot(holdings, self.current_block)
+        if previous is None:
+            self.write_all_holdings(token, holdings, nft)
+        else:
+            self.write_holdings_diff(token, holdings, previous, current, nft)
+        self.save_holders_snapshot(token, current)
+        self.cyphers.update_tokens([token])
+
+    def get_holders_for_NFT_tokens(self):
+        tokens = self.get_NFTs_tokens()
+        for i in range(0, len(tokens), self.NFT_chunk_size):
+            current_tokens = tokens[i: i+self.NFT_chunk_size]
+            self.parallel_process(lambda token: self.process_token(token, nft=True), current_tokens, description="Getting NFT token Holders")
+
+    def get_holders_for_ERC20_token(self, token):
+        self.process_token(token, nft=False)
 
     def get_holders_for_ERC20_tokens(self):
         tokens = self.get_ERC20_tokens()
         self.parallel_process(self.get_holders_for_ERC20_token, tokens, "Getting holders for ERC20 tokens")
 
     def run(self):
+        self.current_block = self.etherscan.get_last_block_number() or 0
         self.get_holders_for_NFT_tokens()
         self.get_holders_for_ERC20_tokens()
 
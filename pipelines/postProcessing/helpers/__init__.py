@@ -1 +1,2 @@
 from .processors import Processor
+from .bios import BiosProcessor, BIOS_EXTRACTORS
\ No newline at end of file
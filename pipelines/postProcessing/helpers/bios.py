@@ -0,0 +1,128 @@
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+from .processors import Processor
+from ...helpers import Queries
+
+DEBUG = os.environ.get("DEBUG", False)
+
+# Each pattern must have a single capturing group, the extracted value
+BIOS_EXTRACTORS = {
+    "ens": r"([-a-zA-Z0-9@:%._\+~#=]{1,256}\.eth)",
+    "handles": r"@(\w+)",
+    "urls": r"(https?://\S+)"
+}
+
+def extract_bios(extractors, bios):
+    """Runs every extractor on a chunk of bios with Series.str.extractall.
+    Returns {extractor: DataFrame[handle, extractor]} with one row per match."""
+    results = {}
+    for name in extractors:
+        matches = bios["bio"].str.extractall(BIOS_EXTRACTORS[name])
+        rows = matches.index.get_level_values(0).values.astype(int)
+        results[name] = pd.DataFrame({
+            "handle": bios["handle"].values[rows],
+            name: matches[0].str.strip().values
+        })
+    return results
+
+class BiosProcessor(Processor):
+    def __init__(self, bucket_name, extractors):
+        """
+        Processor extracting values from the Twitter bios (ENS names, mentioned handles, urls...).
+        The bios are read once per run, the extractors run together on each chunk of bios across processes,
+        and only the bios that changed since the last successful run are extracted.
+        parameters:
+            - bucket_name: The bucket of the processor, which also stores the hashes of the processed bios
+            - extractors: The names of the extractors to run (see BIOS_EXTRACTORS)
+        """
+        unknown = set(extractors) - set(BIOS_EXTRACTORS)
+        if unknown:
+            raise ValueError(f"Unknown bios extractors: {unknown}")
+        self.extractors = list(extractors)
+        self.queries = Queries()
+        self.bios_page_size = 10000
+        self.bios_chunk_size = 50000
+        self.bios_processes = int(os.environ.get("BIOS_PROCESSES", os.cpu_count() or 1))
+        self.bios_full_refresh = os.environ.get("BIOS_FULL_REFRESH", False)
+        self.bios_hashes = None
+        self.bios_handles = None
+        Processor.__init__(self, bucket_name)
+
+    def get_twitter_bios(self):
+        "Reads the handles and bios of all the Twitter accounts, by pages of handles"
+        logging.info("Reading the Twitter bios")
+        bios = []
+        after = ""
+        progress = tqdm(desc="Reading the Twitter bios")
+        while True:
+            records = self.queries.get_twitter_bios(after=after, limit=self.bios_page_size)
+            if not records:
+                break
+            bios.extend([(record["handle"], record["bio"]) for record in records])
+            after = records[-1]["handle"]
+            progress.update(len(records))
+            if DEBUG:
+                break
+        progress.close()
+        return pd.DataFrame(bios, columns=["handle", "bio"])
+
+    def hash_bios(self, bios):
+        "Content hash of every handle and bio pair"
+        return pd.util.hash_pandas_object(bios[["handle", "bio"]], index=False).values.astype(np.uint64)
+
+    def load_bios_hashes(self):
+        "Loads the hashes of the bios processed by the last successful run"
+        key = "bios_hashes.npz"
+        if self.bios_full_refresh or not self.check_if_file_exists(key):
+            return np.zeros(0, dtype=np.uint64)
+        result = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        return np.load(io.BytesIO(result["Body"].read()))["hashes"]
+
+    def save_bios_hashes(self, retry_handles=None):
+        """Saves the hashes of the bios read by this run, so the next run skips them if they did not change.
+        Must be called once the extracted values are ingested.
+        parameters:
+            - retry_handles: The handles whose bios must be extracted again on the next run (values that could not be linked yet)
+        """
+        if self.bios_hashes is None or DEBUG:
+            return
+        hashes = self.bios_hashes
+        if retry_handles:
+            hashes = hashes[~np.isin(self.bios_handles, list(retry_handles))]
+            logging.info(f"{len(self.bios_hashes) - len(hashes)} bios will be extracted again on the next run")
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, hashes=hashes)
+        self.s3_client.put_object(Bucket=self.bucket_name, Key="bios_hashes.npz", Body=buffer.getvalue())
+
+    def extract_from_bios(self):
+        """
+        Reads the Twitter bios and runs the extractors of the processor on the bios that changed since the last run
+        (new accounts or edited bios), by chunks of bios across BIOS_PROCESSES processes.
+        Returns {extractor: DataFrame[handle, extractor]} with one row per match.
+        """
+        bios = self.get_twitter_bios()
+        bios["bio"] = bios["bio"].astype(str)
+        self.bios_hashes = self.hash_bios(bios)
+        self.bios_handles = bios["handle"].values
+        changed = ~np.isin(self.bios_hashes, self.load_bios_hashes())
+        bios = bios[changed].reset_index(drop=True)
+        logging.info(f"Extracting {self.extractors} from {len(bios)} new or changed bios out of {len(changed)}")
+
+        chunks = [bios.iloc[i:i + self.bios_chunk_size].reset_index(drop=True) for i in range(0, len(bios), self.bios_chunk_size)]
+        if self.bios_processes <= 1 or len(chunks) <= 1:
+            results = [extract_bios(self.extractors, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.bios_processes) as executor:
+                results = list(executor.map(extract_bios, [self.extractors] * len(chunks), chunks))
+
+        extracted = {}
+        for name in self.extractors:
+            frames = [result[name] for result in results]
+            extracted[name] = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["handle", name])
+            logging.info(f"Found {len(extracted[name])} {name} in the bios")
+        return extracted
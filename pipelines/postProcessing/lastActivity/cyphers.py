@@ -12,33 +12,23 @@ class LastActivityCyphers(Cypher):
         super().__init__(database)
 
     @get_query_logging
-    def get_all_wallets(self):
-        query = """
-            MATCH (wallet:Wallet)
-            RETURN wallet.address as address
+    def get_wallets_activity(self, chains, freshness_days):
         """
-        if DEBUG:
-            query += "LIMIT 10"
-        result = self.query(query)
-        return result
-
-    @get_query_logging
-    def get_all_wallets_without_first_tx(self):
-        query = """
+        Returns for each wallet and chain whether the first transaction date is known 
+        and whether the last transaction date is within the freshness window.
+        """
+        fields = []
+        for chain in chains:
+            fields.append(f"wallet.{chain}FirstTxDate IS NOT NULL as {chain}FirstKnown")
+            fields.append(f"coalesce(wallet.{chain}LastTxDate > datetime() - duration({{days: $days}}), false) as {chain}LastFresh")
+        query = f"""
             MATCH (wallet:Wallet)
-            WHERE wallet.ethereumFirstTxDate IS NULL
-            OR wallet.polygonFirstTxDate IS NULL 
-            OR wallet.optimisimFirstTxDate IS NULL 
-            OR wallet.arbitrumFirstTxDate IS NULL 
-            RETURN  wallet.address as address, 
-                    wallet.ethereumFirstTxDate as ethereum,
-                    wallet.polygonFirstTxDate as polygon,
-                    wallet.optimisimFirstTxDate as optimisim,
-                    wallet.arbitrumFirstTxDate as arbitrum
+            RETURN wallet.address as address,
+                {", ".join(fields)}
         """
         if DEBUG:
             query += "LIMIT 10"
-        result = self.query(query)
+        result = self.query(query, parameters={"days": freshness_days})
         return result
     
     @count_query_logging
@@ -1,6 +1,8 @@
 import logging
+import tempfile
+from datetime import datetime
 from tqdm import tqdm
-from ...helpers import Alchemy
+from ...helpers import Alchemy, BlockTimestampIndex
 from ..helpers import Processor
 from .cyphers import LastActivityCyphers
 import os
@@ -17,62 +19,99 @@ class LastActivityPostProcess(Processor):
         super().__init__("last-activity")
         self.alchemy = Alchemy()
         self.chunk_size = 10000
+        self.freshness_days = int(os.environ.get("LAST_ACTIVITY_FRESHNESS_DAYS", 7))
+        self.block_sample_step = int(os.environ.get("BLOCK_SAMPLE_STEP", 100))
+        self.block_timestamps = {}
 
-    def get_tx(self, wallet, sort):
-        results = {"address": wallet["address"]}
+    def load_block_timestamps(self):
+        """Loads the block timestamp index of each chain from the bucket,
+        and samples the blocks mined since the last run on the chains with a fixed slot time, where they can be interpolated"""
         for chain in self.alchemy.chains:
-            if chain in wallet and wallet[chain]:
-                results[chain] = wallet[chain].timestamp()
-            else:
-                transactions = self.alchemy.getAssetTransfers(
-                    toBlock="latest", 
-                    fromAddress=wallet["address"], 
-                    maxCount=1, 
-                    chain=chain,
-                    order=sort,
-                    excludeZeroValue=False,
-                    pageKeyIterate=False
-                    )
-                if transactions and len(transactions) > 0:
-                    block = transactions[0]["blockNum"]
-                    timestamp = self.alchemy.getBlockByNumber(block, chain=chain)
-                    timestamp = int(timestamp["timestamp"], 16)
-                    results[chain] = timestamp
-                else:
-                    results[chain] = None
-        return results
+            path = os.path.join(tempfile.gettempdir(), f"block_timestamps_{chain}.db")
+            self.load_file(f"block_timestamps/{chain}.db", path)
+            self.block_timestamps[chain] = BlockTimestampIndex(chain, path=path, alchemy=self.alchemy)
+            if self.block_timestamps[chain].slot_time:
+                self.block_timestamps[chain].sample(self.block_sample_step)
 
-    def get_last_tx(self, wallet):
-        return self.get_tx(wallet, "asc")
+    def save_block_timestamps(self):
+        for chain, index in self.block_timestamps.items():
+            index.save()
+            self.save_file(index.path, f"block_timestamps/{chain}.db")
 
-    def get_fisrt_tx(self, wallet):
-        return self.get_tx(wallet, "desc")
+    def get_transfer_timestamp(self, transfer, chain):
+        "Uses the block timestamp returned with the transfer when available, the block timestamp index otherwise"
+        block = int(transfer["blockNum"], 16)
+        block_timestamp = transfer.get("metadata", {}).get("blockTimestamp", None)
+        if block_timestamp:
+            timestamp = int(datetime.fromisoformat(block_timestamp.replace("Z", "+00:00")).timestamp())
+            self.block_timestamps[chain].add(block, timestamp)
+            return timestamp
+        return self.block_timestamps[chain].get_timestamp(block)
 
-    def process_last_transactions(self):
-        logging.info("Processing last transaction for all wallets")
-        wallets = self.cyphers.get_all_wallets()
-        for i in tqdm(range(0, len(wallets), self.chunk_size), position=0, desc="Wallet chunks"):
-            data = self.parallel_process(self.get_last_tx, wallets[i: i+self.chunk_size], description="Getting last transactions data")
+    def get_jobs(self, wallets):
+        "Lists the (address, chain, order) lookups to run, skipping known first dates and last dates within the freshness window"
+        jobs = []
+        for wallet in wallets:
             for chain in self.alchemy.chains:
-                tmp = [{"address": element["address"], "date": element[chain]} for element in data if element[chain]]
-                urls = self.save_json_as_csv(tmp, f"processor_last_transactions_{chain}-{self.asOf}_{i}")
+                if not wallet[f"{chain}FirstKnown"]:
+                    jobs.append((wallet["address"], chain, "asc"))
+                if not wallet[f"{chain}LastFresh"]:
+                    jobs.append((wallet["address"], chain, "desc"))
+        return jobs
+
+    def get_activity(self, job):
+        "Gets the timestamp of the first (asc) or last (desc) transfer of a wallet on a chain"
+        address, chain, order = job
+        transactions = self.alchemy.getAssetTransfers(
+            toBlock="latest", 
+            fromAddress=address, 
+            maxCount=1, 
+            chain=chain,
+            order=order,
+            excludeZeroValue=False,
+            withMetadata=True,
+            pageKeyIterate=False
+            )
+        timestamp = None
+        if transactions and len(transactions) > 0:
+            timestamp = self.get_transfer_timestamp(transactions[0], chain)
+        return {"address": address, "chain": chain, "order": order, "date": timestamp}
+
+    def save_activity(self, data, chunk_id):
+        for chain in self.alchemy.chains:
+            first = [{"address": element["address"], "date": element["date"]} for element in data 
+                     if element["chain"] == chain and element["order"] == "asc" and element["date"]]
+            if first:
+                urls = self.save_json_as_csv(first, f"processor_first_transactions_{chain}-{self.asOf}_{chunk_id}")
+                self.cyphers.set_first_active_date(urls, chain)
+            last = [{"address": element["address"], "date": element["date"]} for element in data 
+                    if element["chain"] == chain and element["order"] == "desc" and element["date"]]
+            if last:
+                urls = self.save_json_as_csv(last, f"processor_last_transactions_{chain}-{self.asOf}_{chunk_id}")
                 self.cyphers.set_last_active_date(urls, chain)
-        logging.info("Last transactions done")
 
-    def process_first_transactions(self):
-        logging.info("Processing first transaction for all wallets")
-        wallets = self.cyphers.get_all_wallets_without_first_tx()
-        for i in tqdm(range(0, len(wallets), self.chunk_size), position=0, desc="Wallet chunks"):
-            data = self.parallel_process(self.get_fisrt_tx, wallets[i: i+self.chunk_size], description="Getting first transactions data")
+    def process_activity(self):
+        logging.info("Processing first and last transactions for all wallets")
+        wallets = self.cyphers.get_wallets_activity(self.alchemy.chains, self.freshness_days)
+        jobs = self.get_jobs(wallets)
+        logging.info(f"{len(jobs)} lookups to run for {len(wallets)} wallets")
+        lookups = {chain: 0 for chain in self.alchemy.chains}
+        start = time.time()
+        for i in tqdm(range(0, len(jobs), self.chunk_size), position=0, desc="Lookup chunks"):
+            chunk = jobs[i: i+self.chunk_size]
+            data = self.parallel_process(self.get_activity, chunk, description="Getting first and last transactions data")
+            self.save_activity(data, i)
+            self.save_block_timestamps()
+            for _, chain, _ in chunk:
+                lookups[chain] += 1
+            elapsed = time.time() - start
             for chain in self.alchemy.chains:
-                tmp = [{"address": element["address"], "date": element[chain]} for element in data if element[chain]]
-                urls = self.save_json_as_csv(tmp, f"processor_first_transactions_{chain}-{self.asOf}_{i}")
-                self.cyphers.set_first_active_date(urls, chain)
-        logging.info("first transactions done")
+                logging.info(f"{chain}: {lookups[chain]} lookups, {lookups[chain] / elapsed:.2f} lookups/s")
+        logging.info("First and last transactions done")
 
     def run(self):
-        self.process_first_transactions()
-        self.process_last_transactions()
+        self.load_block_timestamps()
+        self.process_activity()
 
 if __name__ == "__main__":
     processor = LastActivityPostProcess()
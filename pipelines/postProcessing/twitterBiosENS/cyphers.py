@@ -3,8 +3,6 @@ from datetime import datetime
 from datetime import timedelta
 import os
 
-from neo4j import Record
-
 from ...helpers import Indexes, Constraints
 from ...helpers import Cypher
 from ...helpers import count_query_logging, get_query_logging
@@ -23,19 +21,6 @@ class TwitterENSBiosCyphers(Cypher):
         constraint = Constraints()
         constraint.website()
 
-    @get_query_logging
-    def get_bios(self) -> list[Record]:
-        query = f"""
-            MATCH (twitter:Twitter:Account)
-            WHERE NOT twitter.bio IS NULL
-            WITH twitter.handle as handle, twitter.bio as bio
-            RETURN distinct(handle), bio
-        """
-        if DEBUG:
-            query += " LIMIT 10000"
-        results = self.query(query)
-        return results
-
     @count_query_logging
     def link_twitter_ens(self, urls):
         count = 0
@@ -50,4 +35,19 @@ class TwitterENSBiosCyphers(Cypher):
                 RETURN count(edge)
             """
             count += self.query(query)[0].value()
-        return count
\ No newline at end of file
+        return count
+
+    @get_query_logging
+    def get_unlinked_handles(self, urls):
+        "Returns the handles of the bios mentioning an ENS name that is not in the graph yet"
+        handles = set()
+        for url in urls:
+            query = f"""
+                LOAD CSV WITH HEADERS FROM "{url}" as data
+                OPTIONAL MATCH (ens:Alias:Ens {{name: toLower(data.ens)}})
+                WITH data, ens
+                WHERE ens IS NULL
+                RETURN DISTINCT data.handle AS handle
+            """
+            handles.update(record["handle"] for record in self.query(query))
+        return handles
@@ -21,27 +21,6 @@ class TwitterRelationsCyphers(Cypher):
         constraint = Constraints()
         constraint.website()
 
-    @get_query_logging
-    def get_bios(self):
-        ingestTime = datetime.now()
-        oneMonthAgo = ingestTime - timedelta(days=30)
-        query = f"""
-            MATCH (twitter:Twitter:Account)
-            WHERE NOT twitter.bio IS NULL
-            AND twitter.lastProcessingDateBio IS NULL
-            RETURN distinct twitter.handle as handle, twitter.bio as bio 
-            UNION 
-            MATCH (twitter:Twitter:Account)
-            WHERE NOT twitter.bio IS NULL 
-            AND twitter.lastProcessingDateBio > datetime({{epochSeconds: {int(oneMonthAgo.timestamp())}}})
-            WITH twitter.handle as handle, twitter.bio as bio
-            RETURN distinct handle, bio
-        """
-        if DEBUG:
-            query += " LIMIT 1000"
-        results = self.query(query)
-        return results
-
     @count_query_logging
     def create_metionned_handles(self, urls):
         count = 0
@@ -1,13 +1,12 @@
 import logging
 import pandas as pd
 from tqdm import tqdm
-from ..helpers import Processor
+from ..helpers import BiosProcessor
 from .cyphers import TwitterRelationsCyphers
 from ...helpers import S3Utils
 from urllib.parse import urlparse, urlunparse
 from datetime import datetime, timedelta
 import os
-import re
 import requests as r
 import datetime
 import time
@@ -17,7 +16,7 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 DEBUG = os.environ.get("DEBUG", False)
 
-class TwitterRelationsProcessor(Processor):
+class TwitterRelationsProcessor(BiosProcessor):
     """This class reads from the Neo4J instance for Twitter nodes to call the Twitter API and retreive extra infos"""
 
     def __init__(self):
@@ -26,23 +25,10 @@ class TwitterRelationsProcessor(Processor):
         self.now = datetime.datetime.now()
         self.timestamp = self.now.strftime("%Y_%m_%d_%H%M%S")
         self.chunk_size = 1000
-        super().__init__("twitter-relations")
-
-    def extract_handles(self, val):
-        matches = re.findall(r'@\w+', val)
-        if not matches:
-            return None 
-        handles = [match.strip().replace("@", "") for match in matches]
-        return handles
+        super().__init__("twitter-relations", extractors=["handles"])
 
     def extract_accounts_from_bio(self):
-        accounts = self.cyphers.get_bios()
-        accounts = [{"handle": account["handle"], "bio": account["bio"]} for account in accounts]
-        accounts_df = pd.DataFrame.from_dict(accounts)
-        accounts_df = accounts_df.dropna(subset=['bio'])
-        accounts_df['metionned_handle'] = accounts_df['bio'].apply(self.extract_handles)
-        accounts_df = accounts_df.dropna(subset=['metionned_handle'])
-        accounts_df = accounts_df.explode('metionned_handle')
+        accounts_df = self.extract_from_bios()["handles"].rename(columns={"handles": "metionned_handle"})
         logging.info(f"nice, you have {len(accounts_df)} rows")
         return accounts_df 
     
@@ -51,6 +37,7 @@ class TwitterRelationsProcessor(Processor):
         urls = self.save_df_as_csv(bios, "processing_bios_handles_refs_" + self.asOf)
         self.cyphers.create_metionned_handles(urls)
         self.cyphers.ingest_references(urls)
+        self.save_bios_hashes()
 
     def extract_website_data(self, account, counter=0):
         if counter > 5:
@@ -89,7 +76,7 @@ class TwitterRelationsProcessor(Processor):
                     "handle": account["handle"],
                     "website": account["website_bio"]
                 })
-        for i in tqdm(range(0, len(account), self.chunk_size)):
+        for i in tqdm(range(0, len(accounts), self.chunk_size)):
             results = self.parallel_process(self.extract_website_data, accounts[i: i+self.chunk_size], "Extracting URLs and domains from twitter accounts bios")
             results = [result for result in results if result]
 
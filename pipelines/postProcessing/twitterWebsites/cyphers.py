@@ -15,28 +15,6 @@ class TwitterWebsiteCyphers(Cypher):
         index = Indexes()
         index.website()
 
-    @get_query_logging
-    def get_all_twitter(self, interval=10000):
-        offset = 0
-        results = []
-        while True:
-            query = f"""
-                        MATCH (t:Twitter:Account) 
-                        WHERE t.bio IS NOT NULL
-                        return t.handle, t.bio
-                        SKIP {offset} LIMIT {interval}
-                    """
-            x = self.query(query)
-            if not x:
-                break
-            results.extend(x)
-            offset += interval
-            if DEBUG:
-                break
-
-        twitter = [(y.get("t.handle"), y.get("t.bio")) for y in results]
-        return twitter
-
     @count_query_logging
     def set_website(self, urls):
         count = 0
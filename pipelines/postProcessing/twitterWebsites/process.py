@@ -1,47 +1,31 @@
 import logging
-from ..helpers import Processor
+from ..helpers import BiosProcessor
 from .cyphers import TwitterWebsiteCyphers
 from datetime import datetime, timedelta
-import re
-import tqdm
 
 
-class TwitterWebsitePostProcess(Processor):
+class TwitterWebsitePostProcess(BiosProcessor):
     """This class reads from the Neo4J instance for Twitter nodes to call the Twitter API and retreive extra infos"""
 
     def __init__(self):
         self.cyphers = TwitterWebsiteCyphers()
-        super().__init__("twitter-websites")
+        super().__init__("twitter-websites", extractors=["urls"])
         self.cutoff = datetime.now() - timedelta(days=30)
 
-    @staticmethod
-    def extract_urls(text):
-        url_pattern = re.compile(r"(https?://\S+)")
-        return re.findall(url_pattern, text)
-
-    def get_twitter_data(self):
-        twitter_handles = self.cyphers.get_all_twitter()
-        logging.info(f"Found {len(twitter_handles)} twitter handles")
-        return twitter_handles
-
-    def get_websites(self, twitter_handles):
+    def get_websites(self):
         logging.info("Getting websites...")
-        websites = []
-        for handle, bio in tqdm.tqdm(twitter_handles):
-            x = self.extract_urls(bio)
-            for url in x:
-                websites.append({"handle": handle, "url": url.lower()})
-
+        websites = self.extract_from_bios()["urls"]
+        websites = [{"handle": handle, "url": url.lower()} for handle, url in zip(websites["handle"], websites["urls"])]
         logging.info(f"Found {len(websites)} websites")
         return websites
 
     def handle_ingestion(self, websites):
         urls = self.save_json_as_csv(websites, f"websites_{self.asOf}")
         self.cyphers.set_website(urls)
+        self.save_bios_hashes()
 
     def run(self):
-        twitter_handles = self.get_twitter_data()
-        websites = self.get_websites(twitter_handles)
+        websites = self.get_websites()
         self.handle_ingestion(websites)
 
 
@@ -1,7 +1,7 @@
 
 
 import logging
-from ...helpers import Etherscan
+from ...helpers import Etherscan, EventLogDecoder
 from ..helpers import Scraper
 
 
@@ -25,44 +25,21 @@ class NFTfiScraper(Scraper):
                     last_block = log["blockNumber"]
         self.metadata["start_block"] = last_block
     
+    def get_events(self, eventName):
+        logging.info(f"Getting the {eventName} events")
+        columns = self.etherscan.get_decoded_event_logs(self.NFTfi_contract, eventName, fromBlock=self.start_block, topic0=self.topics[eventName])
+        columns["contractAddress"] = columns.pop("address", [])
+        columns.pop("logIndex", None)
+        self.data[eventName] = EventLogDecoder.to_records(columns)
+
     def get_LoanStarted(self):
-        logging.info("Getting the LoanStarted events")
-        logs = self.etherscan.get_decoded_event_logs(self.NFTfi_contract, "LoanStarted", fromBlock=self.start_block, topic0=self.topics["LoanStarted"])
-        results = []
-        for log in logs:
-            tmp = dict(log["args"])
-            tmp["event"] = log["event"]
-            tmp["transactionHash"] = log["transactionHash"].hex()
-            tmp["contractAddress"] = log["address"]
-            tmp["blockNumber"] = log["blockNumber"]
-            results.append(tmp)
-        self.data["LoanStarted"] = results
+        self.get_events("LoanStarted")
 
     def get_LoanRepaid(self):
-        logging.info("Getting the LoanRepaid events")
-        logs = self.etherscan.get_decoded_event_logs(self.NFTfi_contract, "LoanRepaid", fromBlock=self.start_block, topic0=self.topics["LoanRepaid"])
-        results = []
-        for log in logs:
-            tmp = dict(log["args"])
-            tmp["event"] = log["event"]
-            tmp["transactionHash"] = log["transactionHash"].hex()
-            tmp["contractAddress"] = log["address"]
-            tmp["blockNumber"] = log["blockNumber"]
-            results.append(tmp)
-        self.data["LoanRepaid"] = results
+        self.get_events("LoanRepaid")
 
     def get_LoanLiquidated(self):
-        logging.info("Getting the LoanLiquidated events")
-        logs = self.etherscan.get_decoded_event_logs(self.NFTfi_contract, "LoanLiquidated", fromBlock=self.start_block, topic0=self.topics["LoanLiquidated"])
-        results = []
-        for log in logs:
-            tmp = dict(log["args"])
-            tmp["event"] = log["event"]
-            tmp["transactionHash"] = log["transactionHash"].hex()
-            tmp["contractAddress"] = log["address"]
-            tmp["blockNumber"] = log["blockNumber"]
-            results.append(tmp)
-        self.data["LoanLiquidated"] = results
+        self.get_events("LoanLiquidated")
 
     def run(self):
         self.get_LoanStarted()
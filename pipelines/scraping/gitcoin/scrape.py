@@ -58,40 +58,36 @@ class GitCoinScraper(Scraper):
                 pbar.refresh()
         logging.info("Success: Grants scrapped!")
 
+    def save_last_block_number(self, block):
+        self.metadata["last_block_number"] = block + 1
+
     def get_all_donnations(self):
         logging.info("Collecting all events from GitCoin BulckCheckout and extracting DonationSent events")
         abi = self.etherscan.get_smart_contract_ABI(self.gitcoin_checkout_contract_address)
         contract = self.get_smart_contract(self.gitcoin_checkout_contract_address, abi)
-        
+
+        _, topic = self.get_contract_event(contract, "DonationSent")
+
+        to_block = self.etherscan.get_last_block_number()
+        if DEBUG:
+            to_block = min(to_block, self.last_block_number + 10 * self.blocks_limit)
+        content = self.alchemy.getLogsByRange(
+            self.gitcoin_checkout_contract_address,
+            fromBlock=self.last_block_number,
+            toBlock=to_block,
+            topics=[topic],
+            window=self.blocks_limit,
+            checkpoint=self.save_last_block_number
+        )
+
         self.data["donations"] = []
-        with tqdm.tqdm(total=self.blocks_limit) as pbar:
-            while True:
-                content = self.alchemy.getLogs(
-                    self.gitcoin_checkout_contract_address, 
-                    fromBlock=self.last_block_number, 
-                    toBlock=self.last_block_number + self.blocks_limit
-                )
-                tx_done = []
-                if content == None:
-                    break
-                if DEBUG and len(self.data["donations"]) > 100:
-                    break
-                for event in content:
-                    if event["transactionHash"] not in tx_done:
-                        tx_logs = self.parse_logs(contract, event["transactionHash"], "DonationSent")
-                        for log in tx_logs:
-                            tmp = dict(log['args'])
-                            tmp["txHash"] = event["transactionHash"]
-                            tmp["chain"] = "Ethereum"
-                            tmp["chainId"] = "1"
-                            tmp["blockNumber"] = int(event["blockNumber"], base=16)
-                            self.data["donations"].append(tmp)
-                        tx_done.append(event["transactionHash"])
-                self.metadata["last_block_number"] = self.last_block_number
-                self.last_block_number += self.blocks_limit
-                pbar.update(self.blocks_limit)
-                pbar.total += self.blocks_limit
-                pbar.refresh()
+        for log in self.decode_event_logs(contract, content, "DonationSent"):
+            tmp = dict(log['args'])
+            tmp["txHash"] = log["transactionHash"].hex()
+            tmp["chain"] = "Ethereum"
+            tmp["chainId"] = "1"
+            tmp["blockNumber"] = log["blockNumber"]
+            self.data["donations"].append(tmp)
         logging.info("Success: Donations scrapped!")
 
     def get_all_bounties(self):
@@ -1,9 +1,11 @@
 import multiprocessing
+import random
 import time
 import json
 import os
 import joblib
 from tqdm import tqdm
+from ...helpers import AddressCursorStore, Alchemy, TokenBalanceLedger
 from ..helpers import Scraper
 from .cyphers import TokenHoldersCypher
 import logging
@@ -17,10 +19,18 @@ class TokenHolderScraper(Scraper):
     def __init__(self, bucket_name="token-holders"):
         super().__init__(bucket_name)
         self.cyphers = TokenHoldersCypher()
-        self.wallets_last_block = self.metadata.get("wallets_last_block", {})
+        self.wallets_last_block = AddressCursorStore(self, "wallets_last_block")
+        if "wallets_last_block" in self.metadata:
+            self.wallets_last_block.migrate(self.metadata.pop("wallets_last_block"))
+            self.save_metadata()
+        self.ledger = TokenBalanceLedger(self, "holdings_ledger")
+        self.reconcile_rate = float(os.environ.get("TOKEN_HOLDERS_RECONCILE_RATE", 0.01))
         self.alchemy_api_url = "https://eth-mainnet.g.alchemy.com/v2/{}".format(os.environ["ALCHEMY_API_KEY"])
         self.get_current_block()
         self.important_only = os.environ.get("IMPORTANT_WALLETS", False)
+        self.sweep_mode = os.environ.get("TOKEN_HOLDERS_SWEEP", False)
+        self.sweep_window = 100
+        self.alchemy = Alchemy()
         self.chunk_size = 10000
 
     def get_current_block(self):
@@ -44,8 +54,12 @@ class TokenHolderScraper(Scraper):
         assets = set()
         transactions = {}
         tokens = {}
-        transactions["received"] = self.get_received_transactions(wallet, self.wallets_last_block.get(wallet, 0))
-        transactions["sent"] = self.get_sent_transactions(wallet, self.wallets_last_block.get(wallet, 0))
+        # The cursor block was already read by the previous run, toBlock being inclusive
+        start_block = self.wallets_last_block.get(wallet, 0) + 1
+        transactions["received"] = self.get_received_transactions(wallet, start_block)
+        transactions["sent"] = self.get_sent_transactions(wallet, start_block)
+        if transactions["received"] is None or transactions["sent"] is None:
+            return (wallet, None, None, None)
         for transaction in transactions["received"] + transactions["sent"]:
             if transaction["category"] in ["erc20", "erc721", "erc1155"]:
                 contractAddress = transaction["rawContract"]["address"]
@@ -59,8 +73,14 @@ class TokenHolderScraper(Scraper):
         assets = list(assets)
         return (wallet, assets, tokens, transactions)
 
-    def job_get_balances(self, wallet):
-        balances = self.get_balances(wallet, self.data["assets"][wallet])
+    def job_get_balances(self, item):
+        wallet, tokens, block = item
+        balances = self.get_balances_at_block(wallet, tokens, block)
+        return (wallet, balances)
+
+    def job_refresh_balances(self, item):
+        wallet, tokens = item
+        balances = self.get_balances(wallet, tokens)
         return (wallet, balances)
 
     def get_transactions_assets_balances(self, wallets):
@@ -69,37 +89,224 @@ class TokenHolderScraper(Scraper):
         self.data["assets"] = {}
         self.data["tokens"] = {}
         self.data["transfers"] = []
+        deltas = {}
+        refreshed = set()
+        failed = []
         data = self.parallel_process(self.job_get_transactions, wallets, description="Getting all the transactions")
         for item in tqdm(data):
             wallet, assets, tokens, transactions = item
+            if transactions is None:
+                failed.append(wallet)
+                continue
             self.data["assets"][wallet] = assets
             for token in tokens:
                 if token not in self.data["tokens"]:
                     self.data["tokens"][token] = tokens[token]
             for transaction in transactions["received"] + transactions["sent"]:
-                tmp = {
-                    "from": transaction["from"],
-                    "to": transaction["to"],
-                    "value": transaction["value"],
-                    "erc721TokenId": transaction["erc721TokenId"],
-                    "erc1155Metadata": transaction["erc1155Metadata"],
-                    "asset": transaction["asset"],
-                    "contractAddress": transaction["rawContract"]["address"],
-                    "hash": transaction["hash"]
-                }
-                self.data["transfers"].append(tmp)
-        data = self.parallel_process(self.job_get_balances, wallets, description="Getting all the balances")
+                self.data["transfers"].append(self.format_transfer(transaction))
+                self.add_transfer_deltas(deltas, refreshed, transaction, [wallet])
+        self.update_holdings(deltas, refreshed, self.current_block)
+        if failed:
+            logging.error(f"Could not get the transfers of {len(failed)} wallets, their cursor is not moved")
+        failed = set(failed)
+        self.wallets_last_block.update([wallet for wallet in wallets if wallet not in failed], self.current_block)
+
+    def format_transfer(self, transaction):
+        return {
+            "from": transaction["from"],
+            "to": transaction["to"],
+            "value": transaction["value"],
+            "erc721TokenId": transaction["erc721TokenId"],
+            "erc1155Metadata": transaction["erc1155Metadata"],
+            "asset": transaction["asset"],
+            "contractAddress": transaction["rawContract"]["address"],
+            "rawValue": transaction["rawContract"]["value"],
+            "hash": transaction["hash"]
+        }
+
+    def get_transfer_amount(self, transaction):
+        "Raw amount moved by an ERC20 or ERC721 transfer, in the unit returned by balanceOf"
+        if transaction["category"] == "erc721":
+            return 1
+        value = transaction["rawContract"]["value"]
+        if not value or value == "0x":
+            return 0
+        return int(value, 16)
+
+    def add_transfer_deltas(self, deltas, refreshed, transaction, wallets):
+        """Adds the signed amount of a transfer to the (wallet, token) deltas of the given wallets.
+        ERC1155 balances are per token id and cannot be tracked per contract, so their pairs are added to refreshed instead of the ledger."""
+        contractAddress = transaction["rawContract"]["address"]
+        if not contractAddress:
+            return
+        if transaction["category"] == "erc1155":
+            for wallet in wallets:
+                if wallet in [transaction["to"], transaction["from"]]:
+                    refreshed.add((wallet, contractAddress))
+            return
+        amount = self.get_transfer_amount(transaction)
+        for wallet in wallets:
+            if transaction["to"] == wallet:
+                deltas[(wallet, contractAddress)] = deltas.get((wallet, contractAddress), 0) + amount
+            if transaction["from"] == wallet:
+                deltas[(wallet, contractAddress)] = deltas.get((wallet, contractAddress), 0) - amount
+
+    def update_holdings(self, deltas, refreshed, block):
+        """
+        Applies the transfer deltas to the holdings ledger and only requests authoritative balances for:
+            - pairs that are not in the ledger yet, as their starting balance is unknown
+            - pairs that went negative, which means the ledger drifted (ex: rebasing tokens, mints without Transfer events)
+            - a random sample of the wallets that moved (TOKEN_HOLDERS_RECONCILE_RATE, 1% by default)
+        Only the pairs whose balance changed end up in the balances output, and so in the HOLDS edges.
+        The refreshed pairs (ERC1155) are kept out of the ledger, their balances are requested and written as is.
+        The balances are read at block, the last block of the transfers.
+        """
+        unknown, drifted = self.ledger.apply_deltas(deltas)
+        sampled = set(wallet for wallet in set(wallet for wallet, _ in deltas) if random.random() < self.reconcile_rate)
+        wallet_tokens = {}
+        for wallet, token in unknown + drifted + [pair for pair in deltas if pair[0] in sampled]:
+            wallet_tokens.setdefault(wallet, set()).add(token)
+        logging.info(f"{len(deltas)} holdings moved: {len(unknown)} unknown, {len(drifted)} drifted, {len(sampled)} wallets sampled")
+        self.get_all_balances(wallet_tokens, block)
+        for wallet, token, balance in self.ledger.pop_changes():
+            self.data["balances"].setdefault(wallet, []).append({
+                "contractAddress": token,
+                "tokenBalance": f"0x{balance:064x}"
+            })
+        self.refresh_balances(refreshed)
+        logging.info(f"{sum(len(balances) for balances in self.data['balances'].values())} holdings changed")
+
+    def get_all_balances(self, wallet_tokens, block):
+        """Gets the authoritative balances of the wallet tokens at block and writes them to the ledger.
+        They must be read at the block the transfers were read up to, or the later transfers would be applied again on the next run."""
+        items = [(wallet, list(tokens), block) for wallet, tokens in wallet_tokens.items()]
+        data = self.parallel_process(self.job_get_balances, items, description="Getting all the balances")
+        mismatches = 0
         for item in tqdm(data):
             wallet, balances = item
-            self.data["balances"][wallet] = balances
+            for balance in balances:
+                if type(balance) != dict or "error" in balance or not balance.get("tokenBalance"):
+                    continue
+                value = 0 if balance["tokenBalance"] == "0x" else int(balance["tokenBalance"], 16)
+                known = self.ledger.get(wallet, balance["contractAddress"])
+                if known is not None and known != value:
+                    mismatches += 1
+                self.ledger.set_balance(wallet, balance["contractAddress"], value)
+        if mismatches:
+            logging.warning(f"{mismatches} holdings did not match the ledger and were reconciled")
+
+    def refresh_balances(self, refreshed):
+        "Gets the balances of the (wallet, token) pairs that are not tracked by the ledger and adds them to the balances output"
+        wallet_tokens = {}
+        for wallet, token in refreshed:
+            wallet_tokens.setdefault(wallet, set()).add(token)
+        items = [(wallet, list(tokens)) for wallet, tokens in wallet_tokens.items()]
+        data = self.parallel_process(self.job_refresh_balances, items, description="Refreshing the ERC1155 balances")
+        for wallet, balances in data:
+            for balance in balances:
+                if type(balance) != dict or "error" in balance or not balance.get("tokenBalance"):
+                    continue
+                self.data["balances"].setdefault(wallet, []).append({
+                    "contractAddress": balance["contractAddress"],
+                    "tokenBalance": balance["tokenBalance"]
+                })
+        logging.info(f"{len(refreshed)} ERC1155 holdings refreshed")
 
-        for wallet in tqdm(wallets):
-            self.wallets_last_block[wallet] = self.current_block
+    def job_sweep_window(self, window):
+        start, end = window
+        transfers = self.alchemy.getAssetTransfers(
+            fromBlock=hex(start),
+            toBlock=hex(end),
+            external=False,
+            internal=False,
+            specialnft=False,
+            chain="ethereum"
+        )
+        if transfers is None:
+            logging.error(f"Could not get the transfers for blocks {start} to {end}")
+        return transfers
+
+    def sweep_transfers(self, wallet_cursors, from_block):
+        """
+        Scans every ERC20, ERC721 and ERC1155 transfer from from_block to the current block once, by block windows,
+        and keeps the ones involving a known wallet after its own cursor.
+        Fills transfers, assets and tokens like the per wallet mode.
+        The sweep stops at the first window that could not be read, so the transfers after it are not applied.
+        Returns the (wallet, token) transfer deltas, the ERC1155 pairs to refresh and the last block fully swept.
+        """
+        logging.info(f"Sweeping transfers from block {from_block} to {self.current_block}")
+        self.data["balances"] = {}
+        self.data["assets"] = {}
+        self.data["tokens"] = {}
+        self.data["transfers"] = []
+        assets = {}
+        deltas = {}
+        refreshed = set()
+        last_block = self.current_block
+        windows = [(start, min(start + self.sweep_window - 1, self.current_block)) for start in range(from_block + 1, self.current_block + 1, self.sweep_window)]
+        for i in tqdm(range(0, len(windows), self.max_thread * 10), desc="Sweeping block windows"):
+            batch = windows[i:i+self.max_thread*10]
+            data = self.parallel_process(self.job_sweep_window, batch, description="Getting the transfers")
+            for (start, _), transfers in zip(batch, data):
+                if transfers is None:
+                    last_block = start - 1
+                    break
+                for transaction in transfers:
+                    block = int(transaction["blockNum"], 16)
+                    wallets = [address for address in [transaction["from"], transaction["to"]] 
+                               if address in wallet_cursors and block > wallet_cursors[address]]
+                    if not wallets:
+                        continue
+                    contractAddress = transaction["rawContract"]["address"]
+                    if contractAddress not in self.data["tokens"]:
+                        self.data["tokens"][contractAddress] = {
+                            "contractType": transaction["category"],
+                            "symbol": transaction["asset"],
+                            "decimal": transaction["rawContract"]["decimal"],
+                        }
+                    for wallet in wallets:
+                        assets.setdefault(wallet, set()).add(contractAddress)
+                    self.data["transfers"].append(self.format_transfer(transaction))
+                    self.add_transfer_deltas(deltas, refreshed, transaction, wallets)
+            if last_block < self.current_block:
+                logging.error(f"The sweep stopped at block {last_block}, the next run resumes from there")
+                break
+        for wallet in assets:
+            self.data["assets"][wallet] = list(assets[wallet])
+        logging.info(f"{len(self.data['transfers'])} transfers found for {len(assets)} wallets")
+        return deltas, refreshed, last_block
+
+    def run_sweep(self):
+        """
+        Sweep mode: wallets with a cursor at or after the last sweep are updated from a single scan of the new blocks,
+        the others (new wallets, or wallets left behind) go through the per wallet mode.
+        If a window fails, the swept cursors and sweep_last_block only move up to the last block fully swept.
+        """
+        cursors = self.wallets_last_block.get_many(self.wallet_list)
+        from_block = self.metadata.get("sweep_last_block", int(cursors.max()) if len(cursors) else 0)
+        swept = [wallet for wallet, cursor in zip(self.wallet_list, cursors) if cursor >= from_block and cursor > 0]
+        others = [wallet for wallet, cursor in zip(self.wallet_list, cursors) if cursor < from_block or cursor == 0]
+        logging.info(f"{len(swept)} wallets swept, {len(others)} wallets scraped one by one")
+
+        wallet_cursors = {wallet: int(cursor) for wallet, cursor in zip(self.wallet_list, cursors) if cursor >= from_block and cursor > 0}
+        deltas, refreshed, last_block = self.sweep_transfers(wallet_cursors, from_block)
+        moved = [wallet for wallet in swept if wallet_cursors[wallet] < last_block]
+        del wallet_cursors
+        self.update_holdings(deltas, refreshed, last_block)
+        self.save_data(chunk_prefix="sweep")
+        self.data = {}
+        self.ledger.save_delta()
+        self.wallets_last_block.update(moved, last_block)
+        self.wallets_last_block.save_delta()
+        self.metadata["sweep_last_block"] = max(last_block, from_block)
+        self.save_metadata()
+        return others
 
     def alchemy_API_call_iterate(self, payload, key, pagekey=1, counter=0, results=[]):
+        "Reads every page of an Alchemy call, returns None if a page could not be read after 10 retries"
         if counter > 10:
             time.sleep(counter)
-            return results
+            return None
         headers = {"Content-Type": "application/json"}
         while pagekey:
             content = self.post_request(self.alchemy_api_url, json=payload, headers=headers)
@@ -107,9 +314,11 @@ class TokenHolderScraper(Scraper):
             result = content.get("result", None)
             if not result:
                 return self.alchemy_API_call_iterate(payload, key, pagekey=pagekey, counter=counter+1, results=results)
-            pagekey = result.get("pagekey", None)
-            if pagekey:
-                payload["params"][0]["pagekey"] = pagekey
+            pagekey = result.get("pageKey", None)
+            if pagekey and type(payload["params"][0]) == dict:
+                payload["params"][0]["pageKey"] = pagekey
+            elif pagekey:
+                payload["params"][2:] = [{"pageKey": pagekey}]
             results += result[key]
         return results
 
@@ -137,7 +346,7 @@ class TokenHolderScraper(Scraper):
             return transactions
         except:
             logging.error(f"There has been an error getting information about the address: {address}")
-            return []
+            return None
 
     def get_received_transactions(self, address, start_block):
         payload = {
@@ -163,7 +372,52 @@ class TokenHolderScraper(Scraper):
             return transactions
         except:
             logging.error(f"There has been an error getting information about the address: {address}")
-            return []
+            return None
+
+    def call_balances(self, wallet, tokens, block, counter=0):
+        "Batched eth_call of balanceOf(wallet) on every token at block, returns the responses by token index or None"
+        if counter > 10:
+            return None
+        time.sleep(counter)
+        headers = {"Content-Type": "application/json"}
+        data = "0x70a08231" + wallet.lower().replace("0x", "").rjust(64, "0")
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "eth_call",
+                "params": [{"to": token, "data": data}, hex(block)]
+            }
+            for index, token in enumerate(tokens)
+        ]
+        try:
+            content = json.loads(self.post_request(self.alchemy_api_url, json=payload, headers=headers))
+        except:
+            content = None
+        if type(content) != list:
+            return self.call_balances(wallet, tokens, block, counter=counter+1)
+        return {result.get("id"): result for result in content if type(result) == dict}
+
+    def get_balances_at_block(self, wallet, tokenList, block):
+        """
+        Reads the raw balanceOf of the wallet for every token at block, by batches of 100 tokens.
+        alchemy_getTokenBalances only reads the latest block, which is after the transfers read by the run.
+        Returns the balances in the alchemy_getTokenBalances format, the tokens whose call failed have an error.
+        """
+        balances = []
+        for i in range(0, len(tokenList), 100):
+            tokens = tokenList[i:i+100]
+            results = self.call_balances(wallet, tokens, block)
+            if results is None:
+                logging.error(f"Could not get the balances of the address: {wallet}")
+                continue
+            for index, token in enumerate(tokens):
+                result = results.get(index, {})
+                if result.get("result") not in [None, "0x"]:
+                    balances.append({"contractAddress": token, "tokenBalance": result["result"]})
+                else:
+                    balances.append({"contractAddress": token, "error": result.get("error", "No result")})
+        return balances
 
     def get_balances(self, wallet, tokenList):
         if len(tokenList) == 0:
@@ -179,6 +433,9 @@ class TokenHolderScraper(Scraper):
         }
         try:
             token_balances = self.alchemy_API_call_iterate(payload, "tokenBalances", pagekey=1, counter=0, results=[])
+            if token_balances is None:
+                logging.error(f"Could not get the balances of the address: {wallet}")
+                return []
             return token_balances
         except:
             logging.error(f"There has been an error getting information about the address: {wallet}")
@@ -186,6 +443,8 @@ class TokenHolderScraper(Scraper):
 
     def run(self):
         self.get_all_wallets_in_db()
+        if self.sweep_mode:
+            self.wallet_list = self.run_sweep()
         chunk_id = 0
         
         for i in tqdm(range(0, len(self.wallet_list), self.chunk_size)):
@@ -193,9 +452,11 @@ class TokenHolderScraper(Scraper):
             self.get_transactions_assets_balances(self.wallet_list[i:i+self.chunk_size])
             self.save_data(chunk_prefix=chunk_id)
             self.data = {}
-            self.metadata["wallets_last_block"] = self.wallets_last_block
-            self.save_metadata()
+            self.ledger.save_delta()
+            self.wallets_last_block.save_delta()
             chunk_id += 1
+        self.ledger.compact()
+        self.wallets_last_block.compact()
 
 
 if __name__ == "__main__":